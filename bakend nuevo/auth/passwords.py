@@ -0,0 +1,116 @@
+# auth/passwords.py
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Tuple
+
+# ==============================================
+# PARÁMETROS DEL KDF (scrypt, hashlib estándar)
+# ==============================================
+# Costo: N = 2**PASSWORD_SCRYPT_LOG_N. Cada hash usa ~128 * N * r bytes de
+# memoria (N=2**14, r=8 -> 16 MB). Cambiar el costo no invalida nada: los
+# hashes viejos siguen verificando y se rehashean en el próximo login.
+PASSWORD_SCRYPT_LOG_N = int(os.getenv("PASSWORD_SCRYPT_LOG_N", "14"))
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+
+# Threads dedicados a hashear (scrypt libera el GIL). Acotado para que un
+# pico de logins no se coma la CPU ni el threadpool de FastAPI.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_PREFIX = "scrypt"
+_SALT_BYTES = 16
+_KEY_BYTES = 32
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="kdf")
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _scrypt(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    n = 2 ** log_n
+    return hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=128 * r * (n + p + 2) + 1024 * 1024,
+        dklen=_KEY_BYTES,
+    )
+
+
+# -------------------------------------------------------------------
+# VERSIONES SYNC (corren dentro del pool)
+# -------------------------------------------------------------------
+
+def hash_password_sync(password: str) -> str:
+    """
+    Devuelve 'scrypt$logN$r$p$salt$hash' (salt y hash en base64).
+    """
+    salt = os.urandom(_SALT_BYTES)
+    key = _scrypt(password, salt, PASSWORD_SCRYPT_LOG_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    return f"{_PREFIX}${PASSWORD_SCRYPT_LOG_N}${PASSWORD_SCRYPT_R}${PASSWORD_SCRYPT_P}${_b64(salt)}${_b64(key)}"
+
+
+def is_hashed(stored: str) -> bool:
+    return stored.startswith(_PREFIX + "$")
+
+
+def verify_password_sync(password: str, stored: str) -> Tuple[bool, bool]:
+    """
+    Devuelve (coincide, hay_que_rehashear).
+
+    - Filas viejas en texto plano: se comparan tal cual y piden rehash.
+    - Hashes con otros parámetros de costo: verifican y piden rehash.
+    """
+    if not is_hashed(stored):
+        ok = hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        return ok, ok
+
+    try:
+        _, log_n, r, p, salt, key = stored.split("$")
+        log_n, r, p = int(log_n), int(r), int(p)
+        salt_bytes = base64.b64decode(salt)
+        key_bytes = base64.b64decode(key)
+    except ValueError:
+        return False, False
+
+    ok = hmac.compare_digest(_scrypt(password, salt_bytes, log_n, r, p), key_bytes)
+    outdated = (log_n, r, p) != (PASSWORD_SCRYPT_LOG_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    return ok, ok and outdated
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    # Hash de referencia para igualar tiempos cuando el usuario no existe
+    return hash_password_sync("dummy-password")
+
+
+# -------------------------------------------------------------------
+# VERSIONES ASYNC (para los endpoints)
+# -------------------------------------------------------------------
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, hash_password_sync, password)
+
+
+async def verify_password(password: str, stored: str) -> Tuple[bool, bool]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, verify_password_sync, password, stored)
+
+
+async def verify_dummy(password: str) -> None:
+    """
+    Mismo costo que un verify real: el login tarda lo mismo
+    exista o no el usuario.
+    """
+    await verify_password(password, _dummy_hash())
@@ -1,11 +1,88 @@
 import jwt
 import datetime
-from fastapi import Request, HTTPException, status
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
 
-# Clave secreta y algoritmo del token
-SECRET_KEY = "dev_secret_key_for_testing_only"
+from fastapi import Depends, Request, HTTPException, status
+
+# Clave secreta y algoritmo del token. JWT_SECRET_KEY es obligatoria: el rol
+# del token es lo único que protege las rutas de admin, así que no hay valor
+# por defecto (generar una con: python -c "import secrets; print(secrets.token_hex(32))")
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", "")
 ALGORITHM = "HS256"
 
+# Tokens verificados que se recuerdan por proceso (0 = sin cache)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+
+# Token fijo para que Prometheus lea /metrics sin JWT (vacío = sólo admins)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+class TokenCache:
+    """
+    LRU acotado de tokens ya verificados -> payload decodificado.
+    Evita repetir la firma HMAC y el decode JSON en cada request del
+    mismo usuario. Cada entrada vence junto con el 'exp' del token.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, tuple[dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            item = self._items.get(token)
+            if item is None:
+                return None
+            payload, exp = item
+            if exp <= time.time():
+                del self._items[token]
+                return None
+            self._items.move_to_end(token)
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        if self.maxsize <= 0:
+            return
+        exp = payload.get("exp")
+        if exp is None:
+            return
+        with self._lock:
+            self._items[token] = (payload, float(exp))
+            self._items.move_to_end(token)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+
+def _signing_key() -> str:
+    """
+    Clave para firmar/verificar tokens. Sin JWT_SECRET_KEY falla en lugar
+    de firmar con una clave conocida.
+    """
+    if not SECRET_KEY:
+        raise RuntimeError("JWT_SECRET_KEY no está configurada: no se pueden firmar ni verificar tokens")
+    return SECRET_KEY
+
+
+def check_secret_key() -> None:
+    """
+    Se llama al arrancar la app (lifespan en main.py): sin JWT_SECRET_KEY
+    el worker no arranca, en vez de fallar recién en el primer login.
+    """
+    _signing_key()
+
 
 class Security:
     # =========================================
@@ -20,6 +97,7 @@ class Security:
             "type": str  # admin o alumno
         }
         """
+        key = _signing_key()
         try:
             payload = {
                 "sub": usuario["usuario"],
@@ -27,7 +105,7 @@ class Security:
                 "rol": usuario["type"],
                 "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=8),
             }
-            token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+            token = jwt.encode(payload, key, algorithm=ALGORITHM)
             return token
         except Exception as e:
             print("Error al generar token:", e)
@@ -38,8 +116,13 @@ class Security:
     # =========================================
     @staticmethod
     def verify_token(token: str):
+        key = _signing_key()
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached
         try:
-            decoded = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            decoded = jwt.decode(token, key, algorithms=[ALGORITHM])
+            token_cache.put(token, decoded)
             return decoded
         except jwt.ExpiredSignatureError:
             raise HTTPException(
@@ -87,3 +170,56 @@ class Security:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Acceso restringido a usuarios con rol '{rol_requerido}'.",
             )
+
+    # =========================================
+    #  Verificar dueño del recurso (o admin)
+    # =========================================
+    @staticmethod
+    def check_owner_or_admin(user_data: dict, user_id: Optional[int]):
+        """
+        Un alumno sólo puede acceder a sus propios datos; un admin a todos.
+        """
+        if user_data.get("rol") == "admin":
+            return
+        if user_id is None or user_data.get("id") != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No tenés permiso para acceder a este recurso.",
+            )
+
+
+# =========================================
+#  Dependencias FastAPI
+# =========================================
+
+async def get_current_user(request: Request) -> dict:
+    """
+    Usuario autenticado (payload del token). FastAPI la resuelve una sola
+    vez por request aunque la pidan varias dependencias.
+    """
+    return await Security.get_current_user(request)
+
+
+def require_role(rol_requerido: str):
+    async def dependency(user_data: dict = Depends(get_current_user)) -> dict:
+        Security.check_role(user_data, rol_requerido)
+        return user_data
+
+    return dependency
+
+
+# Para rutas del panel de administración
+require_admin = require_role("admin")
+
+
+async def require_metrics_access(request: Request) -> None:
+    """
+    /metrics: Prometheus con 'Authorization: Bearer <METRICS_TOKEN>'
+    (los JWT vencen, no sirven para un scraper) o un admin logueado.
+    """
+    auth_header = request.headers.get("Authorization", "")
+    if METRICS_TOKEN and auth_header.startswith("Bearer "):
+        if hmac.compare_digest(auth_header[len("Bearer "):].encode("utf-8"), METRICS_TOKEN.encode("utf-8")):
+            return
+    user_data = await Security.get_current_user(request)
+    Security.check_role(user_data, "admin")
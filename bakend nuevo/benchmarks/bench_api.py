@@ -0,0 +1,491 @@
+# benchmarks/bench_api.py
+"""
+Prueba de carga de los endpoints de la API, en proceso (sin red ni uvicorn).
+
+Cada escenario golpea un endpoint con concurrencia fija y reporta req/s,
+latencias p50/p95/p99 y sentencias SQL por request. Usa la base
+configurada en DB_* con el dataset de scripts/seed_data.py:
+
+    alembic upgrade head
+    python -m benchmarks.bench_api --seed-data --scale 1        # carga datos y mide
+    python -m benchmarks.bench_api --save-baseline default      # guarda la línea base
+    python -m benchmarks.bench_api --compare default            # compara contra ella
+
+--compare termina con código 1 si algún escenario empeora más que
+--tolerance en p95 o hace más sentencias SQL que la línea base. Las
+latencias sólo son comparables en la misma máquina; la cantidad de
+sentencias SQL sí es comparable en cualquier lado. baselines/default.json
+es la línea base versionada (dataset --scale 1); en otra máquina se
+compara sólo SQL y errores:
+
+    python -m benchmarks.bench_api --compare default --sql-only
+
+Los escenarios que escriben pagos usan cuotas libres reales y al terminar
+se deshace todo: se borran los pagos creados y se vuelven a dejar
+vigentes los anulados.
+
+Camino sync vs async: 'payments.paginated.sync' mide el mismo listado que
+'payments.paginated' con un handler def + Session sync (psycopg2, corre en
+el threadpool), montado sólo durante la prueba:
+
+    python -m benchmarks.bench_api --only payments.paginated --concurrency 16
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import secrets
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+BASELINES_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# Sentencias SQL por request de más que no cuentan como regresión: con
+# concurrencia, dos requests pueden fallar juntas el mismo cache de precios
+SQL_TOLERANCE = 0.05
+
+# Variante sync de POST /payments/paginated (ver _mount_sync_payments)
+SYNC_PAYMENTS_PATH = "/bench/sync/payments/paginated"
+
+
+# -------------------------------------------------------------------
+# ESCENARIOS
+# -------------------------------------------------------------------
+
+class Scenario:
+    """
+    Un endpoint a medir. 'path' y 'body' reciben (ctx, i) donde i es el
+    número de request, para variar ids/páginas de forma determinista.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: Callable[[dict, int], str],
+        body: Optional[Callable[[dict, int], Any]] = None,
+        role: str = "admin",
+        weight: float = 1.0,
+    ):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.role = role
+        self.weight = weight
+
+
+def _pick(ctx: dict, key: str, i: int):
+    values = ctx[key]
+    return values[i % len(values)]
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("root", "GET", lambda c, i: "/", role=None),
+    # Cada login es un scrypt: pocas requests alcanzan para medirlo
+    Scenario("users.login", "POST", lambda c, i: "/login",
+             lambda c, i: {"username": c["student_username"], "password": c["password"]}, role=None, weight=0.1),
+    Scenario("users.get", "GET", lambda c, i: f"/users/{_pick(c, 'student_user_ids', i)}"),
+    Scenario("users.paginated", "POST", lambda c, i: "/users/paginated",
+             lambda c, i: {"page": i % 20 + 1, "page_size": 20}),
+    Scenario("users.paginated.search", "POST", lambda c, i: "/users/paginated",
+             lambda c, i: {"page": 1, "page_size": 20, "search": ("garc", "mart", "2000", "sofi")[i % 4]}),
+    # Letras + dígitos: rama de prefijo de username (ix_usuarios_username_lower_prefix)
+    Scenario("users.paginated.search.username", "POST", lambda c, i: "/users/paginated",
+             lambda c, i: {"page": 1, "page_size": 20, "search": f"alumno{i * 37 % 100:05d}"}),
+    Scenario("careers.get", "GET", lambda c, i: f"/careers/{_pick(c, 'career_ids', i)}"),
+    Scenario("careers.paginated", "POST", lambda c, i: "/careers/paginated",
+             lambda c, i: {"page": i % 2 + 1, "page_size": 10}),
+    Scenario("careers.prices", "POST", lambda c, i: "/careers/prices/paginated",
+             lambda c, i: {"id_carrera": _pick(c, "career_ids", i), "page": 1, "page_size": 20}),
+    Scenario("news.get", "GET", lambda c, i: f"/news/{_pick(c, 'news_ids', i)}"),
+    Scenario("news.paginated", "POST", lambda c, i: "/news/paginated",
+             lambda c, i: {"page": i % 5 + 1, "page_size": 10}),
+    Scenario("news.paginated.list_mode", "POST", lambda c, i: "/news/paginated",
+             lambda c, i: {"page": i % 5 + 1, "page_size": 10, "list_mode": True}),
+    Scenario("enrollments.by_user", "POST", lambda c, i: "/enrollments/by-user",
+             lambda c, i: {"user_id": _pick(c, "student_user_ids", i)}),
+    Scenario("enrollments.statement", "GET",
+             lambda c, i: f"/enrollments/{_pick(c, 'enrollment_ids', i)}/statement"),
+    Scenario("payments.by_enrollment", "POST", lambda c, i: "/payments/by-enrollment",
+             lambda c, i: {"id_usuarioxcarrera": _pick(c, "enrollment_ids", i)}),
+    Scenario("payments.paginated", "POST", lambda c, i: "/payments/paginated",
+             lambda c, i: {"page": i % 50 + 1, "page_size": 20}),
+    Scenario("payments.paginated.sync", "POST", lambda c, i: SYNC_PAYMENTS_PATH,
+             lambda c, i: {"page": i % 50 + 1, "page_size": 20}),
+    Scenario("payments.paginated.cursor", "POST", lambda c, i: "/payments/paginated",
+             lambda c, i: {"page_size": 20, "cursor_mode": True}),
+    Scenario("payments.paginated.compact", "POST", lambda c, i: "/payments/paginated",
+             lambda c, i: {"page_size": 100, "cursor_mode": True, "compact": True}),
+    Scenario("payments.paginated.search", "POST", lambda c, i: "/payments/paginated",
+             lambda c, i: {"page": 1, "page_size": 20, "search": ("garc", "sistemas", "2000", "lopez")[i % 4]}),
+    Scenario("payments.export.csv", "GET", lambda c, i: "/payments/export?format=csv", weight=0.05),
+    Scenario("payments.create", "POST", lambda c, i: "/payments", lambda c, i: next(c["free_cuotas"])),
+    Scenario("payments.bulk", "POST", lambda c, i: "/payments/bulk",
+             lambda c, i: {"items": [next(c["free_cuotas"]) for _ in range(12)]}, weight=0.25),
+    Scenario("payments.cancel", "PUT", lambda c, i: f"/payments/{c['cancel_ids'][i]}/cancel", lambda c, i: {}),
+    Scenario("reports.debtors", "GET", lambda c, i: f"/reports/debtors?page={i % 10 + 1}&page_size=20"),
+    Scenario("alumno.perfil", "GET", lambda c, i: "/alumno/perfil", role="alumno"),
+    Scenario("alumno.carreras", "GET", lambda c, i: "/alumno/carreras", role="alumno"),
+    Scenario("alumno.pagos", "GET", lambda c, i: "/alumno/pagos", role="alumno"),
+    Scenario("metrics.db", "GET", lambda c, i: "/metrics/db"),
+    Scenario("metrics.prometheus", "GET", lambda c, i: "/metrics"),
+]
+
+
+# -------------------------------------------------------------------
+# CONTEXTO (ids reales del dataset + tokens)
+# -------------------------------------------------------------------
+
+# Cuotas dentro de la duración de la carrera sin pago vigente: los escenarios
+# que crean pagos las consumen de a una (así cada alta es válida)
+FREE_CUOTAS_SQL = """
+    SELECT uxc.id AS id_usuarioxcarrera, gs.n AS numero_cuota
+    FROM usuarioxcarrera uxc
+    JOIN carreras c ON c.id = uxc.id_carrera
+    CROSS JOIN LATERAL generate_series(1, c.duracion_meses) AS gs(n)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM pagos p
+        WHERE p.id_usuarioxcarrera = uxc.id AND p.numero_cuota = gs.n AND NOT p.anulado
+    )
+    ORDER BY uxc.id, gs.n
+    LIMIT :limit
+"""
+
+
+def _load_context(total: int) -> dict:
+    from sqlalchemy import func, select, text
+
+    from config.db import SessionLocal
+    from models.career import Career
+    from models.news import News
+    from models.payment import Payment
+    from models.user import User, UserDetail
+    from models.usuarioxcarrera import UsuarioXcarrera
+    from scripts.seed_data import SEED_ADMIN_USERNAME, SEED_PASSWORD
+
+    with SessionLocal() as db:
+        student_rows = db.execute(
+            select(User.id, User.username)
+            .join(UserDetail, UserDetail.id_user == User.id)
+            .join(UsuarioXcarrera, UsuarioXcarrera.id_userdetail == UserDetail.id)
+            .where(UserDetail.type == "alumno")
+            .distinct()
+            .order_by(User.id)
+            .limit(500)
+        ).all()
+        if not student_rows:
+            sys.exit("La base no tiene datos: correr con --seed-data (o python -m scripts.seed_data)")
+
+        cancel_ids = list(db.scalars(
+            select(Payment.id).where(Payment.anulado == False).order_by(Payment.id.desc()).limit(total)  # noqa: E712
+        ))
+
+        return {
+            "admin_username": SEED_ADMIN_USERNAME,
+            "student_username": student_rows[0].username,
+            "password": SEED_PASSWORD,
+            "student_user_ids": [r.id for r in student_rows],
+            "career_ids": list(db.scalars(select(Career.id).order_by(Career.id))),
+            "news_ids": list(db.scalars(select(News.id).order_by(News.id.desc()).limit(100))) or [0],
+            "enrollment_ids": list(db.scalars(select(UsuarioXcarrera.id).order_by(UsuarioXcarrera.id).limit(1000))),
+            # Pagos vigentes distintos para cada request de anulación
+            "cancel_ids": cancel_ids,
+            "all_cancel_ids": list(cancel_ids),
+            # Cuotas libres para payments.create (1 por request) y payments.bulk (12)
+            "free_cuotas": iter([
+                dict(row) for row in db.execute(text(FREE_CUOTAS_SQL), {"limit": total * 13}).mappings()
+            ]),
+            # Lo que se escribe durante la corrida se deshace en _restore_dataset
+            "max_payment_id": db.scalar(select(func.max(Payment.id))) or 0,
+        }
+
+
+def _restore_dataset(ctx: dict) -> None:
+    """
+    Deja los pagos como estaban antes de medir: borra los creados por
+    payments.create/bulk y vuelve a dejar vigentes los que anuló
+    payments.cancel (todos los de 'cancel_ids' lo estaban al empezar).
+    """
+    from sqlalchemy import delete, update
+
+    from config.db import SessionLocal
+    from models.payment import Payment
+
+    with SessionLocal() as db:
+        db.execute(delete(Payment).where(Payment.id > ctx["max_payment_id"]))
+        if ctx["all_cancel_ids"]:
+            db.execute(
+                update(Payment)
+                .where(Payment.id.in_(ctx["all_cancel_ids"]), Payment.anulado == True)  # noqa: E712
+                .values(anulado=False)
+            )
+        db.commit()
+
+
+def _mount_sync_payments(app) -> None:
+    """
+    Monta SYNC_PAYMENTS_PATH: POST /payments/paginated en modo offset (misma
+    consulta, mismo response_model) pero como handler def sobre get_db, que
+    era el camino de la API antes del engine async.
+    """
+    from fastapi import Depends
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import Session
+
+    from auth.security import require_admin
+    from config.db import get_db
+    from routes.payment_routes import (
+        PaymentsPaginatedRequest,
+        PaymentsPaginatedResponse,
+        payment_list_item,
+        payments_list_query,
+    )
+    from utils.pagination import page_meta
+    from utils.search import normalize_search
+
+    @app.post(
+        SYNC_PAYMENTS_PATH,
+        dependencies=[Depends(require_admin)],
+        response_model=PaymentsPaginatedResponse,
+        include_in_schema=False,
+    )
+    def payments_paginated_sync(payload: PaymentsPaginatedRequest, db: Session = Depends(get_db)):
+        query = payments_list_query(normalize_search(payload.search))
+        offset = (payload.page - 1) * payload.page_size
+        # Igual que paginate(..., separate_count=True): página + COUNT aparte
+        rows = db.execute(query.offset(offset).limit(payload.page_size)).all()
+        if rows and len(rows) < payload.page_size:
+            total_items = offset + len(rows)
+        elif not rows and payload.page == 1:
+            total_items = 0
+        else:
+            total_items = db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        return {
+            "success": True,
+            "message": "Pagos listados correctamente",
+            "data": {
+                "items": [payment_list_item(*row, compact=payload.compact) for row in rows],
+                **page_meta(payload.page, payload.page_size, total_items),
+            },
+        }
+
+
+async def _login(client, username: str, password: str) -> str:
+    r = await client.post("/login", json={"username": username, "password": password})
+    r.raise_for_status()
+    return r.json()["data"]["token"]
+
+
+# -------------------------------------------------------------------
+# MEDICIÓN
+# -------------------------------------------------------------------
+
+class StatementCounter:
+    """Cuenta las sentencias que llegan a la base (listener de SQLAlchemy)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    # Nearest-rank
+    return sorted_values[max(0, math.ceil(p * len(sorted_values)) - 1)]
+
+
+async def _run_scenario(client, scenario: Scenario, ctx: dict, headers: dict, total: int, concurrency: int, counter):
+    latencies: List[float] = []
+    errors = 0
+    next_i = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while True:
+            i = next(next_i)
+            if i >= total:
+                return
+            body = scenario.body(ctx, i) if scenario.body else None
+            start = time.perf_counter()
+            r = await client.request(scenario.method, scenario.path(ctx, i), json=body, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if r.status_code >= 400:
+                errors += 1
+
+    statements_before = counter.count
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    statements = counter.count - statements_before
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "req_per_sec": round(total / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "sql_per_req": round(statements / total, 2),
+    }
+
+
+async def run(args) -> Dict[str, dict]:
+    import httpx
+    from sqlalchemy import event
+
+    import main as api
+    from config.db import async_engine, engine
+
+    counter = StatementCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    event.listen(engine, "before_cursor_execute", counter)
+
+    scenarios = [s for s in SCENARIOS if not args.only or any(s.name.startswith(p) for p in args.only)]
+    if any(s.name == "payments.paginated.sync" for s in scenarios):
+        _mount_sync_payments(api.app)
+    max_total = max(1, int(args.requests * max(s.weight for s in scenarios)))
+    ctx = _load_context(max_total + args.warmup)
+
+    # Un 500 cuenta como error del escenario, no corta la corrida
+    transport = httpx.ASGITransport(app=api.app, raise_app_exceptions=False)
+    results: Dict[str, dict] = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            tokens = {
+                "admin": await _login(client, ctx["admin_username"], ctx["password"]),
+                "alumno": await _login(client, ctx["student_username"], ctx["password"]),
+            }
+
+            print(f"{'escenario':<32} {'req':>5} {'err':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'sql/req':>8}")
+            for scenario in scenarios:
+                headers = {"Authorization": f"Bearer {tokens[scenario.role]}"} if scenario.role else {}
+                total = max(1, int(args.requests * scenario.weight))
+
+                # Calentamiento: llena caches/pools y no se cuenta
+                warmup = min(args.warmup, total)
+                if warmup:
+                    await _run_scenario(client, scenario, ctx, headers, warmup, min(args.concurrency, warmup), counter)
+                    if scenario.name == "payments.cancel":
+                        ctx["cancel_ids"] = ctx["cancel_ids"][warmup:]
+
+                r = await _run_scenario(client, scenario, ctx, headers, total, args.concurrency, counter)
+                results[scenario.name] = r
+                print(
+                    f"{scenario.name:<32} {r['requests']:>5} {r['errors']:>4} {r['req_per_sec']:>8.1f} "
+                    f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['sql_per_req']:>8.2f}"
+                )
+    finally:
+        _restore_dataset(ctx)
+    return results
+
+
+# -------------------------------------------------------------------
+# LÍNEAS BASE
+# -------------------------------------------------------------------
+
+def _baseline_path(name: str) -> str:
+    return os.path.join(BASELINES_DIR, f"{name}.json")
+
+
+def save_baseline(name: str, results: Dict[str, dict], args) -> None:
+    os.makedirs(BASELINES_DIR, exist_ok=True)
+    data = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    with open(_baseline_path(name), "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"línea base guardada en {_baseline_path(name)}")
+
+
+def compare(name: str, results: Dict[str, dict], tolerance: float, sql_only: bool = False) -> bool:
+    """
+    Imprime la comparación y devuelve True si hubo regresiones. Con
+    sql_only no se miran las latencias (línea base de otra máquina).
+    """
+    with open(_baseline_path(name), encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = False
+    criterio = "sólo SQL y errores" if sql_only else f"tolerancia p95 {tolerance:.0%}"
+    print(f"\ncomparación contra '{name}' ({criterio})")
+    print(f"{'escenario':<32} {'req/s':>8} {'p95':>8} {'sql/req':>12}")
+    for scenario, r in results.items():
+        base = baseline.get(scenario)
+        if base is None:
+            print(f"{scenario:<32} {'(nuevo)':>8}")
+            continue
+
+        rps = (r["req_per_sec"] / base["req_per_sec"] - 1) if base["req_per_sec"] else 0.0
+        p95 = (r["p95_ms"] / base["p95_ms"] - 1) if base["p95_ms"] else 0.0
+        flags = []
+        if p95 > tolerance and not sql_only:
+            flags.append("p95")
+        if r["sql_per_req"] > base["sql_per_req"] + SQL_TOLERANCE:
+            flags.append("sql")
+        if r["errors"] > base["errors"]:
+            flags.append("errores")
+        regressions = regressions or bool(flags)
+
+        sql = f"{base['sql_per_req']:.2f}->{r['sql_per_req']:.2f}"
+        mark = f"  REGRESIÓN ({', '.join(flags)})" if flags else ""
+        print(f"{scenario:<32} {rps:>+8.0%} {p95:>+8.0%} {sql:>12}{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="requests por escenario (antes de 'weight')")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10, help="requests de calentamiento por escenario")
+    parser.add_argument("--only", nargs="+", help="prefijos de escenarios a correr (ej: payments users.login)")
+    parser.add_argument("--no-cache", action="store_true", help="desactivar el cache de respuestas (RESPONSE_CACHE_SIZE=0)")
+    parser.add_argument("--seed-data", action="store_true", help="vaciar las tablas y cargar el dataset sintético antes de medir")
+    parser.add_argument("--scale", type=float, default=1, help="escala del dataset (con --seed-data)")
+    parser.add_argument("--seed", type=int, default=42, help="semilla del dataset (con --seed-data)")
+    parser.add_argument("--save-baseline", metavar="NOMBRE")
+    parser.add_argument("--compare", metavar="NOMBRE")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="empeoramiento de p95 tolerado (0.2 = 20%%)")
+    parser.add_argument("--sql-only", action="store_true", help="con --compare, ignorar latencias (sólo SQL y errores)")
+    args = parser.parse_args()
+
+    # Antes de importar la app: leen estas variables al importarse
+    if args.no_cache:
+        os.environ["RESPONSE_CACHE_SIZE"] = "0"
+    # Sin REFRESH de la vista de deudores en medio de la medición
+    os.environ.setdefault("DEBTORS_REFRESH_DELAY", "3600")
+    # Los tokens sólo viven en este proceso: alcanza con una clave al azar
+    os.environ.setdefault("JWT_SECRET_KEY", secrets.token_hex(32))
+
+    if args.seed_data:
+        from scripts.seed_data import refresh_derived, seed
+        counts = seed(args.scale, args.seed, truncate=True)
+        refresh_derived()
+        print("dataset: " + ", ".join(f"{t}={n}" for t, n in counts.items()))
+
+    results = asyncio.run(run(args))
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, args)
+    if args.compare and compare(args.compare, results, args.tolerance, args.sql_only):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
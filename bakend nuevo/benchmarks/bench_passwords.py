@@ -0,0 +1,63 @@
+# benchmarks/bench_passwords.py
+"""
+Logins por segundo que soporta el KDF con el costo configurado.
+
+Mide verify_password (lo que cuesta cada login) a través del pool de
+auth/passwords.py con distintas concurrencias. Los parámetros se toman
+de las mismas variables de entorno que la API:
+
+    PASSWORD_SCRYPT_LOG_N=15 PASSWORD_HASH_WORKERS=4 python -m benchmarks.bench_passwords
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from auth import passwords
+
+
+async def _run(concurrency: int, total: int, stored: str) -> dict:
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            start = time.perf_counter()
+            ok, _ = await passwords.verify_password("secret123", stored)
+            latencies.append(time.perf_counter() - start)
+            assert ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "logins_per_sec": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--total", type=int, default=64, help="verificaciones por nivel de concurrencia")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    print(
+        f"scrypt N=2**{passwords.PASSWORD_SCRYPT_LOG_N} r={passwords.PASSWORD_SCRYPT_R} "
+        f"p={passwords.PASSWORD_SCRYPT_P} workers={passwords.PASSWORD_HASH_WORKERS}"
+    )
+    stored = passwords.hash_password_sync("secret123")
+
+    print(f"{'concurrencia':>12} {'logins/s':>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for c in args.concurrency:
+        r = asyncio.run(_run(c, args.total, stored))
+        print(f"{r['concurrency']:>12} {r['logins_per_sec']:>10.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
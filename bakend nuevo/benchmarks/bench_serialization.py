@@ -0,0 +1,150 @@
+# benchmarks/bench_serialization.py
+"""
+Costo de serializar una página de POST /payments/paginated, sin base ni red.
+
+Arma páginas sintéticas con payment_list_item (el mismo helper del
+endpoint) y mide cuánto tarda cada forma de convertirlas a JSON:
+
+- jsonable_encoder + json: lo que hacía FastAPI sin response_model
+- response_model (dump_json): validación + serialización con pydantic en
+  Rust; es lo que hace FastAPI hoy con la clase de respuesta por defecto
+- response_model + orjson: lo que pasaría con una default_response_class
+  basada en orjson (FastAPI serializa el modelo a dict y después lo
+  renderiza esa clase); sólo si orjson está instalado
+
+Cada página se mide con y sin los campos planos de compatibilidad
+('compact'). No hace falta que la base esté levantada.
+
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --sizes 20 200 --seconds 1
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from routes.payment_routes import PaymentsPaginatedResponse, payment_list_item
+from utils.pagination import page_meta
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _page(size: int, compact: bool) -> dict:
+    base = datetime(2025, 3, 1, 9, 30, 0, 250000)
+    career = SimpleNamespace(id=3, name="Tecnicatura en Enfermería")
+    items = []
+    for i in range(size):
+        user = SimpleNamespace(id=1000 + i, username=f"alumno{i:05d}")
+        ud = SimpleNamespace(
+            first_name="María José",
+            last_name="Fernández",
+            dni=f"{30000000 + i}",
+            email=f"alumno{i:05d}@escuela.edu.ar",
+        )
+        uxc = SimpleNamespace(id=5000 + i)
+        p = SimpleNamespace(
+            id=90000 + i,
+            numero_cuota=i % 12 + 1,
+            fecha_pago=base - timedelta(hours=i),
+            monto=185000,
+            adelantado=i % 20 == 0,
+            anulado=i % 33 == 0,
+        )
+        items.append(payment_list_item(p, uxc, user, ud, career, compact=compact))
+
+    return {
+        "success": True,
+        "message": "Pagos listados correctamente",
+        # total_is_estimate explícito: el modelo lo agrega siempre y así
+        # las tres formas producen el mismo documento
+        "data": {"items": items, **page_meta(1, size, size * 40), "total_is_estimate": False},
+    }
+
+
+# La medición se parte en rondas y se reporta la mejor: el ruido de la
+# máquina (GC, otros procesos) sólo puede sumar tiempo
+ROUNDS = 5
+
+
+def _time_per_call(fn: Callable[[], bytes], seconds: float) -> float:
+    """Milisegundos por llamada (mejor ronda), repitiendo durante 'seconds'."""
+    fn()  # calentamiento (schemas, caches de pydantic)
+    best = float("inf")
+    for _ in range(ROUNDS):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= seconds / ROUNDS and calls >= 3:
+                break
+        best = min(best, elapsed / calls * 1000)
+    return best
+
+
+def _strategies(body: dict) -> List[tuple]:
+    adapter = TypeAdapter(PaymentsPaginatedResponse)
+
+    def encoder_json() -> bytes:
+        return json.dumps(
+            jsonable_encoder(body),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def model_dump_json() -> bytes:
+        return adapter.dump_json(adapter.validate_python(body, from_attributes=True))
+
+    strategies = [
+        ("jsonable_encoder + json", encoder_json),
+        ("response_model (dump_json)", model_dump_json),
+    ]
+
+    if orjson is not None:
+        def model_orjson() -> bytes:
+            value = adapter.validate_python(body, from_attributes=True)
+            return orjson.dumps(adapter.dump_python(value, mode="json"))
+
+        strategies.append(("response_model + orjson", model_orjson))
+    return strategies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 500], help="page_size a medir")
+    parser.add_argument("--seconds", type=float, default=0.5, help="tiempo de medición por combinación")
+    args = parser.parse_args()
+
+    print(f"{'page_size':>9}  {'modo':<8} {'serialización':<28} {'ms/página':>10} {'KB':>8}")
+    for size in args.sizes:
+        for compact in (False, True):
+            body = _page(size, compact)
+            results = []
+            for name, fn in _strategies(body):
+                output = fn()
+                results.append((name, _time_per_call(fn, args.seconds), len(output), json.loads(output)))
+
+            # Todas tienen que producir el mismo documento
+            reference = results[0][3]
+            for name, _, _, parsed in results[1:]:
+                if parsed != reference:
+                    raise SystemExit(f"'{name}' produce un JSON distinto al de referencia")
+
+            mode = "compact" if compact else "completo"
+            for name, ms, size_bytes, _ in results:
+                print(f"{size:>9}  {mode:<8} {name:<28} {ms:>10.3f} {size_bytes / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
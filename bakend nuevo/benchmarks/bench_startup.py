@@ -0,0 +1,57 @@
+# benchmarks/bench_startup.py
+"""
+Tiempo de arranque en frío de un worker.
+
+Lanza procesos nuevos de Python (como haría uvicorn/gunicorn por worker)
+y mide cuánto tarda 'import main' y la primera respuesta de GET /.
+El arranque ya no ejecuta DDL: no hace falta que la base esté levantada.
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Corre en el proceso hijo: imprime los tiempos en JSON
+_CHILD = """
+import json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    t2 = time.perf_counter()
+    assert client.get("/").status_code == 200
+    t3 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "first_request_ms": (t3 - t2) * 1000}))
+"""
+
+
+def _run_once() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="procesos a lanzar")
+    args = parser.parse_args()
+
+    results = [_run_once() for _ in range(args.runs)]
+
+    print(f"{'métrica':>18} {'mín ms':>8} {'p50 ms':>8} {'máx ms':>8}")
+    for key in ("import_ms", "first_request_ms"):
+        values = [r[key] for r in results]
+        print(f"{key:>18} {min(values):>8.1f} {statistics.median(values):>8.1f} {max(values):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
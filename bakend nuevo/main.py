@@ -1,18 +1,33 @@
 # main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-
-from config.db import Base, engine
 
 from routes import user_routes
 from routes import news_routes     
 from routes import career_routes        
 from routes import payment_routes
 from routes import enrollment_routes 
+from routes import alumno_routes
+from routes import metrics_routes
+from routes import report_routes
 from routes.upload_routes import router as upload_router
+from auth.security import check_secret_key
+from config.db import async_engine, engine
+from utils.metrics import MetricsMiddleware
+from utils.sql_profiler import install_sql_profiler
+from utils.static import ImmutableStaticFiles
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 👉 Sin JWT_SECRET_KEY el worker no arranca (ver auth/security.py)
+    check_secret_key()
+    yield
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 # 👇 ORÍGENES PERMITIDOS (tu front)
 origins = [
@@ -28,15 +43,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 👉 Perfilado SQL por request (SQL_PROFILING=true): header Server-Timing
+# y log 'sql.slow' con las sentencias lentas (ver utils/sql_profiler.py)
+install_sql_profiler(app, [async_engine.sync_engine, engine])
+
+# 👉 Métricas de latencia/errores por ruta para Prometheus (GET /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # 👉 Montar carpeta estática para servir imágenes de noticias
+# (cache immutable, ETag por hash, Range y variantes WebP/AVIF: ver utils/static.py)
 app.mount(
     "/static/news_images",
-    StaticFiles(directory="static/news_images"),
+    ImmutableStaticFiles(directory="static/news_images"),
     name="news_images"
 )
 
-# 👉 Crear tablas
-Base.metadata.create_all(bind=engine)
+# 👉 Las tablas las crean las migraciones ('alembic upgrade head'), no el arranque
 
 # 👉 Incluir routers
 app.include_router(user_routes.router)
@@ -45,6 +67,9 @@ app.include_router(news_routes.router)     # /news, /news/paginated, etc.
 app.include_router(career_routes.router)   # /careers, /careers/paginated, etc.
 app.include_router(payment_routes.router) 
 app.include_router(enrollment_routes.router)  
+app.include_router(alumno_routes.router, prefix="/alumno", tags=["alumno"])  # /alumno/perfil, /alumno/carreras, /alumno/pagos
+app.include_router(metrics_routes.router)  # /metrics, /metrics/db
+app.include_router(report_routes.router)   # /reports/debtors
 @app.get("/")
 def root():
     return {"message": "API Escuela OK"}
@@ -0,0 +1,41 @@
+# migrations/env.py
+
+from logging.config import fileConfig
+
+from alembic import context
+
+from config.db import Base, DATABASE_URL, engine
+import models.user, models.career, models.career_price, models.news, models.payment, models.usuarioxcarrera  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Metadata de los modelos (para 'alembic revision --autogenerate')
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL sin conectarse ('alembic upgrade head --sql')."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
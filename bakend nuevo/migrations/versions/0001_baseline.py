@@ -0,0 +1,95 @@
+"""Esquema inicial (el que creaba Base.metadata.create_all)
+
+Bases existentes creadas con create_all: no aplicar, marcar con
+'alembic stamp 0001' y seguir con 'alembic upgrade head'.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usuarios",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(50), nullable=False, unique=True),
+        sa.Column("password", sa.String(255), nullable=False),
+    )
+    op.create_index("ix_usuarios_id", "usuarios", ["id"])
+
+    op.create_table(
+        "detalles_usuario",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("id_user", sa.Integer(), sa.ForeignKey("usuarios.id")),
+        sa.Column("first_name", sa.String(50)),
+        sa.Column("last_name", sa.String(50)),
+        sa.Column("dni", sa.String(20), unique=True),
+        sa.Column("email", sa.String(100)),
+        sa.Column("type", sa.String(20)),
+    )
+    op.create_index("ix_detalles_usuario_id", "detalles_usuario", ["id"])
+
+    op.create_table(
+        "carreras",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(50), nullable=False, unique=True),
+        sa.Column("costo_mensual", sa.Integer(), nullable=False),
+        sa.Column("duracion_meses", sa.Integer(), nullable=False),
+        sa.Column("inicio_cursado", sa.DateTime()),
+    )
+    op.create_index("ix_carreras_id", "carreras", ["id"])
+
+    op.create_table(
+        "carrera_precios",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("id_carrera", sa.Integer(), sa.ForeignKey("carreras.id"), nullable=False),
+        sa.Column("monto", sa.Integer(), nullable=False),
+        sa.Column("fecha_desde", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_carrera_precios_id", "carrera_precios", ["id"])
+
+    op.create_table(
+        "usuarioxcarrera",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("id_userdetail", sa.Integer(), sa.ForeignKey("detalles_usuario.id"), nullable=False),
+        sa.Column("id_carrera", sa.Integer(), sa.ForeignKey("carreras.id"), nullable=False),
+    )
+    op.create_index("ix_usuarioxcarrera_id", "usuarioxcarrera", ["id"])
+
+    op.create_table(
+        "pagos",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("id_usuarioxcarrera", sa.Integer(), sa.ForeignKey("usuarioxcarrera.id"), nullable=False),
+        sa.Column("numero_cuota", sa.Integer(), nullable=False),
+        sa.Column("fecha_pago", sa.DateTime()),
+        sa.Column("monto", sa.Integer(), nullable=False),
+        sa.Column("adelantado", sa.Boolean()),
+        sa.Column("anulado", sa.Boolean()),
+    )
+    op.create_index("ix_pagos_id", "pagos", ["id"])
+
+    op.create_table(
+        "noticias",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("image_url", sa.String(500)),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("id_admin", sa.Integer(), sa.ForeignKey("detalles_usuario.id"), nullable=False),
+    )
+    op.create_index("ix_noticias_id", "noticias", ["id"])
+
+
+def downgrade() -> None:
+    for table in ("noticias", "pagos", "usuarioxcarrera", "carrera_precios", "carreras", "detalles_usuario", "usuarios"):
+        op.drop_table(table)
@@ -0,0 +1,144 @@
+"""Índices de búsqueda/listados, resumen de noticias y vista 'deudores'
+
+Todo lo que se fue agregando a los modelos después del baseline.
+Es idempotente (IF NOT EXISTS): una base creada con create_all por una
+versión intermedia puede marcarse con 'alembic stamp 0001' y subir igual.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+# Vista materializada de deudores (ver utils/debtor_report.py para el REFRESH)
+CREATE_DEUDORES = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS deudores AS
+WITH cuotas_vencidas AS (
+    SELECT uxc.id AS id_usuarioxcarrera,
+           uxc.id_userdetail,
+           uxc.id_carrera,
+           gs.n AS numero_cuota,
+           c.inicio_cursado + (gs.n - 1) * INTERVAL '1 month' AS vencimiento,
+           c.costo_mensual
+    FROM usuarioxcarrera uxc
+    JOIN carreras c ON c.id = uxc.id_carrera
+    CROSS JOIN LATERAL generate_series(1, c.duracion_meses) AS gs(n)
+    WHERE c.inicio_cursado + (gs.n - 1) * INTERVAL '1 month' < (now() AT TIME ZONE 'utc')
+)
+SELECT cv.id_usuarioxcarrera,
+       u.id AS user_id,
+       u.username,
+       ud.first_name,
+       ud.last_name,
+       ud.dni,
+       ud.email,
+       c.id AS career_id,
+       c.name AS career_name,
+       COUNT(*) AS cuotas_vencidas,
+       SUM(cv.costo_mensual) AS monto_vencido,
+       MIN(cv.numero_cuota) AS primera_cuota_vencida,
+       MIN(cv.vencimiento) AS primer_vencimiento,
+       (now() AT TIME ZONE 'utc') AS calculado_en
+FROM cuotas_vencidas cv
+JOIN detalles_usuario ud ON ud.id = cv.id_userdetail
+JOIN usuarios u ON u.id = ud.id_user
+JOIN carreras c ON c.id = cv.id_carrera
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM pagos p
+    WHERE p.id_usuarioxcarrera = cv.id_usuarioxcarrera
+      AND p.numero_cuota = cv.numero_cuota
+      AND NOT p.anulado
+)
+GROUP BY cv.id_usuarioxcarrera, u.id, u.username, ud.first_name, ud.last_name,
+         ud.dni, ud.email, c.id, c.name;
+
+-- Índice único: requerido por REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS ux_deudores_inscripcion ON deudores (id_usuarioxcarrera);
+CREATE INDEX IF NOT EXISTS ix_deudores_orden ON deudores (cuotas_vencidas DESC, monto_vencido DESC, id_usuarioxcarrera);
+CREATE INDEX IF NOT EXISTS ix_deudores_carrera ON deudores (career_id);
+"""
+
+
+def _has_pg_trgm(bind) -> bool:
+    return bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first() is not None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Búsqueda ILIKE '%term%' del admin: sólo si el servidor trae pg_trgm
+    # (sin la extensión la búsqueda funciona igual, con seq scan)
+    if _has_pg_trgm(bind):
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_usuarios_username_trgm", "usuarios", ["username"],
+            postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_detalles_usuario_nombre_trgm", "detalles_usuario", ["first_name", "last_name", "email"],
+            postgresql_using="gin",
+            postgresql_ops={
+                "first_name": "gin_trgm_ops",
+                "last_name": "gin_trgm_ops",
+                "email": "gin_trgm_ops",
+            },
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_carreras_name_trgm", "carreras", ["name"],
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+    # Búsqueda por prefijo de DNI (LIKE 'term%')
+    op.create_index(
+        "ix_detalles_usuario_dni_prefix", "detalles_usuario", ["dni"],
+        postgresql_ops={"dni": "varchar_pattern_ops"},
+        if_not_exists=True,
+    )
+
+    # Paginación de pagos y búsqueda de pagos por inscripción/cuota
+    op.create_index("ix_pagos_fecha_pago_id", "pagos", ["fecha_pago", "id"], if_not_exists=True)
+    op.create_index("ix_pagos_inscripcion_cuota", "pagos", ["id_usuarioxcarrera", "numero_cuota"], if_not_exists=True)
+
+    # Precio vigente por carrera/fecha (index-only scan)
+    op.create_index(
+        "ix_carrera_precios_carrera_fecha", "carrera_precios", ["id_carrera", "fecha_desde"],
+        postgresql_include=["monto"],
+        if_not_exists=True,
+    )
+
+    # Resumen de noticias para los listados + orden por fecha
+    op.execute("ALTER TABLE noticias ADD COLUMN IF NOT EXISTS excerpt VARCHAR(201)")
+    op.execute(
+        "UPDATE noticias SET excerpt = left(btrim(regexp_replace(content, '\\s+', ' ', 'g')), 200) "
+        "WHERE excerpt IS NULL"
+    )
+    op.create_index("ix_noticias_created_at_id", "noticias", ["created_at", "id"], if_not_exists=True)
+
+    op.execute(CREATE_DEUDORES)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS deudores")
+    op.drop_index("ix_noticias_created_at_id", table_name="noticias", if_exists=True)
+    op.drop_column("noticias", "excerpt")
+    op.drop_index("ix_carrera_precios_carrera_fecha", table_name="carrera_precios", if_exists=True)
+    op.drop_index("ix_pagos_inscripcion_cuota", table_name="pagos", if_exists=True)
+    op.drop_index("ix_pagos_fecha_pago_id", table_name="pagos", if_exists=True)
+    op.drop_index("ix_detalles_usuario_dni_prefix", table_name="detalles_usuario", if_exists=True)
+    op.drop_index("ix_carreras_name_trgm", table_name="carreras", if_exists=True)
+    op.drop_index("ix_detalles_usuario_nombre_trgm", table_name="detalles_usuario", if_exists=True)
+    op.drop_index("ix_usuarios_username_trgm", table_name="usuarios", if_exists=True)
@@ -0,0 +1,41 @@
+"""Índices sobre las claves foráneas
+
+Postgres no indexa las FK solo: sin estos índices los JOIN por
+inscripción/alumno y los DELETE en cascada manual recorren la tabla entera.
+pagos.id_usuarioxcarrera y carrera_precios.id_carrera ya quedan cubiertas
+por ix_pagos_inscripcion_cuota e ix_carrera_precios_carrera_fecha (0002).
+
+Se crean CONCURRENTLY (fuera de transacción) para no bloquear escrituras
+en bases con datos.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+FK_INDEXES = (
+    ("ix_usuarioxcarrera_id_userdetail", "usuarioxcarrera", "id_userdetail"),
+    ("ix_usuarioxcarrera_id_carrera", "usuarioxcarrera", "id_carrera"),
+    ("ix_detalles_usuario_id_user", "detalles_usuario", "id_user"),
+    ("ix_noticias_id_admin", "noticias", "id_admin"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in FK_INDEXES:
+            op.create_index(name, table, [column], postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in FK_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,39 @@
+"""Índice para buscar usuarios por prefijo de username
+
+Un término de búsqueda con letras y dígitos se resuelve sólo por prefijo de
+username, sin distinguir mayúsculas: lower(username) LIKE 'term%' (ver
+utils/search.py). lower() devuelve text, por eso text_pattern_ops (el
+equivalente de varchar_pattern_ops para text): así el LIKE por prefijo usa
+el índice con cualquier collation.
+
+Se crea CONCURRENTLY (fuera de transacción) para no bloquear escrituras.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_usuarios_username_lower_prefix", "usuarios",
+            [sa.text("lower(username) text_pattern_ops")],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_usuarios_username_lower_prefix", table_name="usuarios",
+            postgresql_concurrently=True, if_exists=True,
+        )
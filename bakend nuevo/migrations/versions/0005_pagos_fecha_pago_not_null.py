@@ -0,0 +1,39 @@
+"""pagos.fecha_pago NOT NULL
+
+El listado global ordena por (fecha_pago DESC, id DESC) y pagina por cursor
+sobre ese par (ver routes/payment_routes.py): con un NULL el cursor no se
+puede codificar y la comparación de tuplas nunca alcanza esas filas. La app
+siempre guarda la fecha; los NULL que queden son de datos viejos y se
+completan con 1970-01-01 (quedan al final del listado, como los más viejos).
+
+El NOT NULL se valida primero con un CHECK NOT VALID + VALIDATE (no bloquea
+escrituras mientras recorre la tabla); después SET NOT NULL reutiliza ese
+CHECK y no vuelve a recorrerla.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE pagos SET fecha_pago = '1970-01-01' WHERE fecha_pago IS NULL")
+    op.execute(
+        "ALTER TABLE pagos ADD CONSTRAINT ck_pagos_fecha_pago_not_null "
+        "CHECK (fecha_pago IS NOT NULL) NOT VALID"
+    )
+    op.execute("ALTER TABLE pagos VALIDATE CONSTRAINT ck_pagos_fecha_pago_not_null")
+    op.alter_column("pagos", "fecha_pago", existing_type=sa.DateTime(), nullable=False)
+    op.drop_constraint("ck_pagos_fecha_pago_not_null", "pagos", type_="check")
+
+
+def downgrade() -> None:
+    op.alter_column("pagos", "fecha_pago", existing_type=sa.DateTime(), nullable=True)
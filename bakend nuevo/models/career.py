@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from config.db import Base
 import datetime
@@ -9,6 +9,15 @@ import datetime
 # ==============================================
 class Career(Base):
     __tablename__ = "carreras"
+    __table_args__ = (
+        # Búsqueda ILIKE '%term%' del admin (requiere pg_trgm)
+        Index(
+            "ix_carreras_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), unique=True, nullable=False)
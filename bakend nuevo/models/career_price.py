@@ -1,6 +1,6 @@
 # models/career_price.py
 
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from config.db import Base
 import datetime
@@ -8,6 +8,15 @@ import datetime
 
 class CareerPriceHistory(Base):
     __tablename__ = "carrera_precios"
+    __table_args__ = (
+        # Precio vigente por carrera/fecha; monto incluido → index-only scan
+        Index(
+            "ix_carrera_precios_carrera_fecha",
+            "id_carrera",
+            "fecha_desde",
+            postgresql_include=["monto"],
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     id_carrera = Column(Integer, ForeignKey("carreras.id"), nullable=False)
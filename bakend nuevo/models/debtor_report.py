@@ -0,0 +1,31 @@
+# models/debtor_report.py
+
+from sqlalchemy import table, column
+
+
+# ==============================================
+# VISTA MATERIALIZADA: Deudores
+# ==============================================
+# Una fila por inscripción con cuotas vencidas sin pago vigente (no anulado).
+# Se calcula contra la hora del último REFRESH (calculado_en); ver
+# utils/debtor_report.py para cuándo se refresca. La vista y sus índices
+# se crean en migrations/versions/0002_search_indexes_and_debtors.py.
+
+# Construcción liviana para consultar la vista
+deudores = table(
+    "deudores",
+    column("id_usuarioxcarrera"),
+    column("user_id"),
+    column("username"),
+    column("first_name"),
+    column("last_name"),
+    column("dni"),
+    column("email"),
+    column("career_id"),
+    column("career_name"),
+    column("cuotas_vencidas"),
+    column("monto_vencido"),
+    column("primera_cuota_vencida"),
+    column("primer_vencimiento"),
+    column("calculado_en"),
+)
@@ -1,25 +1,50 @@
 # models/news.py
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+import re
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from config.db import Base
 import datetime
 
+# Largo máximo del resumen que se muestra en los listados
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(content: str, max_len: int = EXCERPT_LENGTH) -> str:
+    """
+    Resumen en texto plano: espacios colapsados y cortado en el último
+    límite de palabra antes de max_len (con '…' si se recortó).
+    """
+    text = re.sub(r"\s+", " ", content or "").strip()
+    if len(text) <= max_len:
+        return text
+    cut = text[:max_len].rsplit(" ", 1)[0] or text[:max_len]
+    return cut.rstrip(" .,;:") + "…"
+
+
 class News(Base):
     __tablename__ = "noticias"
+    __table_args__ = (
+        # Orden del listado: más nuevas primero
+        Index("ix_noticias_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
+    # Se calcula al crear/editar (make_excerpt) para no leer 'content' en los listados
+    excerpt = Column(String(EXCERPT_LENGTH + 1), nullable=True)
     image_url = Column(String(500), nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
     # Autor → admin que publicó la noticia
-    id_admin = Column(Integer, ForeignKey("detalles_usuario.id"), nullable=False)
+    id_admin = Column(Integer, ForeignKey("detalles_usuario.id"), nullable=False, index=True)
     admin = relationship("UserDetail")
 
     def __init__(self, title, content, id_admin, image_url=None):
         self.title = title
         self.content = content
+        self.excerpt = make_excerpt(content)
         self.image_url = image_url
         self.id_admin = id_admin
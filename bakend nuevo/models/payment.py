@@ -1,6 +1,6 @@
 # models/payment.py
 
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from config.db import Base   # ✅ solo Base, nada de get_db
 import datetime
@@ -8,11 +8,17 @@ import datetime
 
 class Payment(Base):
     __tablename__ = "pagos"
+    __table_args__ = (
+        # Orden del listado global y paginado keyset por (fecha_pago, id)
+        Index("ix_pagos_fecha_pago_id", "fecha_pago", "id"),
+        # Pagos de una inscripción/cuota (estado de cuenta, reporte de deudores)
+        Index("ix_pagos_inscripcion_cuota", "id_usuarioxcarrera", "numero_cuota"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     id_usuarioxcarrera = Column(Integer, ForeignKey("usuarioxcarrera.id"), nullable=False)
     numero_cuota = Column(Integer, nullable=False)
-    fecha_pago = Column(DateTime, default=datetime.datetime.utcnow)
+    fecha_pago = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
     monto = Column(Integer, nullable=False)
     adelantado = Column(Boolean, default=False)
     anulado = Column(Boolean, default=False)
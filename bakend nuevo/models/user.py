@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from config.db import Base
 
@@ -7,12 +7,25 @@ from config.db import Base
 # ==============================================
 class User(Base):
     __tablename__ = "usuarios"
+    __table_args__ = (
+        # Búsqueda ILIKE '%term%' del admin (requiere pg_trgm)
+        Index(
+            "ix_usuarios_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+        # Búsqueda por prefijo de username (lower(username) LIKE 'term%')
+        Index("ix_usuarios_username_lower_prefix", text("lower(username) text_pattern_ops")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, nullable=False)
-    password = Column(String(255), nullable=False)  # sin encriptar por ahora
+    password = Column(String(255), nullable=False)  # hash scrypt (ver auth/passwords.py)
 
-    # Relación uno a uno con detalle
+    # Relación uno a uno con detalle. Carga por defecto (lazy): cada consulta que
+    # lo necesita lo pide con joinedload/contains_eager, así las que ya hacen
+    # JOIN a detalles_usuario (ej. /payments/paginated) no suman otro
     userdetail = relationship("UserDetail", uselist=False, back_populates="user")
 
     def __init__(self, username, password):
@@ -25,9 +38,30 @@ class User(Base):
 # ==============================================
 class UserDetail(Base):
     __tablename__ = "detalles_usuario"
+    __table_args__ = (
+        # Búsqueda ILIKE '%term%' del admin (requiere pg_trgm)
+        Index(
+            "ix_detalles_usuario_nombre_trgm",
+            "first_name",
+            "last_name",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={
+                "first_name": "gin_trgm_ops",
+                "last_name": "gin_trgm_ops",
+                "email": "gin_trgm_ops",
+            },
+        ),
+        # Búsqueda por prefijo de DNI (LIKE 'term%')
+        Index(
+            "ix_detalles_usuario_dni_prefix",
+            "dni",
+            postgresql_ops={"dni": "varchar_pattern_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    id_user = Column(Integer, ForeignKey("usuarios.id"))
+    id_user = Column(Integer, ForeignKey("usuarios.id"), index=True)
     first_name = Column(String(50))
     last_name = Column(String(50))
     dni = Column(String(20), unique=True)
@@ -10,8 +10,8 @@ class UsuarioXcarrera(Base):
     __tablename__ = "usuarioxcarrera"
 
     id = Column(Integer, primary_key=True, index=True)
-    id_userdetail = Column(Integer, ForeignKey("detalles_usuario.id"), nullable=False)
-    id_carrera = Column(Integer, ForeignKey("carreras.id"), nullable=False)
+    id_userdetail = Column(Integer, ForeignKey("detalles_usuario.id"), nullable=False, index=True)
+    id_carrera = Column(Integer, ForeignKey("carreras.id"), nullable=False, index=True)
 
     # Relaciones
     userdetail = relationship("UserDetail", back_populates="usuario_carrera")
@@ -1,15 +1,19 @@
 # routes/alumno_routes.py
 from fastapi import APIRouter, Request, Depends, Query
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
 from typing import Optional, List
 
-from config.db import get_db
+from config.db import get_async_db
 from auth.security import Security
 from models.user import User, UserDetail
 from models.usuarioxcarrera import UsuarioXcarrera
 from models.career import Career
 from models.payment import Payment
+from utils.responses import ApiResponse
 
 router = APIRouter()
 
@@ -41,12 +45,55 @@ def _extract_user_id(payload: dict) -> Optional[int]:
     return payload.get("id") or payload.get("idusuario") or payload.get("user_id")
 
 
+# ---------------------------
+# Schemas de respuesta
+# (los errores salen como JSONResponse con el mismo sobre)
+# ---------------------------
+class PerfilOut(BaseModel):
+    id: int
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    dni: Optional[str] = None
+    email: Optional[str] = None
+    rol: Optional[str] = None
+
+
+class CarreraAlumnoOut(BaseModel):
+    id_inscripcion: int
+    carrera_id: int
+    carrera_nombre: str
+    costo_mensual: int
+    duracion_meses: int
+    fecha_inscripcion: Optional[datetime] = None
+
+
+class CarrerasAlumno(BaseModel):
+    carreras: List[CarreraAlumnoOut]
+
+
+class PagoAlumnoOut(BaseModel):
+    id_pago: int
+    id_inscripcion: int
+    carrera_id: int
+    carrera_nombre: str
+    numero_cuota: int
+    monto: int
+    adelantado: Optional[bool] = None
+    anulado: Optional[bool] = None
+    fecha_pago: Optional[datetime] = None
+
+
+class PagosAlumno(BaseModel):
+    pagos: List[PagoAlumnoOut]
+
+
 # ---------------------------
 # Endpoints alumno
 # ---------------------------
 
-@router.get("/perfil")
-async def obtener_perfil(request: Request, db: Session = Depends(get_db)):
+@router.get("/perfil", response_model=ApiResponse[PerfilOut])
+async def obtener_perfil(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Devuelve el perfil del alumno autenticado.
     """
@@ -63,30 +110,43 @@ async def obtener_perfil(request: Request, db: Session = Depends(get_db)):
         return JSONResponse(status_code=400, content=standard_response(False, "Token inválido: user id no encontrado", None))
 
     try:
-        # Obtener el User y su detalle
-        user = db.query(User).filter(User.id == user_id).first()
+        # User + detalle en una sola consulta (sólo las columnas del perfil)
+        user = (
+            await db.execute(
+                select(
+                    User.id,
+                    User.username,
+                    UserDetail.first_name,
+                    UserDetail.last_name,
+                    UserDetail.dni,
+                    UserDetail.email,
+                    UserDetail.type,
+                )
+                .outerjoin(UserDetail, UserDetail.id_user == User.id)
+                .where(User.id == user_id)
+            )
+        ).first()
         if not user:
             return JSONResponse(status_code=404, content=standard_response(False, "Usuario no encontrado", None))
 
-        detail = db.query(UserDetail).filter(UserDetail.id_user == user_id).first()
         perfil = {
             "id": user.id,
             "username": user.username,
-            "first_name": detail.first_name if detail else None,
-            "last_name": detail.last_name if detail else None,
-            "dni": detail.dni if detail else None,
-            "email": detail.email if detail else None,
-            "rol": detail.type if detail else None,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "dni": user.dni,
+            "email": user.email,
+            "rol": user.type,
         }
 
-        return JSONResponse(status_code=200, content=standard_response(True, "Perfil obtenido", perfil))
+        return standard_response(True, "Perfil obtenido", perfil)
     except Exception as ex:
         print("Error obtener_perfil:", ex)
         return JSONResponse(status_code=500, content=standard_response(False, "Error interno al obtener perfil", None))
 
 
-@router.get("/carreras")
-async def obtener_carreras(request: Request, db: Session = Depends(get_db)):
+@router.get("/carreras", response_model=ApiResponse[CarrerasAlumno])
+async def obtener_carreras(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Devuelve la lista de carreras donde el alumno está inscripto.
     Cada elemento incluye: id_inscripcion, carrera_id, nombre, costo_mensual, duracion_meses, fecha_inscripcion.
@@ -105,39 +165,46 @@ async def obtener_carreras(request: Request, db: Session = Depends(get_db)):
 
     try:
         # Obtener detalle del alumno (detalles_usuario)
-        detalle = db.query(UserDetail).filter(UserDetail.id_user == user_id).first()
+        detalle = await db.scalar(select(UserDetail).where(UserDetail.id_user == user_id))
         if not detalle:
             return JSONResponse(status_code=404, content=standard_response(False, "Detalle del usuario no encontrado", None))
 
-        # Buscar inscripciones
-        inscripciones = db.query(UsuarioXcarrera).filter(UsuarioXcarrera.id_userdetail == detalle.id).all()
-
-        out = []
-        for ins in inscripciones:
-            # cargar carrera relacionada
-            carrera = db.query(Career).filter(Career.id == ins.id_carrera).first()
-            out.append({
+        # Inscripciones + carrera en una sola consulta (sin N+1)
+        rows = (
+            await db.execute(
+                select(UsuarioXcarrera, Career)
+                .join(Career, UsuarioXcarrera.id_carrera == Career.id)
+                .where(UsuarioXcarrera.id_userdetail == detalle.id)
+                .order_by(UsuarioXcarrera.id)
+            )
+        ).all()
+
+        out = [
+            {
                 "id_inscripcion": ins.id,
-                "carrera_id": carrera.id if carrera else None,
-                "carrera_nombre": carrera.name if carrera else None,
-                "costo_mensual": carrera.costo_mensual if carrera else None,
-                "duracion_meses": carrera.duracion_meses if carrera else None,
-                "fecha_inscripcion": getattr(ins, "fecha_inscripcion", None)
-            })
-
-        return JSONResponse(status_code=200, content=standard_response(True, "Carreras del alumno", {"carreras": out}))
+                "carrera_id": carrera.id,
+                "carrera_nombre": carrera.name,
+                "costo_mensual": carrera.costo_mensual,
+                "duracion_meses": carrera.duracion_meses,
+                # usuarioxcarrera no guarda la fecha; el campo queda por compatibilidad
+                "fecha_inscripcion": None,
+            }
+            for ins, carrera in rows
+        ]
+
+        return standard_response(True, "Carreras del alumno", {"carreras": out})
     except Exception as ex:
         print("Error obtener_carreras:", ex)
         return JSONResponse(status_code=500, content=standard_response(False, "Error interno al obtener carreras", None))
 
 
-@router.get("/pagos")
+@router.get("/pagos", response_model=ApiResponse[PagosAlumno])
 async def obtener_pagos(
     request: Request,
     carrera_id: Optional[int] = Query(None, description="Filtrar por id de carrera"),
     inscripcion_id: Optional[int] = Query(None, description="Filtrar por id de inscripción"),
     limit: int = Query(200, gt=0, le=1000),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Devuelve los pagos del alumno autenticado.
@@ -156,39 +223,56 @@ async def obtener_pagos(
         return JSONResponse(status_code=400, content=standard_response(False, "Token inválido: user id no encontrado", None))
 
     try:
-        detalle = db.query(UserDetail).filter(UserDetail.id_user == user_id).first()
+        detalle = await db.scalar(select(UserDetail).where(UserDetail.id_user == user_id))
         if not detalle:
             return JSONResponse(status_code=404, content=standard_response(False, "Detalle del usuario no encontrado", None))
 
-        # Base: inscripciones del alumno
-        q = db.query(UsuarioXcarrera).filter(UsuarioXcarrera.id_userdetail == detalle.id)
-
+        # Numeramos los pagos dentro de cada inscripción para respetar 'limit'
+        # por inscripción sin hacer una consulta por cada una.
+        fila = (
+            func.row_number()
+            .over(partition_by=Payment.id_usuarioxcarrera, order_by=Payment.numero_cuota)
+            .label("fila")
+        )
+        pagos_sq = (
+            select(Payment.id.label("id_pago"), fila)
+            .join(UsuarioXcarrera, Payment.id_usuarioxcarrera == UsuarioXcarrera.id)
+            .where(UsuarioXcarrera.id_userdetail == detalle.id)
+        )
         if inscripcion_id:
-            q = q.filter(UsuarioXcarrera.id == inscripcion_id)
+            pagos_sq = pagos_sq.where(UsuarioXcarrera.id == inscripcion_id)
         if carrera_id:
-            q = q.filter(UsuarioXcarrera.id_carrera == carrera_id)
-
-        inscripciones = q.all()
-        pagos_out = []
-
-        for ins in inscripciones:
-            # obtener carrera para info contextual
-            carrera = db.query(Career).filter(Career.id == ins.id_carrera).first()
-            pagos = db.query(Payment).filter(Payment.id_usuarioxcarrera == ins.id).order_by(Payment.numero_cuota).limit(limit).all()
-            for p in pagos:
-                pagos_out.append({
-                    "id_pago": p.id,
-                    "id_inscripcion": ins.id,
-                    "carrera_id": carrera.id if carrera else None,
-                    "carrera_nombre": carrera.name if carrera else None,
-                    "numero_cuota": p.numero_cuota,
-                    "monto": p.monto,
-                    "adelantado": getattr(p, "adelantado", False),
-                    "anulado": getattr(p, "anulado", False),
-                    "fecha_pago": p.fecha_pago.isoformat() if p.fecha_pago else None
-                })
-
-        return JSONResponse(status_code=200, content=standard_response(True, "Pagos del alumno", {"pagos": pagos_out}))
+            pagos_sq = pagos_sq.where(UsuarioXcarrera.id_carrera == carrera_id)
+        pagos_sq = pagos_sq.subquery()
+
+        # Pagos + inscripción + carrera en una sola consulta
+        rows = (
+            await db.execute(
+                select(Payment, UsuarioXcarrera.id, Career.id, Career.name)
+                .join(pagos_sq, Payment.id == pagos_sq.c.id_pago)
+                .join(UsuarioXcarrera, Payment.id_usuarioxcarrera == UsuarioXcarrera.id)
+                .join(Career, UsuarioXcarrera.id_carrera == Career.id)
+                .where(pagos_sq.c.fila <= limit)
+                .order_by(UsuarioXcarrera.id, Payment.numero_cuota)
+            )
+        ).all()
+
+        pagos_out = [
+            {
+                "id_pago": p.id,
+                "id_inscripcion": id_inscripcion,
+                "carrera_id": id_carrera,
+                "carrera_nombre": carrera_nombre,
+                "numero_cuota": p.numero_cuota,
+                "monto": p.monto,
+                "adelantado": p.adelantado,
+                "anulado": p.anulado,
+                "fecha_pago": p.fecha_pago,
+            }
+            for p, id_inscripcion, id_carrera, carrera_nombre in rows
+        ]
+
+        return standard_response(True, "Pagos del alumno", {"pagos": pagos_out})
     except Exception as ex:
         print("Error obtener_pagos:", ex)
         return JSONResponse(status_code=500, content=standard_response(False, "Error interno al obtener pagos", None))
@@ -2,19 +2,28 @@
 
 from typing import Optional, List
 
-from datetime import datetime
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, validator
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from config.db import get_db
+from config.db import get_async_db
+from auth.security import get_current_user, require_admin
 from models.career import Career
 from models.career_price import CareerPriceHistory  # 👈 historial de precios
+from utils.search import normalize_search, build_search_filter, search_rank
+from utils.pagination import paginate
+from utils.debtor_report import debtors_report
+from utils.response_cache import response_cache
+from utils.responses import ApiResponse, Page
 
 router = APIRouter(
     prefix="/careers",
     tags=["careers"],
+    dependencies=[Depends(get_current_user)],
 )
 
 
@@ -56,6 +65,9 @@ class CareerBase(BaseModel):
     @validator("inicio_cursado")
     def inicio_cursado_valid(cls, v: Optional[datetime]) -> Optional[datetime]:
         # Podés meter más reglas (no muy viejo, no en 1900, etc.)
+        # Las columnas son timestamp sin zona (UTC)
+        if v is not None and v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
         return v
 
 
@@ -99,14 +111,42 @@ class CareerPricesPaginatedRequest(BaseModel):
         return v
 
 
+# -------------------------------------------------------------------
+# SCHEMAS DE RESPUESTA
+# -------------------------------------------------------------------
+
+class CareerOut(BaseModel):
+    id: int
+    name: str
+    costo_mensual: int
+    duracion_meses: int
+    inicio_cursado: Optional[datetime] = None
+
+
+class CareerPriceOut(BaseModel):
+    id: int
+    monto: int
+    fecha_desde: datetime
+    created_at: Optional[datetime] = None
+
+
+class CareerPricesPage(Page[CareerPriceOut]):
+    id_carrera: int
+    career_name: str
+
+
+CareerResponse = ApiResponse[CareerOut]
+CareerPageResponse = ApiResponse[Page[CareerOut]]
+
+
 # -------------------------------------------------------------------
 # CREAR CARRERA
 # -------------------------------------------------------------------
 
-@router.post("")
-def create_career(payload: CareerCreate, db: Session = Depends(get_db)):
+@router.post("", dependencies=[Depends(require_admin)], response_model=CareerResponse)
+async def create_career(payload: CareerCreate, db: AsyncSession = Depends(get_async_db)):
     # Validar nombre único
-    existing = db.query(Career).filter(Career.name == payload.name).first()
+    existing = await db.scalar(select(Career).where(Career.name == payload.name))
     if existing:
         raise HTTPException(status_code=400, detail="Ya existe una carrera con ese nombre")
 
@@ -120,7 +160,7 @@ def create_career(payload: CareerCreate, db: Session = Depends(get_db)):
     )
 
     db.add(nueva)
-    db.flush()  # para obtener nueva.id antes del commit
+    await db.flush()  # para obtener nueva.id antes del commit
 
     # 💡 Crear registro inicial de precio
     precio_inicial = CareerPriceHistory(
@@ -130,8 +170,9 @@ def create_career(payload: CareerCreate, db: Session = Depends(get_db)):
     )
     db.add(precio_inicial)
 
-    db.commit()
-    db.refresh(nueva)
+    await db.commit()
+    await db.refresh(nueva)
+    await response_cache.invalidate("careers")
 
     return {
       "success": True,
@@ -150,39 +191,40 @@ def create_career(payload: CareerCreate, db: Session = Depends(get_db)):
 # OBTENER UNA CARRERA POR ID
 # -------------------------------------------------------------------
 
-@router.get("/{career_id}")
-def get_career(career_id: int, db: Session = Depends(get_db)):
-    c: Optional[Career] = db.query(Career).filter(Career.id == career_id).first()
-    if not c:
-        raise HTTPException(status_code=404, detail="Carrera no encontrada")
+@router.get("/{career_id}", response_model=CareerResponse)
+async def get_career(career_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        c: Optional[Career] = await db.get(Career, career_id)
+        if not c:
+            raise HTTPException(status_code=404, detail="Carrera no encontrada")
+
+        return {
+            "success": True,
+            "data": {
+                "id": c.id,
+                "name": c.name,
+                "costo_mensual": c.costo_mensual,
+                "duracion_meses": c.duracion_meses,
+                "inicio_cursado": c.inicio_cursado,
+            },
+        }
 
-    return {
-        "success": True,
-        "data": {
-            "id": c.id,
-            "name": c.name,
-            "costo_mensual": c.costo_mensual,
-            "duracion_meses": c.duracion_meses,
-            "inicio_cursado": c.inicio_cursado,
-        },
-    }
+    return await response_cache.respond(request, "careers", build, model=CareerResponse)
 
 
 # -------------------------------------------------------------------
 # EDITAR CARRERA (con historial de precios)
 # -------------------------------------------------------------------
 
-@router.put("/{career_id}")
-def update_career(career_id: int, payload: CareerUpdate, db: Session = Depends(get_db)):
-    c: Optional[Career] = db.query(Career).filter(Career.id == career_id).first()
+@router.put("/{career_id}", dependencies=[Depends(require_admin)], response_model=CareerResponse)
+async def update_career(career_id: int, payload: CareerUpdate, db: AsyncSession = Depends(get_async_db)):
+    c: Optional[Career] = await db.get(Career, career_id)
     if not c:
         raise HTTPException(status_code=404, detail="Carrera no encontrada")
 
     # Validar nombre único si cambia
-    existing = (
-        db.query(Career)
-        .filter(Career.name == payload.name, Career.id != career_id)
-        .first()
+    existing = await db.scalar(
+        select(Career).where(Career.name == payload.name, Career.id != career_id)
     )
     if existing:
         raise HTTPException(status_code=400, detail="Ya existe otra carrera con ese nombre")
@@ -205,8 +247,10 @@ def update_career(career_id: int, payload: CareerUpdate, db: Session = Depends(g
         )
         db.add(nuevo_precio)
 
-    db.commit()
-    db.refresh(c)
+    await db.commit()
+    debtors_report.mark_dirty()
+    await response_cache.invalidate("careers")
+    await db.refresh(c)
 
     return {
         "success": True,
@@ -225,14 +269,21 @@ def update_career(career_id: int, payload: CareerUpdate, db: Session = Depends(g
 # ELIMINAR CARRERA
 # -------------------------------------------------------------------
 
-@router.delete("/{career_id}")
-def delete_career(career_id: int, db: Session = Depends(get_db)):
-    c: Optional[Career] = db.query(Career).filter(Career.id == career_id).first()
+@router.delete("/{career_id}", dependencies=[Depends(require_admin)], response_model=ApiResponse[None])
+async def delete_career(career_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Las relaciones se cargan antes: el cascade del delete no puede hacer lazy load en async
+    c: Optional[Career] = await db.get(
+        Career,
+        career_id,
+        options=[selectinload(Career.precios), selectinload(Career.usuariosxcarrera)],
+    )
     if not c:
         raise HTTPException(status_code=404, detail="Carrera no encontrada")
 
-    db.delete(c)
-    db.commit()
+    await db.delete(c)
+    await db.commit()
+    debtors_report.mark_dirty()
+    await response_cache.invalidate("careers")
 
     return {
         "success": True,
@@ -244,63 +295,69 @@ def delete_career(career_id: int, db: Session = Depends(get_db)):
 # LISTADO PAGINADO + BÚSQUEDA
 # -------------------------------------------------------------------
 
-@router.post("/paginated")
-def get_careers_paginated(
+@router.post("/paginated", response_model=CareerPageResponse)
+async def get_careers_paginated(
     payload: CareersPaginatedRequest,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
     page = payload.page
     page_size = payload.page_size
 
-    query = db.query(Career).order_by(Career.id)
-
-    if payload.search:
-        search = f"%{payload.search}%"
-        query = query.filter(Career.name.ilike(search))
-
-    total_items = query.count()
-    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
-
-    careers_db: List[Career] = (
-        query
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
-
-    items = [
-        {
-            "id": c.id,
-            "name": c.name,
-            "costo_mensual": c.costo_mensual,
-            "duracion_meses": c.duracion_meses,
-            "inicio_cursado": c.inicio_cursado,
+    async def build():
+        query = select(Career)
+
+        # Búsqueda por nombre (índice trigram), resultados por relevancia
+        search = normalize_search(payload.search)
+        if search:
+            query = query.where(build_search_filter(search, [Career.name]))
+            rank = await search_rank(db, search, [Career.name])
+            if rank is not None:
+                query = query.order_by(rank.desc())
+
+        query = query.order_by(Career.id)
+
+        # Página + total en una sola consulta
+        careers_db, meta = await paginate(db, query, page, page_size)
+
+        items = [
+            {
+                "id": c.id,
+                "name": c.name,
+                "costo_mensual": c.costo_mensual,
+                "duracion_meses": c.duracion_meses,
+                "inicio_cursado": c.inicio_cursado,
+            }
+            for c in careers_db
+        ]
+
+        return {
+            "success": True,
+            "message": "Carreras obtenidas correctamente",
+            "data": {
+                "items": items,
+                **meta,
+            },
         }
-        for c in careers_db
-    ]
 
-    return {
-        "success": True,
-        "message": "Carreras obtenidas correctamente",
-        "data": {
-            "items": items,
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_items,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-        },
-    }
+    # Cacheado por página + búsqueda (se invalida al crear/editar/borrar carreras)
+    return await response_cache.respond(
+        request,
+        "careers",
+        build,
+        payload={"page": page, "page_size": page_size, "search": normalize_search(payload.search)},
+        model=CareerPageResponse,
+    )
 
 
 # -------------------------------------------------------------------
 # HISTORIAL DE PRECIOS DE UNA CARRERA (POST + paginado)
 # -------------------------------------------------------------------
 
-@router.post("/prices/paginated")
-def get_career_prices_paginated(
+@router.post("/prices/paginated", response_model=ApiResponse[CareerPricesPage])
+async def get_career_prices_paginated(
     payload: CareerPricesPaginatedRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Devuelve el historial de precios de una carrera en orden descendente por fecha_desde.
@@ -308,9 +365,7 @@ def get_career_prices_paginated(
     """
 
     # Verificar que la carrera exista
-    carrera: Optional[Career] = (
-        db.query(Career).filter(Career.id == payload.id_carrera).first()
-    )
+    carrera: Optional[Career] = await db.get(Career, payload.id_carrera)
     if not carrera:
         raise HTTPException(status_code=404, detail="Carrera no encontrada")
 
@@ -318,20 +373,12 @@ def get_career_prices_paginated(
     page_size = payload.page_size
 
     query = (
-        db.query(CareerPriceHistory)
-        .filter(CareerPriceHistory.id_carrera == payload.id_carrera)
+        select(CareerPriceHistory)
+        .where(CareerPriceHistory.id_carrera == payload.id_carrera)
         .order_by(CareerPriceHistory.fecha_desde.desc())
     )
 
-    total_items = query.count()
-    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
-
-    precios_db = (
-        query
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    precios_db, meta = await paginate(db, query, page, page_size)
 
     items = [
         {
@@ -350,10 +397,6 @@ def get_career_prices_paginated(
             "id_carrera": payload.id_carrera,
             "career_name": carrera.name,
             "items": items,
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_items,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
+            **meta,
         },
     }
@@ -1,16 +1,23 @@
 # routes/enrollment_routes.py
 
-from typing import Optional, List
+from typing import Literal, Optional, List
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, validator
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, Integer, bindparam, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from config.db import get_db
+from config.db import get_async_db
+from auth.security import Security, get_current_user, require_admin
 from models.user import UserDetail
 from models.career import Career
 from models.usuarioxcarrera import UsuarioXcarrera
-from models.payment import Payment
+from utils.pagination import page_meta, paginate
+from utils.debtor_report import debtors_report
+from utils.metrics import enrollments_created
+from utils.responses import ApiResponse, Page
 
 # ✅ IMPORTANTE: ahora con prefix="/enrollments"
 router = APIRouter(
@@ -19,6 +26,69 @@ router = APIRouter(
 )
 
 
+# -------------------------------------------------------------------
+# SQL: Estado de cuenta de una inscripción
+# -------------------------------------------------------------------
+# Una fila por cuota (1..duracion_meses, vía generate_series) con:
+# - vencimiento: inicio_cursado + (n-1) meses
+# - pago vigente (no anulado) y cantidad de pagos anulados de esa cuota
+# - monto esperado: precio vigente (carrera_precios) al vencimiento, o a hoy
+#   si ya venció (es lo que cobraría POST /payments), o costo_mensual si no hay historial
+# - estado: pagada / vencida / pendiente
+STATEMENT_SQL = text("""
+    WITH insc AS (
+        SELECT uxc.id, uxc.id_carrera, c.name, c.duracion_meses, c.inicio_cursado, c.costo_mensual
+        FROM usuarioxcarrera uxc
+        JOIN carreras c ON c.id = uxc.id_carrera
+        WHERE uxc.id = :id_inscripcion
+    ),
+    cuotas AS (
+        SELECT gs.n AS numero_cuota,
+               insc.inicio_cursado + (gs.n - 1) * INTERVAL '1 month' AS vencimiento
+        FROM insc, generate_series(1, insc.duracion_meses) AS gs(n)
+    ),
+    pagos_cuota AS (
+        SELECT p.numero_cuota,
+               SUM(p.monto) FILTER (WHERE NOT p.anulado) AS monto_pagado,
+               MAX(p.fecha_pago) FILTER (WHERE NOT p.anulado) AS fecha_pago,
+               BOOL_OR(p.adelantado) FILTER (WHERE NOT p.anulado) AS adelantado,
+               COUNT(*) FILTER (WHERE p.anulado) AS pagos_anulados
+        FROM pagos p
+        WHERE p.id_usuarioxcarrera = :id_inscripcion
+        GROUP BY p.numero_cuota
+    )
+    SELECT insc.id_carrera,
+           insc.name AS career_name,
+           cu.numero_cuota,
+           cu.vencimiento,
+           pc.monto_pagado,
+           pc.fecha_pago,
+           COALESCE(pc.adelantado, FALSE) AS adelantado,
+           COALESCE(pc.pagos_anulados, 0) AS pagos_anulados,
+           COALESCE(pc.monto_pagado, precio.monto, insc.costo_mensual) AS monto,
+           CASE
+               WHEN pc.monto_pagado IS NOT NULL THEN 'pagada'
+               WHEN cu.vencimiento < :ahora THEN 'vencida'
+               ELSE 'pendiente'
+           END AS estado
+    FROM insc
+    CROSS JOIN cuotas cu
+    LEFT JOIN pagos_cuota pc ON pc.numero_cuota = cu.numero_cuota
+    LEFT JOIN LATERAL (
+        SELECT cp.monto
+        FROM carrera_precios cp
+        WHERE cp.id_carrera = insc.id_carrera
+          AND cp.fecha_desde <= GREATEST(cu.vencimiento, :ahora)
+        ORDER BY cp.fecha_desde DESC
+        LIMIT 1
+    ) precio ON TRUE
+    ORDER BY cu.numero_cuota
+""").bindparams(
+    bindparam("id_inscripcion", type_=Integer),
+    bindparam("ahora", type_=DateTime),
+)
+
+
 # -------------------------------------------------------------------
 # SCHEMAS
 # -------------------------------------------------------------------
@@ -58,22 +128,66 @@ class EnrollmentsByUserRequest(BaseModel):
         return v
 
 
+# -------------------------------------------------------------------
+# SCHEMAS DE RESPUESTA
+# -------------------------------------------------------------------
+
+class EnrollmentOut(BaseModel):
+    id: int
+    career_id: int
+    career_name: str
+    inicio_cursado: Optional[datetime] = None
+
+
+class EnrollmentCreated(EnrollmentOut):
+    user_id: int
+    userdetail_id: int
+
+
+class StatementCuota(BaseModel):
+    numero_cuota: int
+    vencimiento: Optional[datetime] = None
+    estado: Literal["pagada", "vencida", "pendiente"]
+    monto: int
+    fecha_pago: Optional[datetime] = None
+    adelantado: bool
+    pagos_anulados: int
+
+
+class StatementSummary(BaseModel):
+    cuotas_total: int
+    cuotas_pagadas: int
+    cuotas_vencidas: int
+    cuotas_pendientes: int
+    pagos_anulados: int
+    monto_pagado: int
+    monto_vencido: int
+    monto_pendiente: int
+    monto_adeudado: int
+
+
+class EnrollmentStatement(BaseModel):
+    id: int
+    career_id: int
+    career_name: str
+    cuotas: List[StatementCuota]
+    resumen: StatementSummary
+
+
 # -------------------------------------------------------------------
 # CREAR INSCRIPCIÓN (Usuario x Carrera)
 # -------------------------------------------------------------------
 
 # 👇 OJO: ya no ponemos "/enrollments", el prefix lo agrega
-@router.post("")
-def create_enrollment(payload: EnrollmentCreate, db: Session = Depends(get_db)):
+@router.post("", dependencies=[Depends(require_admin)], response_model=ApiResponse[EnrollmentCreated])
+async def create_enrollment(payload: EnrollmentCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Crea una inscripción de un alumno (User) a una Carrera usando la tabla pivote UsuarioXcarrera.
     Path final: POST /enrollments
     """
     # 1) Buscar detalle del usuario
-    userdetail: Optional[UserDetail] = (
-        db.query(UserDetail)
-        .filter(UserDetail.id_user == payload.user_id)
-        .first()
+    userdetail: Optional[UserDetail] = await db.scalar(
+        select(UserDetail).where(UserDetail.id_user == payload.user_id)
     )
     if not userdetail:
         raise HTTPException(
@@ -82,18 +196,16 @@ def create_enrollment(payload: EnrollmentCreate, db: Session = Depends(get_db)):
         )
 
     # 2) Verificar que la carrera exista
-    career: Optional[Career] = db.query(Career).filter(Career.id == payload.career_id).first()
+    career: Optional[Career] = await db.get(Career, payload.career_id)
     if not career:
         raise HTTPException(status_code=404, detail="Carrera no encontrada")
 
     # 3) Evitar inscripción duplicada
-    existing = (
-        db.query(UsuarioXcarrera)
-        .filter(
+    existing = await db.scalar(
+        select(UsuarioXcarrera).where(
             UsuarioXcarrera.id_userdetail == userdetail.id,
             UsuarioXcarrera.id_carrera == payload.career_id,
         )
-        .first()
     )
     if existing:
         raise HTTPException(
@@ -108,8 +220,10 @@ def create_enrollment(payload: EnrollmentCreate, db: Session = Depends(get_db)):
     )
 
     db.add(nueva)
-    db.commit()
-    db.refresh(nueva)
+    await db.commit()
+    debtors_report.mark_dirty()
+    enrollments_created.inc()
+    await db.refresh(nueva)
 
     return {
         "success": True,
@@ -130,19 +244,20 @@ def create_enrollment(payload: EnrollmentCreate, db: Session = Depends(get_db)):
 # -------------------------------------------------------------------
 
 # Path final: POST /enrollments/by-user
-@router.post("/by-user")
-def get_enrollments_by_user(
+@router.post("/by-user", response_model=ApiResponse[Page[EnrollmentOut]])
+async def get_enrollments_by_user(
     payload: EnrollmentsByUserRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
 ):
     """
     Devuelve las inscripciones (UsuarioXcarrera) de un usuario con paginado.
     """
+    Security.check_owner_or_admin(current_user, payload.user_id)
+
     # Buscar detalle del usuario
-    userdetail: Optional[UserDetail] = (
-        db.query(UserDetail)
-        .filter(UserDetail.id_user == payload.user_id)
-        .first()
+    userdetail: Optional[UserDetail] = await db.scalar(
+        select(UserDetail).where(UserDetail.id_user == payload.user_id)
     )
 
     # Si el usuario no tiene detalle, devolvemos lista vacía
@@ -152,11 +267,7 @@ def get_enrollments_by_user(
             "message": "El usuario no tiene detalle ni inscripciones",
             "data": {
                 "items": [],
-                "page": payload.page,
-                "page_size": payload.page_size,
-                "total_items": 0,
-                "total_pages": 1,
-                "has_next": False,
+                **page_meta(payload.page, payload.page_size, 0),
             },
         }
 
@@ -165,21 +276,13 @@ def get_enrollments_by_user(
 
     # Join con Career para tener nombre y datos de la carrera
     query = (
-        db.query(UsuarioXcarrera, Career)
+        select(UsuarioXcarrera, Career)
         .join(Career, UsuarioXcarrera.id_carrera == Career.id)
-        .filter(UsuarioXcarrera.id_userdetail == userdetail.id)
+        .where(UsuarioXcarrera.id_userdetail == userdetail.id)
         .order_by(UsuarioXcarrera.id)
     )
 
-    total_items = query.count()
-    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
-
-    rows: List[tuple[UsuarioXcarrera, Career]] = (
-        query
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    rows, meta = await paginate(db, query, page, page_size)
 
     items = [
         {
@@ -196,11 +299,86 @@ def get_enrollments_by_user(
         "message": "Inscripciones obtenidas correctamente",
         "data": {
             "items": items,
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_items,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
+            **meta,
+        },
+    }
+
+
+# -------------------------------------------------------------------
+# ESTADO DE CUENTA DE UNA INSCRIPCIÓN
+# -------------------------------------------------------------------
+
+# Path final: GET /enrollments/{enrollment_id}/statement
+@router.get("/{enrollment_id}/statement", response_model=ApiResponse[EnrollmentStatement])
+async def get_enrollment_statement(
+    enrollment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Devuelve todas las cuotas de la inscripción (según duracion_meses de la carrera)
+    con su estado (pagada / vencida / pendiente), monto y pagos anulados,
+    más los totales. Todo sale de una sola consulta (STATEMENT_SQL).
+    """
+    # Un alumno sólo ve el estado de cuenta de sus inscripciones
+    if current_user.get("rol") != "admin":
+        owner_id = await db.scalar(
+            select(UserDetail.id_user)
+            .join(UsuarioXcarrera, UsuarioXcarrera.id_userdetail == UserDetail.id)
+            .where(UsuarioXcarrera.id == enrollment_id)
+        )
+        if owner_id is None:
+            raise HTTPException(status_code=404, detail="Inscripción no encontrada")
+        Security.check_owner_or_admin(current_user, owner_id)
+
+    rows = (
+        await db.execute(
+            STATEMENT_SQL,
+            {"id_inscripcion": enrollment_id, "ahora": datetime.utcnow()},
+        )
+    ).mappings().all()
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="Inscripción no encontrada")
+
+    cuotas = [
+        {
+            "numero_cuota": r["numero_cuota"],
+            "vencimiento": r["vencimiento"],
+            "estado": r["estado"],
+            "monto": r["monto"],
+            "fecha_pago": r["fecha_pago"],
+            "adelantado": r["adelantado"],
+            "pagos_anulados": r["pagos_anulados"],
+        }
+        for r in rows
+    ]
+
+    def total(estado: str) -> int:
+        return sum(c["monto"] for c in cuotas if c["estado"] == estado)
+
+    def count(estado: str) -> int:
+        return sum(1 for c in cuotas if c["estado"] == estado)
+
+    return {
+        "success": True,
+        "message": "Estado de cuenta obtenido correctamente",
+        "data": {
+            "id": enrollment_id,
+            "career_id": rows[0]["id_carrera"],
+            "career_name": rows[0]["career_name"],
+            "cuotas": cuotas,
+            "resumen": {
+                "cuotas_total": len(cuotas),
+                "cuotas_pagadas": count("pagada"),
+                "cuotas_vencidas": count("vencida"),
+                "cuotas_pendientes": count("pendiente"),
+                "pagos_anulados": sum(c["pagos_anulados"] for c in cuotas),
+                "monto_pagado": total("pagada"),
+                "monto_vencido": total("vencida"),
+                "monto_pendiente": total("pendiente"),
+                "monto_adeudado": total("vencida") + total("pendiente"),
+            },
         },
     }
 
@@ -210,33 +388,30 @@ def get_enrollments_by_user(
 # -------------------------------------------------------------------
 
 # Path final: DELETE /enrollments/{enrollment_id}
-@router.delete("/{enrollment_id}")
-def delete_enrollment(enrollment_id: int, db: Session = Depends(get_db)):
+@router.delete("/{enrollment_id}", dependencies=[Depends(require_admin)], response_model=ApiResponse[None])
+async def delete_enrollment(enrollment_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Elimina una inscripción UsuarioXcarrera.
     Opcionalmente podrías bloquear si ya tiene pagos asociados.
     """
-    uxc: Optional[UsuarioXcarrera] = (
-        db.query(UsuarioXcarrera)
-        .filter(UsuarioXcarrera.id == enrollment_id)
-        .first()
+    # 'pagos' se carga acá: el delete no puede hacer lazy load en async
+    uxc: Optional[UsuarioXcarrera] = await db.get(
+        UsuarioXcarrera,
+        enrollment_id,
+        options=[selectinload(UsuarioXcarrera.pagos)],
     )
     if not uxc:
         raise HTTPException(status_code=404, detail="Inscripción no encontrada")
 
-    pagos_existentes = (
-        db.query(Payment)
-        .filter(Payment.id_usuarioxcarrera == uxc.id)
-        .first()
-    )
-    if pagos_existentes:
+    if uxc.pagos:
         raise HTTPException(
             status_code=400,
             detail="No se puede eliminar la inscripción porque tiene pagos asociados",
         )
 
-    db.delete(uxc)
-    db.commit()
+    await db.delete(uxc)
+    await db.commit()
+    debtors_report.mark_dirty()
 
     return {
         "success": True,
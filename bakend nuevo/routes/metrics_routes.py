@@ -0,0 +1,74 @@
+# routes/metrics_routes.py
+
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+from auth.security import require_admin, require_metrics_access
+from config.db import get_pool_status
+from utils.metrics import register_pool_metrics, registry
+from utils.responses import ApiResponse
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
+register_pool_metrics(get_pool_status)
+
+
+# -------------------------------------------------------------------
+# MÉTRICAS PARA PROMETHEUS
+# -------------------------------------------------------------------
+
+@router.get("", dependencies=[Depends(require_metrics_access)], response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Latencia por ruta, requests en curso, errores, pool de conexiones y
+    contadores de negocio en formato de texto de Prometheus.
+    Async a propósito: se lee en el event loop, el mismo thread que escribe
+    las métricas (ver utils/metrics.py).
+
+    Scrape: 'Authorization: Bearer <METRICS_TOKEN>' (o un admin logueado).
+
+    Path final: GET /metrics
+    """
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+# -------------------------------------------------------------------
+# ESTADO DEL POOL DE CONEXIONES
+# -------------------------------------------------------------------
+
+class PoolStatus(BaseModel):
+    pool_size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    # Sólo en pools con medición de esperas (config/pool.py)
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    wait_seconds_total: Optional[float] = None
+    wait_seconds_max: Optional[float] = None
+    wait_seconds_avg: Optional[float] = None
+
+
+@router.get("/db", dependencies=[Depends(require_admin)], response_model=ApiResponse[Dict[str, PoolStatus]])
+def get_db_metrics():
+    """
+    Conexiones en uso, overflow y tiempos de espera del pool.
+    Sirve para dimensionar workers contra max_connections de Postgres.
+
+    Path final: GET /metrics/db
+    """
+    return {
+        "success": True,
+        "message": "Métricas del pool de conexiones",
+        "data": get_pool_status(),
+    }
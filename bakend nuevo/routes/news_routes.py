@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from typing import Optional
-
-from config.db import get_db
-from models.news import News
-
-router = APIRouter()
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, Field
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Annotated, Optional, Union
+
+from config.db import get_async_db
+from auth.security import get_current_user, require_admin
+from models.news import EXCERPT_LENGTH, News, make_excerpt
+from utils.pagination import paginate
+from utils.response_cache import response_cache
+from utils.images import image_srcset
+from utils.responses import ApiResponse, Page
+
+router = APIRouter(dependencies=[Depends(get_current_user)])
 
 # -------------------------
 # SCHEMAS
@@ -26,14 +33,47 @@ class NewsUpdate(BaseModel):
 class NewsPaginatedRequest(BaseModel):
     page: int = 1
     page_size: int = 10
+    # True: sin 'content', con 'excerpt' (el cuerpo completo sale de GET /news/{id})
+    list_mode: bool = False
+
+
+# -------------------------
+# SCHEMAS DE RESPUESTA
+# -------------------------
+
+class NewsOut(BaseModel):
+    id: int
+    title: str
+    content: str
+    image_url: Optional[str] = None
+    image_srcset: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class NewsListItem(BaseModel):
+    """Ítem de /news/paginated con list_mode = True."""
+    id: int
+    title: str
+    excerpt: Optional[str] = None
+    image_url: Optional[str] = None
+    image_srcset: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+# Un ítem de list_mode no trae 'content': no valida como NewsOut
+NewsPageEntry = Annotated[Union[NewsOut, NewsListItem], Field(union_mode="left_to_right")]
+
+class NewsPage(Page[NewsPageEntry]):
+    pass
+
+NewsResponse = ApiResponse[NewsOut]
+NewsPageResponse = ApiResponse[NewsPage]
 
 
 # -------------------------
 # CREAR NOTICIA
 # -------------------------
 
-@router.post("/news")
-def create_news(payload: NewsCreate, db: Session = Depends(get_db)):
+@router.post("/news", dependencies=[Depends(require_admin)], response_model=NewsResponse)
+async def create_news(payload: NewsCreate, db: AsyncSession = Depends(get_async_db)):
 
     new = News(
         title=payload.title,
@@ -43,8 +83,9 @@ def create_news(payload: NewsCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new)
-    db.commit()
-    db.refresh(new)
+    await db.commit()
+    await db.refresh(new)
+    await response_cache.invalidate("news")
 
     return {
         "success": True,
@@ -54,6 +95,7 @@ def create_news(payload: NewsCreate, db: Session = Depends(get_db)):
             "title": new.title,
             "content": new.content,
             "image_url": new.image_url,
+            "image_srcset": image_srcset(new.image_url),
             "created_at": new.created_at
         }
     }
@@ -63,42 +105,48 @@ def create_news(payload: NewsCreate, db: Session = Depends(get_db)):
 # OBTENER UNA NOTICIA POR ID
 # -------------------------
 
-@router.get("/news/{news_id}")
-def get_news(news_id: int, db: Session = Depends(get_db)):
-
-    n = db.query(News).filter(News.id == news_id).first()
-    if not n:
-        raise HTTPException(status_code=404, detail="Noticia no encontrada")
+@router.get("/news/{news_id}", response_model=NewsResponse)
+async def get_news(news_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+
+    async def build():
+        n = await db.get(News, news_id)
+        if not n:
+            raise HTTPException(status_code=404, detail="Noticia no encontrada")
+
+        return {
+            "success": True,
+            "data": {
+                "id": n.id,
+                "title": n.title,
+                "content": n.content,
+                "image_url": n.image_url,
+                "image_srcset": image_srcset(n.image_url),
+                "created_at": n.created_at,
+            },
+        }
 
-    return {
-        "success": True,
-        "data": {
-            "id": n.id,
-            "title": n.title,
-            "content": n.content,
-            "image_url": n.image_url,
-            "created_at": n.created_at,
-        },
-    }
+    return await response_cache.respond(request, "news", build, model=NewsResponse)
 
 
 # -------------------------
 # EDITAR NOTICIA
 # -------------------------
 
-@router.put("/news/{news_id}")
-def update_news(news_id: int, payload: NewsUpdate, db: Session = Depends(get_db)):
+@router.put("/news/{news_id}", dependencies=[Depends(require_admin)], response_model=NewsResponse)
+async def update_news(news_id: int, payload: NewsUpdate, db: AsyncSession = Depends(get_async_db)):
 
-    n = db.query(News).filter(News.id == news_id).first()
+    n = await db.get(News, news_id)
     if not n:
         raise HTTPException(status_code=404, detail="Noticia no encontrada")
 
     n.title = payload.title
     n.content = payload.content
+    n.excerpt = make_excerpt(payload.content)
     n.image_url = payload.image_url
 
-    db.commit()
-    db.refresh(n)
+    await db.commit()
+    await db.refresh(n)
+    await response_cache.invalidate("news")
 
     return {
         "success": True,
@@ -108,6 +156,7 @@ def update_news(news_id: int, payload: NewsUpdate, db: Session = Depends(get_db)
             "title": n.title,
             "content": n.content,
             "image_url": n.image_url,
+            "image_srcset": image_srcset(n.image_url),
             "created_at": n.created_at,
         },
     }
@@ -117,15 +166,16 @@ def update_news(news_id: int, payload: NewsUpdate, db: Session = Depends(get_db)
 # ELIMINAR NOTICIA
 # -------------------------
 
-@router.delete("/news/{news_id}")
-def delete_news(news_id: int, db: Session = Depends(get_db)):
+@router.delete("/news/{news_id}", dependencies=[Depends(require_admin)], response_model=ApiResponse[None])
+async def delete_news(news_id: int, db: AsyncSession = Depends(get_async_db)):
 
-    n = db.query(News).filter(News.id == news_id).first()
+    n = await db.get(News, news_id)
     if not n:
         raise HTTPException(status_code=404, detail="Noticia no encontrada")
 
-    db.delete(n)
-    db.commit()
+    await db.delete(n)
+    await db.commit()
+    await response_cache.invalidate("news")
 
     return {
         "success": True,
@@ -137,44 +187,72 @@ def delete_news(news_id: int, db: Session = Depends(get_db)):
 # NOTICIAS PAGINADAS
 # -------------------------
 
-@router.post("/news/paginated")
-def get_news_paginated(payload: NewsPaginatedRequest, db: Session = Depends(get_db)):
+@router.post("/news/paginated", response_model=NewsPageResponse)
+async def get_news_paginated(
+    payload: NewsPaginatedRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
 
     page = max(payload.page, 1)
     page_size = max(payload.page_size, 1)
 
-    query = db.query(News).order_by(News.created_at.desc())
-
-    total_items = query.count()
-    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
-
-    noticias = (
-        query
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
-
-    items = [
-        {
-            "id": n.id,
-            "title": n.title,
-            "content": n.content,
-            "image_url": n.image_url,
-            "created_at": n.created_at
+    async def build():
+        if payload.list_mode:
+            # Sólo columnas livianas: 'content' no se lee de la tabla
+            # (filas viejas sin excerpt: se recorta en SQL)
+            query = select(
+                News.id,
+                News.title,
+                func.coalesce(News.excerpt, func.left(News.content, EXCERPT_LENGTH)).label("excerpt"),
+                News.image_url,
+                News.created_at,
+            )
+        else:
+            query = select(News)
+        query = query.order_by(News.created_at.desc(), News.id.desc())
+
+        noticias, meta = await paginate(db, query, page, page_size)
+
+        if payload.list_mode:
+            items = [
+                {
+                    "id": n_id,
+                    "title": title,
+                    "excerpt": excerpt,
+                    "image_url": image_url,
+                    "image_srcset": image_srcset(image_url),
+                    "created_at": created_at,
+                }
+                for n_id, title, excerpt, image_url, created_at in noticias
+            ]
+        else:
+            items = [
+                {
+                    "id": n.id,
+                    "title": n.title,
+                    "content": n.content,
+                    "image_url": n.image_url,
+                    "image_srcset": image_srcset(n.image_url),
+                    "created_at": n.created_at
+                }
+                for n in noticias
+            ]
+
+        return {
+            "success": True,
+            "message": "Noticias obtenidas",
+            "data": {
+                "items": items,
+                **meta,
+            },
         }
-        for n in noticias
-    ]
 
-    return {
-        "success": True,
-        "message": "Noticias obtenidas",
-        "data": {
-            "items": items,
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_items,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-        },
-    }
+    # Cacheado por página (se invalida al crear/editar/borrar noticias)
+    return await response_cache.respond(
+        request,
+        "news",
+        build,
+        payload={"page": page, "page_size": page_size, "list_mode": payload.list_mode},
+        model=NewsPageResponse,
+    )
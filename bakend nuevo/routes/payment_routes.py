@@ -1,56 +1,80 @@
 # routes/payment_routes.py
 
-from typing import Optional
-from datetime import datetime
+import base64
+import json
+from typing import Annotated, Literal, Optional, List, Union
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, validator
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Discriminator, Field, Tag, validator
+from sqlalchemy import Select, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from config.db import get_db
+from config.db import AsyncSessionLocal, get_async_db
+from auth.security import Security, get_current_user, require_admin
 from models.payment import Payment as PaymentModel
 from models.usuarioxcarrera import UsuarioXcarrera
 from models.career import Career
-from models.career_price import CareerPriceHistory
 from models.user import User, UserDetail
+from utils.search import normalize_search, build_search_filter
+from utils.price_cache import price_cache
+from utils.pagination import count_rows, paginate
+from utils.debtor_report import debtors_report
+from utils.export import iter_csv, iter_xlsx
+from utils.metrics import payments_cancelled, payments_created
+from utils.responses import ApiResponse, Page
 
 router = APIRouter(
     prefix="/payments",
     tags=["payments"],
 )
 
+# Máximo de pagos aceptados en POST /payments/bulk
+MAX_BULK_PAYMENTS = 1000
+
 
 # -------------------------------------------------------------------
 # HELPER: Obtener precio vigente según fecha de pago
 # -------------------------------------------------------------------
 
-def get_price_for_date(db: Session, id_carrera: int, fecha_pago: datetime) -> int:
+async def get_price_for_date(db: AsyncSession, id_carrera: int, fecha_pago: datetime) -> int:
     """
     Devuelve el precio de la carrera que estaba vigente en 'fecha_pago',
     usando CareerPriceHistory. Si no encuentra historial, usa costo_mensual actual.
+
+    El historial se lee de price_cache (se invalida al escribir precios/carreras).
     """
+    timeline = await price_cache.get_timeline_async(db, id_carrera)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="Carrera no encontrada al calcular precio")
 
-    # 1) Último precio cuya fecha_desde sea <= fecha_pago
-    precio_hist = (
-        db.query(CareerPriceHistory)
-        .filter(
-            CareerPriceHistory.id_carrera == id_carrera,
-            CareerPriceHistory.fecha_desde <= fecha_pago,
-        )
-        .order_by(CareerPriceHistory.fecha_desde.desc())
-        .first()
-    )
+    return timeline.price_at(fecha_pago)
 
-    if precio_hist:
-        return precio_hist.monto
 
-    # 2) Si no hay historial, usar costo_mensual actual de la carrera
-    career: Optional[Career] = db.query(Career).filter(Career.id == id_carrera).first()
-    if not career:
-        raise HTTPException(status_code=404, detail="Carrera no encontrada al calcular precio")
+# -------------------------------------------------------------------
+# HELPERS: Cursor opaco para paginado keyset (fecha_pago, id)
+# -------------------------------------------------------------------
+
+def encode_payment_cursor(fecha_pago: datetime, payment_id: int) -> str:
+    """
+    Codifica la posición (fecha_pago, id) del último pago de la página
+    en un string opaco apto para URL.
+    """
+    raw = json.dumps({"f": fecha_pago.isoformat(), "id": payment_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
 
-    return career.costo_mensual
+def decode_payment_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decodifica un cursor generado por encode_payment_cursor.
+    Lanza 400 si el cursor no es válido.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return datetime.fromisoformat(data["f"]), int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginado inválido")
 
 
 # -------------------------------------------------------------------
@@ -69,6 +93,13 @@ class PaymentCreate(BaseModel):
             raise ValueError("Los IDs y número de cuota deben ser mayores a 0")
         return v
 
+    @validator("fecha_pago")
+    def fecha_pago_naive_utc(cls, v: Optional[datetime]) -> Optional[datetime]:
+        # Las columnas son timestamp sin zona (UTC)
+        if v is not None and v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
 
 class PaymentsByEnrollmentRequest(BaseModel):
     id_usuarioxcarrera: int
@@ -89,6 +120,18 @@ class PaymentsByEnrollmentRequest(BaseModel):
         return v
 
 
+class PaymentBulkCreate(BaseModel):
+    items: List[PaymentCreate]
+
+    @validator("items")
+    def items_size(cls, v: List[PaymentCreate]) -> List[PaymentCreate]:
+        if not v:
+            raise ValueError("Debe enviar al menos un pago")
+        if len(v) > MAX_BULK_PAYMENTS:
+            raise ValueError(f"No se pueden registrar más de {MAX_BULK_PAYMENTS} pagos por lote")
+        return v
+
+
 class PaymentCancelRequest(BaseModel):
     motivo: Optional[str] = None  # por si después querés guardar motivo en la BD
 
@@ -98,6 +141,18 @@ class PaymentsPaginatedRequest(BaseModel):
     page_size: int = 20
     search: Optional[str] = None  # username, nombre, dni, carrera
 
+    # Modo cursor (keyset): se ignora 'page' y se continúa desde 'cursor'
+    cursor_mode: bool = False
+    cursor: Optional[str] = None  # valor opaco devuelto como next_cursor
+    include_total: bool = False   # en modo cursor el COUNT es opcional
+
+    # Modo offset: total aproximado (pg_class) en lugar de contar; sólo sin 'search'
+    estimate_total: bool = False
+
+    # True: sin los campos planos de compatibilidad (alumno y carrera
+    # sólo como objetos anidados); la página pesa bastante menos
+    compact: bool = False
+
     @validator("page", "page_size")
     def page_min(cls, v: int) -> int:
         if v <= 0:
@@ -105,39 +160,151 @@ class PaymentsPaginatedRequest(BaseModel):
         return v
 
 
+# -------------------------------------------------------------------
+# SCHEMAS DE RESPUESTA
+# -------------------------------------------------------------------
+
+class PaymentItem(BaseModel):
+    id: int
+    numero_cuota: int
+    fecha_pago: Optional[datetime] = None
+    monto: int
+    adelantado: Optional[bool] = None
+    anulado: Optional[bool] = None
+
+
+class PaymentOut(PaymentItem):
+    id_usuarioxcarrera: int
+
+
+class PaymentBulkItemResult(BaseModel):
+    index: int
+    success: bool
+    message: str
+    data: Optional[PaymentOut] = None
+
+
+class PaymentBulkResult(BaseModel):
+    created: int
+    failed: int
+    items: List[PaymentBulkItemResult]
+
+
+class EnrollmentPaymentsPage(Page[PaymentItem]):
+    id_usuarioxcarrera: int
+
+
+class PaymentStudent(BaseModel):
+    id: int
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    dni: Optional[str] = None
+    email: Optional[str] = None
+
+
+class PaymentCareer(BaseModel):
+    id: int
+    name: str
+
+
+class PaymentListItem(PaymentItem):
+    """Ítem de /payments/paginated con 'compact' = True."""
+    alumno: PaymentStudent
+    career: PaymentCareer
+    id_usuarioxcarrera: int
+
+
+class PaymentListItemFlat(PaymentListItem):
+    """Ítem completo: repite alumno y carrera en campos planos (compatibilidad)."""
+    user_id: int
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    dni: Optional[str] = None
+    email: Optional[str] = None
+    career_id: int
+    career_name: str
+
+
+def _payment_list_kind(item) -> str:
+    # Elige el modelo sin probar los dos (validación: dict; serialización: modelo)
+    if isinstance(item, dict):
+        return "flat" if "user_id" in item else "compact"
+    return "flat" if isinstance(item, PaymentListItemFlat) else "compact"
+
+
+PaymentListEntry = Annotated[
+    Union[
+        Annotated[PaymentListItemFlat, Tag("flat")],
+        Annotated[PaymentListItem, Tag("compact")],
+    ],
+    Discriminator(_payment_list_kind),
+]
+
+
+class PaymentsPage(Page[PaymentListEntry]):
+    pass
+
+
+class PaymentsCursorPage(BaseModel):
+    items: List[PaymentListEntry]
+    page_size: int
+    # Sin default a propósito: una página por offset no valida como cursor
+    total_items: Optional[int]
+    next_cursor: Optional[str]
+    has_next: bool
+
+
+class PaymentsPaginatedResponse(ApiResponse[
+    Annotated[Union[PaymentsPage, PaymentsCursorPage], Field(union_mode="left_to_right")]
+]):
+    """Página por offset (PaymentsPage) o por cursor (PaymentsCursorPage)."""
+
+
 # -------------------------------------------------------------------
 # CREAR PAGO
 # -------------------------------------------------------------------
 
-@router.post("")
-def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
+@router.post("", dependencies=[Depends(require_admin)], response_model=ApiResponse[PaymentOut])
+async def create_payment(payload: PaymentCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Crea un pago para una inscripción (UsuarioXcarrera).
     - Calcula el monto según el historial de precios de la carrera
       usando la fecha de pago (default ahora).
     - Evita duplicar la misma cuota si ya está pagada (no anulada).
+    - Rechaza cuotas fuera de 1..duracion_meses de la carrera (el estado
+      de cuenta sólo muestra esas).
 
     Path final: POST /payments
     """
 
-    # 1) Verificar que la inscripción exista
+    # 1) Verificar que la inscripción exista (y traer la duración de la carrera)
     uxc = (
-        db.query(UsuarioXcarrera)
-        .filter(UsuarioXcarrera.id == payload.id_usuarioxcarrera)
-        .first()
-    )
+        await db.execute(
+            select(UsuarioXcarrera.id_carrera, Career.duracion_meses)
+            .join(Career, UsuarioXcarrera.id_carrera == Career.id)
+            .where(UsuarioXcarrera.id == payload.id_usuarioxcarrera)
+        )
+    ).first()
     if not uxc:
         raise HTTPException(status_code=404, detail="Inscripción (usuarioxcarrera) no encontrada")
 
+    if payload.numero_cuota > uxc.duracion_meses:
+        raise HTTPException(
+            status_code=400,
+            detail=f"La cuota {payload.numero_cuota} excede la duración de la carrera ({uxc.duracion_meses} meses)",
+        )
+
     # 2) Evitar duplicar cuota (no anulada)
-    existing = (
-        db.query(PaymentModel)
-        .filter(
+    existing = await db.scalar(
+        select(PaymentModel.id)
+        .where(
             PaymentModel.id_usuarioxcarrera == payload.id_usuarioxcarrera,
             PaymentModel.numero_cuota == payload.numero_cuota,
             PaymentModel.anulado == False,  # noqa: E712
         )
-        .first()
+        .limit(1)
     )
     if existing:
         raise HTTPException(
@@ -149,7 +316,7 @@ def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
     fecha_pago = payload.fecha_pago or datetime.utcnow()
 
     # 4) Calcular monto según precio vigente en esa fecha
-    monto = get_price_for_date(db, uxc.id_carrera, fecha_pago)
+    monto = await get_price_for_date(db, uxc.id_carrera, fecha_pago)
 
     # 5) Crear Payment
     nuevo_pago = PaymentModel(
@@ -161,8 +328,10 @@ def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
     nuevo_pago.fecha_pago = fecha_pago
 
     db.add(nuevo_pago)
-    db.commit()
-    db.refresh(nuevo_pago)
+    await db.commit()
+    debtors_report.mark_dirty()
+    payments_created.inc()
+    await db.refresh(nuevo_pago)
 
     return {
         "success": True,
@@ -179,14 +348,173 @@ def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
     }
 
 
+# -------------------------------------------------------------------
+# CREAR PAGOS EN LOTE
+# -------------------------------------------------------------------
+
+@router.post("/bulk", dependencies=[Depends(require_admin)], response_model=ApiResponse[PaymentBulkResult])
+async def create_payments_bulk(payload: PaymentBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Registra muchos pagos en una sola transacción (carga de cuotas a inicio de mes).
+    - Valida inscripciones y cuotas ya pagadas con una consulta cada una
+      (y que la cuota esté dentro de 1..duracion_meses de la carrera).
+    - Resuelve el precio una vez por carrera (price_cache).
+    - Inserta todos los pagos válidos en un único INSERT multi-fila.
+    Devuelve el resultado de cada ítem en el mismo orden recibido.
+
+    Path final: POST /payments/bulk
+    """
+    items = payload.items
+    ahora = datetime.utcnow()
+
+    # 1) Inscripciones existentes → (id_carrera, duracion_meses)
+    enrollment_ids = {item.id_usuarioxcarrera for item in items}
+    carrera_por_inscripcion = {
+        row.id: (row.id_carrera, row.duracion_meses)
+        for row in (
+            await db.execute(
+                select(UsuarioXcarrera.id, UsuarioXcarrera.id_carrera, Career.duracion_meses)
+                .join(Career, UsuarioXcarrera.id_carrera == Career.id)
+                .where(UsuarioXcarrera.id.in_(enrollment_ids))
+            )
+        ).all()
+    }
+
+    # 2) Cuotas ya pagadas (no anuladas) entre las pedidas
+    pares = {(item.id_usuarioxcarrera, item.numero_cuota) for item in items}
+    ya_pagadas = set(
+        (
+            await db.execute(
+                select(PaymentModel.id_usuarioxcarrera, PaymentModel.numero_cuota)
+                .where(
+                    tuple_(PaymentModel.id_usuarioxcarrera, PaymentModel.numero_cuota).in_(pares),
+                    PaymentModel.anulado == False,  # noqa: E712
+                )
+            )
+        ).all()
+    )
+
+    results: List[dict] = [None] * len(items)
+    rows_to_insert: List[dict] = []
+    index_por_par: dict = {}
+
+    for i, item in enumerate(items):
+        par = (item.id_usuarioxcarrera, item.numero_cuota)
+
+        carrera = carrera_por_inscripcion.get(item.id_usuarioxcarrera)
+        if carrera is None:
+            results[i] = {
+                "index": i,
+                "success": False,
+                "message": "Inscripción (usuarioxcarrera) no encontrada",
+                "data": None,
+            }
+            continue
+
+        id_carrera, duracion_meses = carrera
+        if item.numero_cuota > duracion_meses:
+            results[i] = {
+                "index": i,
+                "success": False,
+                "message": f"La cuota {item.numero_cuota} excede la duración de la carrera ({duracion_meses} meses)",
+                "data": None,
+            }
+            continue
+
+        if par in ya_pagadas or par in index_por_par:
+            results[i] = {
+                "index": i,
+                "success": False,
+                "message": f"La cuota {item.numero_cuota} ya fue pagada para esta inscripción",
+                "data": None,
+            }
+            continue
+
+        # 3) Precio vigente (timeline cacheado por carrera)
+        fecha_pago = item.fecha_pago or ahora
+        timeline = await price_cache.get_timeline_async(db, id_carrera)
+        if timeline is None:
+            results[i] = {
+                "index": i,
+                "success": False,
+                "message": "Carrera no encontrada al calcular precio",
+                "data": None,
+            }
+            continue
+
+        index_por_par[par] = i
+        rows_to_insert.append(
+            {
+                "id_usuarioxcarrera": item.id_usuarioxcarrera,
+                "numero_cuota": item.numero_cuota,
+                "fecha_pago": fecha_pago,
+                "monto": timeline.price_at(fecha_pago),
+                "adelantado": item.adelantado,
+                "anulado": False,
+            }
+        )
+
+    # 4) Un solo INSERT multi-fila dentro de la misma transacción
+    if rows_to_insert:
+        inserted = (
+            await db.execute(
+                insert(PaymentModel)
+                .values(rows_to_insert)
+                .returning(
+                    PaymentModel.id,
+                    PaymentModel.id_usuarioxcarrera,
+                    PaymentModel.numero_cuota,
+                    PaymentModel.fecha_pago,
+                    PaymentModel.monto,
+                    PaymentModel.adelantado,
+                    PaymentModel.anulado,
+                )
+            )
+        ).all()
+        await db.commit()
+        debtors_report.mark_dirty()
+        payments_created.inc(amount=len(inserted))
+
+        for row in inserted:
+            i = index_por_par[(row.id_usuarioxcarrera, row.numero_cuota)]
+            results[i] = {
+                "index": i,
+                "success": True,
+                "message": "Pago registrado correctamente",
+                "data": {
+                    "id": row.id,
+                    "id_usuarioxcarrera": row.id_usuarioxcarrera,
+                    "numero_cuota": row.numero_cuota,
+                    "fecha_pago": row.fecha_pago,
+                    "monto": row.monto,
+                    "adelantado": row.adelantado,
+                    "anulado": row.anulado,
+                },
+            }
+
+    created = len(rows_to_insert)
+    failed = len(items) - created
+
+    return {
+        "success": failed == 0,
+        "message": f"{created} pagos registrados, {failed} con error",
+        "data": {
+            "created": created,
+            "failed": failed,
+            "items": results,
+        },
+    }
+
+
 # -------------------------------------------------------------------
 # LISTAR PAGOS POR INSCRIPCIÓN (POST + paginado)
 # -------------------------------------------------------------------
 
-@router.post("/by-enrollment")
-def get_payments_by_enrollment(
+@router.post("/by-enrollment", response_model=ApiResponse[EnrollmentPaymentsPage])
+async def get_payments_by_enrollment(
     payload: PaymentsByEnrollmentRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
 ):
     """
     Devuelve los pagos de una inscripción (UsuarioXcarrera) con paginado.
@@ -195,37 +523,30 @@ def get_payments_by_enrollment(
     """
 
     # Verificar que la inscripción exista
-    uxc = (
-        db.query(UsuarioXcarrera)
-        .filter(UsuarioXcarrera.id == payload.id_usuarioxcarrera)
-        .first()
-    )
+    uxc = await db.get(UsuarioXcarrera, payload.id_usuarioxcarrera)
     if not uxc:
         raise HTTPException(status_code=404, detail="Inscripción no encontrada")
 
+    # Un alumno sólo ve los pagos de sus inscripciones
+    if current_user.get("rol") != "admin":
+        owner_id = await db.scalar(select(UserDetail.id_user).where(UserDetail.id == uxc.id_userdetail))
+        Security.check_owner_or_admin(current_user, owner_id)
+
     page = payload.page
     page_size = payload.page_size
 
-    query = db.query(PaymentModel).filter(
+    query = select(PaymentModel).where(
         PaymentModel.id_usuarioxcarrera == payload.id_usuarioxcarrera
     )
 
     # si include_anulados = False, filtramos solo los NO anulados
     if not payload.include_anulados:
-        query = query.filter(PaymentModel.anulado == False)  # noqa: E712
+        query = query.where(PaymentModel.anulado == False)  # noqa: E712
 
     # Últimos pagos primero (cuotas más altas primero)
     query = query.order_by(PaymentModel.numero_cuota.desc())
 
-    total_items = query.count()
-    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
-
-    pagos_db = (
-        query
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    pagos_db, meta = await paginate(db, query, page, page_size)
 
     items = [
         {
@@ -245,11 +566,7 @@ def get_payments_by_enrollment(
         "data": {
             "id_usuarioxcarrera": payload.id_usuarioxcarrera,
             "items": items,
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_items,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
+            **meta,
         },
     }
 
@@ -258,18 +575,18 @@ def get_payments_by_enrollment(
 # ANULAR PAGO
 # -------------------------------------------------------------------
 
-@router.put("/{payment_id}/cancel")
-def cancel_payment(
+@router.put("/{payment_id}/cancel", dependencies=[Depends(require_admin)], response_model=ApiResponse[PaymentOut])
+async def cancel_payment(
     payment_id: int,
     payload: PaymentCancelRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Marca un pago como anulado.
 
     Path final: PUT /payments/{payment_id}/cancel
     """
-    p = db.query(PaymentModel).filter(PaymentModel.id == payment_id).first()
+    p = await db.get(PaymentModel, payment_id)
     if not p:
         raise HTTPException(status_code=404, detail="Pago no encontrado")
 
@@ -277,8 +594,10 @@ def cancel_payment(
         raise HTTPException(status_code=400, detail="El pago ya está anulado")
 
     p.anulado = True
-    db.commit()
-    db.refresh(p)
+    await db.commit()
+    debtors_report.mark_dirty()
+    payments_cancelled.inc()
+    await db.refresh(p)
 
     return {
         "success": True,
@@ -299,28 +618,59 @@ def cancel_payment(
 # LISTA GLOBAL DE PAGOS (para /admin/payments)
 # -------------------------------------------------------------------
 
-@router.post("/paginated")
-def get_payments_paginated(
-    payload: PaymentsPaginatedRequest,
-    db: Session = Depends(get_db),
-):
+def payment_list_item(p, uxc, user, ud, career, compact: bool = False) -> dict:
     """
-    Lista global de pagos con joins a alumno y carrera.
-
-    Path final: POST /payments/paginated
-
-    Permite 'search' por:
-    - username
-    - nombre / apellido
-    - dni
-    - nombre de carrera
+    Ítem de /payments/paginated a partir de una fila
+    (Payment, UsuarioXcarrera, User, UserDetail, Career).
     """
+    item = {
+        # --- datos del pago ---
+        "id": p.id,
+        "numero_cuota": p.numero_cuota,
+        "fecha_pago": p.fecha_pago,
+        "monto": p.monto,
+        "adelantado": p.adelantado,
+        "anulado": p.anulado,
+
+        # --- objetos anidados para el FRONT ---
+        "alumno": {
+            "id": user.id,
+            "username": user.username,
+            "first_name": ud.first_name,
+            "last_name": ud.last_name,
+            "dni": ud.dni,
+            "email": ud.email,
+        },
+        "career": {
+            "id": career.id,
+            "name": career.name,
+        },
+        "id_usuarioxcarrera": uxc.id,
+    }
+
+    if not compact:
+        # --- campos planos (compatibilidad) ---
+        item.update(
+            user_id=user.id,
+            username=user.username,
+            first_name=ud.first_name,
+            last_name=ud.last_name,
+            dni=ud.dni,
+            email=ud.email,
+            career_id=career.id,
+            career_name=career.name,
+        )
+    return item
 
-    page = payload.page
-    page_size = payload.page_size
 
+def payments_list_query(search: Optional[str]) -> Select:
+    """
+    Consulta de /payments/paginated: filas (Payment, UsuarioXcarrera, User,
+    UserDetail, Career), filtradas por 'search' (ya normalizado) y ordenadas
+    de la más reciente a la más vieja.
+    """
     query = (
-        db.query(
+        select(
             PaymentModel,
             UsuarioXcarrera,
             User,
@@ -333,83 +683,214 @@ def get_payments_paginated(
         .join(Career, UsuarioXcarrera.id_carrera == Career.id)
     )
 
-    if payload.search:
-        search = f"%{payload.search}%"
-        query = query.filter(
-            or_(
-                User.username.ilike(search),
-                UserDetail.first_name.ilike(search),
-                UserDetail.last_name.ilike(search),
-                UserDetail.dni.ilike(search),
-                Career.name.ilike(search),
+    # Búsqueda (índices trigram + prefijo de DNI/username); el orden sigue siendo por fecha
+    if search:
+        query = query.where(
+            build_search_filter(
+                search,
+                [User.username, UserDetail.first_name, UserDetail.last_name, Career.name],
+                dni_column=UserDetail.dni,
+                username_column=User.username,
             )
         )
 
     # Últimos pagos primero: por fecha de pago y luego id
-    query = query.order_by(PaymentModel.fecha_pago.desc(), PaymentModel.id.desc())
+    return query.order_by(PaymentModel.fecha_pago.desc(), PaymentModel.id.desc())
 
-    total_items = query.count()
-    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
 
-    rows = (
-        query
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+@router.post(
+    "/paginated",
+    dependencies=[Depends(require_admin)],
+    response_model=PaymentsPaginatedResponse,
+)
+async def get_payments_paginated(
+    payload: PaymentsPaginatedRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Lista global de pagos con joins a alumno y carrera.
 
-    items = []
-    for p, uxc, user, ud, career in rows:
-        alumno = {
-            "id": user.id,
-            "username": user.username,
-            "first_name": ud.first_name,
-            "last_name": ud.last_name,
-            "dni": ud.dni,
-            "email": ud.email,
-        }
+    Path final: POST /payments/paginated
 
-        career_obj = {
-            "id": career.id,
-            "name": career.name,
-        }
+    Permite 'search' por:
+    - username
+    - nombre / apellido
+    - dni
+    - nombre de carrera
 
-        items.append(
-            {
-                # --- datos del pago ---
-                "id": p.id,
-                "numero_cuota": p.numero_cuota,
-                "fecha_pago": p.fecha_pago,
-                "monto": p.monto,
-                "adelantado": p.adelantado,
-                "anulado": p.anulado,
-
-                # --- objetos anidados para el FRONT ---
-                "alumno": alumno,
-                "career": career_obj,
-
-                # --- campos planos (compatibilidad) ---
-                "id_usuarioxcarrera": uxc.id,
-                "user_id": user.id,
-                "username": user.username,
-                "first_name": ud.first_name,
-                "last_name": ud.last_name,
-                "dni": ud.dni,
-                "email": ud.email,
-                "career_id": career.id,
-                "career_name": career.name,
-            }
+    Con cursor_mode = True usa paginado keyset sobre (fecha_pago, id):
+    devuelve 'next_cursor' en lugar de 'total_pages' y sólo cuenta
+    el total si se pide include_total.
+
+    Con compact = True cada pago trae al alumno y la carrera sólo como
+    objetos anidados ('alumno', 'career'), sin los campos planos.
+    """
+
+    page = payload.page
+    page_size = payload.page_size
+
+    search = normalize_search(payload.search)
+    query = payments_list_query(search)
+
+    total_items: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+    if payload.cursor_mode:
+        # Keyset: continuar estrictamente después del último (fecha_pago, id) visto.
+        # Costo constante sin importar la profundidad (usa ix_pagos_fecha_pago_id).
+        if payload.include_total:
+            total_items = await count_rows(db, query)
+
+        if payload.cursor:
+            fecha_cursor, id_cursor = decode_payment_cursor(payload.cursor)
+            query = query.where(
+                tuple_(PaymentModel.fecha_pago, PaymentModel.id) < tuple_(fecha_cursor, id_cursor)
+            )
+
+        # Pedimos uno extra para saber si hay página siguiente sin contar
+        rows = (await db.execute(query.limit(page_size + 1))).all()
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if has_next:
+            last_payment = rows[-1][0]
+            next_cursor = encode_payment_cursor(last_payment.fecha_pago, last_payment.id)
+    else:
+        # Sin búsqueda el total puede salir estimado de las estadísticas de 'pagos'
+        estimate_from = "pagos" if payload.estimate_total and not search else None
+        # Total exacto con COUNT aparte: count(*) OVER () sobre el JOIN de 5
+        # tablas arma y ordena todos los pagos antes del LIMIT
+        rows, meta = await paginate(
+            db, query, page, page_size,
+            estimate_from=estimate_from,
+            separate_count=True,
         )
 
+    items = [payment_list_item(*row, compact=payload.compact) for row in rows]
+
+    if payload.cursor_mode:
+        return {
+            "success": True,
+            "message": "Pagos listados correctamente",
+            "data": {
+                "items": items,
+                "page_size": page_size,
+                "total_items": total_items,
+                "next_cursor": next_cursor,
+                "has_next": has_next,
+            },
+        }
+
     return {
         "success": True,
         "message": "Pagos listados correctamente",
         "data": {
             "items": items,
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_items,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
+            **meta,
         },
     }
+
+
+# -------------------------------------------------------------------
+# EXPORTACIÓN DEL LIBRO DE PAGOS (CSV / XLSX en streaming)
+# -------------------------------------------------------------------
+
+# Filas por lote leídas del cursor del servidor (y por chunk de respuesta)
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_COLUMNS = [
+    ("id", PaymentModel.id),
+    ("fecha_pago", PaymentModel.fecha_pago),
+    ("id_usuarioxcarrera", PaymentModel.id_usuarioxcarrera),
+    ("numero_cuota", PaymentModel.numero_cuota),
+    ("monto", PaymentModel.monto),
+    ("adelantado", PaymentModel.adelantado),
+    ("anulado", PaymentModel.anulado),
+    ("user_id", User.id),
+    ("username", User.username),
+    ("first_name", UserDetail.first_name),
+    ("last_name", UserDetail.last_name),
+    ("dni", UserDetail.dni),
+    ("email", UserDetail.email),
+    ("career_id", Career.id),
+    ("career_name", Career.name),
+]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _naive_utc(fecha: Optional[datetime]) -> Optional[datetime]:
+    if fecha is not None and fecha.tzinfo is not None:
+        return fecha.astimezone(timezone.utc).replace(tzinfo=None)
+    return fecha
+
+
+@router.get("/export", dependencies=[Depends(require_admin)])
+async def export_payments(
+    format: Literal["csv", "xlsx"] = "csv",
+    fecha_desde: Optional[datetime] = None,
+    fecha_hasta: Optional[datetime] = None,
+    career_id: Optional[int] = None,
+    include_anulados: bool = True,
+):
+    """
+    Exporta los pagos (con alumno y carrera) en CSV o XLSX.
+
+    Path final: GET /payments/export?format=csv|xlsx
+
+    Filtros:
+    - fecha_desde / fecha_hasta: rango de fecha_pago (desde inclusive, hasta exclusivo)
+    - career_id: sólo una carrera
+    - include_anulados: incluir pagos anulados (por defecto sí)
+
+    Las filas se leen con un cursor del lado del servidor en lotes de
+    EXPORT_BATCH_SIZE y se escriben a la respuesta a medida que llegan,
+    así la memoria no crece con la cantidad de pagos.
+    """
+    fecha_desde = _naive_utc(fecha_desde)
+    fecha_hasta = _naive_utc(fecha_hasta)
+    if fecha_desde and fecha_hasta and fecha_desde >= fecha_hasta:
+        raise HTTPException(status_code=400, detail="fecha_desde debe ser anterior a fecha_hasta")
+
+    query = (
+        select(*[col for _, col in EXPORT_COLUMNS])
+        .join(UsuarioXcarrera, PaymentModel.id_usuarioxcarrera == UsuarioXcarrera.id)
+        .join(UserDetail, UsuarioXcarrera.id_userdetail == UserDetail.id)
+        .join(User, UserDetail.id_user == User.id)
+        .join(Career, UsuarioXcarrera.id_carrera == Career.id)
+    )
+    if fecha_desde:
+        query = query.where(PaymentModel.fecha_pago >= fecha_desde)
+    if fecha_hasta:
+        query = query.where(PaymentModel.fecha_pago < fecha_hasta)
+    if career_id is not None:
+        query = query.where(UsuarioXcarrera.id_carrera == career_id)
+    if not include_anulados:
+        query = query.where(PaymentModel.anulado.is_(False))
+
+    # Orden cronológico (usa ix_pagos_fecha_pago_id)
+    query = query.order_by(PaymentModel.fecha_pago, PaymentModel.id)
+
+    async def batches():
+        # Sesión propia: tiene que vivir mientras dure el streaming,
+        # no sólo mientras corre el endpoint.
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for partition in result.partitions():
+                yield partition
+
+    header = [name for name, _ in EXPORT_COLUMNS]
+    if format == "xlsx":
+        body = iter_xlsx(header, batches(), sheet_name="Pagos")
+    else:
+        body = iter_csv(header, batches())
+
+    filename = f"pagos_{datetime.utcnow():%Y%m%d}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,126 @@
+# routes/report_routes.py
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.db import get_async_db
+from auth.security import require_admin
+from models.debtor_report import deudores
+from utils.debtor_report import debtors_report
+from utils.search import normalize_search, build_search_filter
+from utils.pagination import paginate
+from utils.responses import ApiResponse, Page
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["reports"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+# -------------------------------------------------------------------
+# SCHEMAS DE RESPUESTA
+# -------------------------------------------------------------------
+
+class DebtorOut(BaseModel):
+    id_usuarioxcarrera: int
+    user_id: int
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    dni: Optional[str] = None
+    email: Optional[str] = None
+    career_id: int
+    career_name: str
+    cuotas_vencidas: int
+    monto_vencido: int
+    primera_cuota_vencida: int
+    primer_vencimiento: Optional[datetime] = None
+    calculado_en: Optional[datetime] = None
+
+
+class DebtorsPage(Page[DebtorOut]):
+    calculado_en: Optional[datetime] = None
+
+
+# -------------------------------------------------------------------
+# REPORTE DE DEUDORES (vista materializada 'deudores')
+# -------------------------------------------------------------------
+
+@router.get("/debtors", response_model=ApiResponse[DebtorsPage])
+async def get_debtors(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=200),
+    search: Optional[str] = None,
+    career_id: Optional[int] = None,
+    min_cuotas_vencidas: int = Query(1, ge=1),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Alumnos con cuotas vencidas sin pagar, una fila por inscripción,
+    ordenados por cantidad de cuotas vencidas y monto adeudado.
+
+    Filtros:
+    - search: username / nombre / apellido / email / carrera, o prefijo de DNI
+    - career_id: sólo una carrera
+    - min_cuotas_vencidas: mínimo de cuotas vencidas
+
+    Path final: GET /reports/debtors
+    """
+    # Las cuotas vencen con el tiempo aunque no haya escrituras: si la vista
+    # quedó vieja se responde con lo que hay y se refresca en segundo plano
+    await debtors_report.refresh_if_stale(db)
+
+    query = select(deudores).where(deudores.c.cuotas_vencidas >= min_cuotas_vencidas)
+
+    if career_id is not None:
+        query = query.where(deudores.c.career_id == career_id)
+
+    term = normalize_search(search)
+    if term:
+        query = query.where(
+            build_search_filter(
+                term,
+                [
+                    deudores.c.username,
+                    deudores.c.first_name,
+                    deudores.c.last_name,
+                    deudores.c.email,
+                    deudores.c.career_name,
+                ],
+                dni_column=deudores.c.dni,
+                username_column=deudores.c.username,
+            )
+        )
+
+    query = query.order_by(
+        deudores.c.cuotas_vencidas.desc(),
+        deudores.c.monto_vencido.desc(),
+        deudores.c.id_usuarioxcarrera,
+    )
+
+    rows, meta = await paginate(db, query, page, page_size)
+
+    keys = [c.name for c in deudores.c]
+    items = []
+    for row in rows:
+        item = dict(zip(keys, row))
+        item["monto_vencido"] = int(item["monto_vencido"] or 0)
+        items.append(item)
+
+    calculado_en = await db.scalar(select(func.max(deudores.c.calculado_en)))
+
+    return {
+        "success": True,
+        "message": "Deudores obtenidos correctamente",
+        "data": {
+            "items": items,
+            "calculado_en": calculado_en,
+            **meta,
+        },
+    }
@@ -1,29 +1,91 @@
 # routes/upload_routes.py
 
-from fastapi import APIRouter, UploadFile, File
-import shutil
-import uuid
+import hashlib
 import os
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from auth.security import get_current_user
+from utils.images import schedule_thumbnails, sniff_image_type, split_upload_path
+
+router = APIRouter(dependencies=[Depends(get_current_user)])
+
+# Tamaño máximo de una imagen subida (bytes)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+# Se escribe a disco de a trozos: la imagen nunca está entera en memoria
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UploadResult(BaseModel):
+    success: bool
+    url: str
+    # True si la misma imagen ya estaba subida (misma URL)
+    duplicate: bool
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"La imagen supera el máximo de {MAX_UPLOAD_BYTES // (1024 * 1024)} MB",
+    )
+
+
+@router.post("/upload", response_model=UploadResult)
+async def upload_image(request: Request, file: UploadFile = File(...)):
+    # Rechazo temprano si el cliente ya declara un cuerpo demasiado grande
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES + UPLOAD_CHUNK_SIZE:
+        raise _too_large()
 
-router = APIRouter()
+    # El tipo se decide por el contenido, no por el nombre ni el Content-Type
+    head = await file.read(UPLOAD_CHUNK_SIZE)
+    extension = sniff_image_type(head)
+    if extension is None:
+        raise HTTPException(status_code=415, detail="Formato no soportado (JPG, PNG, GIF o WebP)")
 
-UPLOAD_DIR = "static/news_images"
+    # Nombre temporal único; el definitivo sale del hash del contenido
+    tmp_path, _ = split_upload_path(f"{uuid.uuid4()}.part")
 
-@router.post("/upload")
-def upload_image(file: UploadFile = File(...)):
-    # Crear nombre único
-    file_extension = file.filename.split('.')[-1]
-    new_filename = f"{uuid.uuid4()}.{file_extension}"
-    save_path = os.path.join(UPLOAD_DIR, new_filename)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as buffer:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise _too_large()
+                digest.update(chunk)
+                await run_in_threadpool(buffer.write, chunk)
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
 
-    # Guardar archivo
-    with open(save_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+        # Direccionado por contenido: la misma imagen siempre tiene la misma URL
+        save_path, url = split_upload_path(f"{digest.hexdigest()}.{extension}")
+        try:
+            # Duplicado: se renueva la fecha de modificación para que
+            # scripts/gc_images.py lo trate como una subida reciente
+            os.utime(save_path)
+            duplicate = True
+        except FileNotFoundError:
+            duplicate = False
+        if duplicate:
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, save_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-    # URL pública
-    url = f"/static/news_images/{new_filename}"
+    # Miniaturas WebP en segundo plano (ver utils/images.py); un duplicado ya las tiene
+    if not duplicate:
+        schedule_thumbnails(save_path)
 
     return {
         "success": True,
-        "url": url
+        "url": url,
+        "duplicate": duplicate,
     }
@@ -4,12 +4,19 @@ from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr, validator
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload
 
-from config.db import get_db
+from config.db import get_async_db
+from auth.security import Security, get_current_user, require_admin
+from auth.passwords import hash_password, verify_password, verify_dummy
 from models.user import User, UserDetail
-
-from sqlalchemy import or_
+from utils.search import normalize_search, build_search_filter, search_rank
+from utils.pagination import paginate
+from utils.debtor_report import debtors_report
+from utils.metrics import logins
+from utils.responses import ApiResponse, Page
 
 router = APIRouter()
 
@@ -116,30 +123,79 @@ class UserUpdate(BaseModel):
     return v
 
 
+# -------------------------------------------------------------------
+# SCHEMAS DE RESPUESTA
+# -------------------------------------------------------------------
+
+class LoginUser(BaseModel):
+  id: int
+  username: str
+  type: str
+
+
+class LoginData(BaseModel):
+  token: str
+  usuario: LoginUser
+
+
+class UserOut(BaseModel):
+  id: int
+  username: str
+  first_name: Optional[str] = None
+  last_name: Optional[str] = None
+  dni: Optional[str] = None
+  email: Optional[str] = None
+  type: Optional[str] = None
+  avatar_url: Optional[str] = None
+
+
 # -------------------------------------------------------------------
 # LOGIN
 # -------------------------------------------------------------------
 
-@router.post("/login")
-def login_user(payload: LoginInput, db: Session = Depends(get_db)):
-  user: Optional[User] = (
-    db.query(User)
-    .filter(User.username == payload.username)
-    .first()
-  )
+@router.post("/login", response_model=ApiResponse[LoginData])
+async def login_user(payload: LoginInput, db: AsyncSession = Depends(get_async_db)):
+  # Una sola consulta: sólo las columnas que hacen falta (sin cargar entidades)
+  user = (
+    await db.execute(
+      select(User.id, User.username, User.password, UserDetail.type)
+      .outerjoin(UserDetail, UserDetail.id_user == User.id)
+      .where(User.username == payload.username)
+    )
+  ).first()
+
+  # El hash corre en el pool de auth/passwords.py (no bloquea el event loop)
+  if user:
+    ok, needs_rehash = await verify_password(payload.password, user.password)
+  else:
+    await verify_dummy(payload.password)
+    ok, needs_rehash = False, False
 
-  if not user or user.password != payload.password:
+  if not ok:
+    logins.inc("failure")
     return {
       "success": False,
       "message": "Usuario o contraseña incorrectos",
       "data": None,
     }
 
-  detalle: Optional[UserDetail] = user.userdetail
-  user_type = detalle.type if detalle and detalle.type else "alumno"
+  # Filas en texto plano o con costo viejo: se rehashean de forma transparente
+  if needs_rehash:
+    new_hash = await hash_password(payload.password)
+    await db.execute(update(User).where(User.id == user.id).values(password=new_hash))
+    await db.commit()
+
+  user_type = user.type or "alumno"
 
-  token = f"fake-token-user-{user.id}"
+  token = Security.generate_token({
+    "idusuario": user.id,
+    "usuario": user.username,
+    "type": user_type,
+  })
+  if not token:
+    raise HTTPException(status_code=500, detail="No se pudo generar el token")
 
+  logins.inc("success")
   return {
     "success": True,
     "message": "Login correcto",
@@ -158,22 +214,22 @@ def login_user(payload: LoginInput, db: Session = Depends(get_db)):
 # CREAR USUARIO (con password)
 # -------------------------------------------------------------------
 
-@router.post("/users")
-def create_user(payload: UserCreate, db: Session = Depends(get_db)):
+@router.post("/users", dependencies=[Depends(require_admin)], response_model=ApiResponse[UserOut])
+async def create_user(payload: UserCreate, db: AsyncSession = Depends(get_async_db)):
   # Username único
-  existing = db.query(User).filter(User.username == payload.username).first()
+  existing = await db.scalar(select(User).where(User.username == payload.username))
   if existing:
     raise HTTPException(status_code=400, detail="El nombre de usuario ya existe")
 
   # DNI único
-  existing_dni = db.query(UserDetail).filter(UserDetail.dni == payload.dni).first()
+  existing_dni = await db.scalar(select(UserDetail).where(UserDetail.dni == payload.dni))
   if existing_dni:
     raise HTTPException(status_code=400, detail="El DNI ya está registrado")
 
-  # Crear User con password enviada (sin hash, por ahora)
-  new_user = User(username=payload.username, password=payload.password)
+  # Crear User con la password hasheada
+  new_user = User(username=payload.username, password=await hash_password(payload.password))
   db.add(new_user)
-  db.flush()  # para tener new_user.id
+  await db.flush()  # para tener new_user.id
 
   # Crear UserDetail
   new_detail = UserDetail(
@@ -186,9 +242,9 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db)):
   new_detail.id_user = new_user.id
   db.add(new_detail)
 
-  db.commit()
-  db.refresh(new_user)
-  db.refresh(new_detail)
+  await db.commit()
+  await db.refresh(new_user)
+  await db.refresh(new_detail)
 
   return {
     "success": True,
@@ -210,25 +266,44 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db)):
 # OBTENER UN USUARIO POR ID
 # -------------------------------------------------------------------
 
-@router.get("/users/{user_id}")
-def get_user(user_id: int, db: Session = Depends(get_db)):
-  user: Optional[User] = db.query(User).filter(User.id == user_id).first()
+@router.get("/users/{user_id}", response_model=ApiResponse[UserOut])
+async def get_user(
+  user_id: int,
+  db: AsyncSession = Depends(get_async_db),
+  current_user: dict = Depends(get_current_user),
+):
+  Security.check_owner_or_admin(current_user, user_id)
+
+  # Una sola consulta con las columnas de User + UserDetail
+  user = (
+    await db.execute(
+      select(
+        User.id,
+        User.username,
+        UserDetail.first_name,
+        UserDetail.last_name,
+        UserDetail.dni,
+        UserDetail.email,
+        UserDetail.type,
+      )
+      .outerjoin(UserDetail, UserDetail.id_user == User.id)
+      .where(User.id == user_id)
+    )
+  ).first()
   if not user:
     raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
-  detalle: Optional[UserDetail] = user.userdetail
-
   return {
     "success": True,
     "data": {
       "id": user.id,
       "username": user.username,
-      "first_name": getattr(detalle, "first_name", None),
-      "last_name": getattr(detalle, "last_name", None),
-      "dni": getattr(detalle, "dni", None),
-      "email": getattr(detalle, "email", None),
-      "type": detalle.type if detalle and detalle.type else "alumno",
-      "avatar_url": getattr(detalle, "avatar_url", None),
+      "first_name": user.first_name,
+      "last_name": user.last_name,
+      "dni": user.dni,
+      "email": user.email,
+      "type": user.type or "alumno",
+      "avatar_url": None,  # UserDetail todavía no tiene columna avatar_url
     },
   }
 
@@ -237,9 +312,17 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
 # EDITAR USUARIO (parcial, sin tocar password)
 # -------------------------------------------------------------------
 
-@router.put("/users/{user_id}")
-def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)):
-  user: Optional[User] = db.query(User).filter(User.id == user_id).first()
+@router.put("/users/{user_id}", response_model=ApiResponse[UserOut])
+async def update_user(
+  user_id: int,
+  payload: UserUpdate,
+  db: AsyncSession = Depends(get_async_db),
+  current_user: dict = Depends(get_current_user),
+):
+  Security.check_owner_or_admin(current_user, user_id)
+
+  # userdetail en el mismo SELECT (en async no se puede cargar después)
+  user: Optional[User] = await db.get(User, user_id, options=[joinedload(User.userdetail)])
   if not user:
     raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
@@ -256,17 +339,15 @@ def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)
     )
     detalle.id_user = user.id
     db.add(detalle)
-    db.flush()
+    await db.flush()
 
   # -----------------------------------
   # USERNAME (si se envía)
   # -----------------------------------
   if payload.username is not None:
     if payload.username != user.username:
-      existing = (
-        db.query(User)
-        .filter(User.username == payload.username, User.id != user_id)
-        .first()
+      existing = await db.scalar(
+        select(User).where(User.username == payload.username, User.id != user_id)
       )
       if existing:
         raise HTTPException(
@@ -279,10 +360,8 @@ def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)
   # DNI (si se envía)
   # -----------------------------------
   if payload.dni is not None:
-    existing_dni = (
-      db.query(UserDetail)
-      .filter(UserDetail.dni == payload.dni, UserDetail.id != detalle.id)
-      .first()
+    existing_dni = await db.scalar(
+      select(UserDetail).where(UserDetail.dni == payload.dni, UserDetail.id != detalle.id)
     )
     if existing_dni:
       raise HTTPException(
@@ -304,14 +383,18 @@ def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)
     detalle.email = payload.email
 
   if payload.type is not None:
+    # Sólo un admin puede cambiar el rol
+    if payload.type != detalle.type:
+      Security.check_role(current_user, "admin")
     detalle.type = payload.type
 
   if payload.avatar_url is not None:
     detalle.avatar_url = payload.avatar_url
 
-  db.commit()
-  db.refresh(user)
-  db.refresh(detalle)
+  await db.commit()
+  debtors_report.mark_dirty()
+  await db.refresh(user)
+  await db.refresh(detalle)
 
   return {
     "success": True,
@@ -324,7 +407,7 @@ def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)
       "dni": detalle.dni,
       "email": detalle.email,
       "type": detalle.type,
-      "avatar_url": detalle.avatar_url,
+      "avatar_url": getattr(detalle, "avatar_url", None),
     },
   }
 
@@ -333,18 +416,24 @@ def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)
 # ELIMINAR USUARIO
 # -------------------------------------------------------------------
 
-@router.delete("/users/{user_id}")
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-  user: Optional[User] = db.query(User).filter(User.id == user_id).first()
+@router.delete("/users/{user_id}", dependencies=[Depends(require_admin)], response_model=ApiResponse[None])
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+  # Relaciones cargadas antes: el delete no puede hacer lazy load en async
+  user: Optional[User] = await db.get(
+    User,
+    user_id,
+    options=[joinedload(User.userdetail).selectinload(UserDetail.usuario_carrera)],
+  )
   if not user:
     raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
   detalle: Optional[UserDetail] = user.userdetail
 
   if detalle:
-    db.delete(detalle)
-  db.delete(user)
-  db.commit()
+    await db.delete(detalle)
+  await db.delete(user)
+  await db.commit()
+  debtors_report.mark_dirty()
 
   return {"success": True, "message": "Usuario eliminado correctamente"}
 
@@ -353,14 +442,19 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
 # USUARIOS PAGINADOS + BÚSQUEDA
 # -------------------------------------------------------------------
 
-@router.post("/users/paginated")
-def get_users_paginated(
+@router.post(
+  "/users/paginated",
+  dependencies=[Depends(require_admin)],
+  response_model=ApiResponse[Page[UserOut]],
+)
+async def get_users_paginated(
   payload: UsersPaginatedRequest,
-  db: Session = Depends(get_db),
+  db: AsyncSession = Depends(get_async_db),
 ):
   """
   Devuelve SOLO alumnos (type = 'alumno') paginados para la vista de Admin.
-  Se puede buscar por username, nombre, apellido, DNI o email.
+  Se puede buscar por username (prefijo si lleva dígitos), nombre, apellido,
+  DNI (prefijo) o email; con búsqueda los resultados vienen ordenados por relevancia.
   """
 
   page = payload.page if payload.page > 0 else 1
@@ -368,33 +462,41 @@ def get_users_paginated(
 
   # Base: solo alumnos
   query = (
-    db.query(User)
+    select(User)
     .outerjoin(UserDetail, UserDetail.id_user == User.id)
-    .filter(UserDetail.type == "alumno")  # 👈 solo alumnos
-    .order_by(User.id)
+    .where(UserDetail.type == "alumno")  # 👈 solo alumnos
   )
 
-  # Búsqueda
-  if payload.search:
-    search = f"%{payload.search}%"
-    query = query.filter(
-      or_(
-        User.username.ilike(search),
-        UserDetail.first_name.ilike(search),
-        UserDetail.last_name.ilike(search),
-        UserDetail.dni.ilike(search),
-        UserDetail.email.ilike(search),
+  # Búsqueda (índices trigram + prefijo de DNI/username), resultados por relevancia
+  search = normalize_search(payload.search)
+  if search:
+    text_columns = [
+      User.username,
+      UserDetail.first_name,
+      UserDetail.last_name,
+      UserDetail.email,
+    ]
+    query = query.where(
+      build_search_filter(
+        search,
+        text_columns,
+        dni_column=UserDetail.dni,
+        username_column=User.username,
       )
     )
-
-  total_items = query.count()
-  total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
-
-  users_db = (
-    query
-    .offset((page - 1) * page_size)
-    .limit(page_size)
-    .all()
+    rank = await search_rank(db, search, text_columns)
+    if rank is not None:
+      query = query.order_by(rank.desc())
+
+  query = query.order_by(User.id)
+
+  # Página + total en una sola consulta
+  users_db, meta = await paginate(
+    db,
+    # El detalle sale del mismo JOIN que filtra (sin segundo SELECT)
+    query.options(contains_eager(User.userdetail)),
+    page,
+    page_size,
   )
 
   items = []
@@ -419,10 +521,6 @@ def get_users_paginated(
     "message": "Alumnos obtenidos correctamente",
     "data": {
       "items": items,
-      "page": page,
-      "page_size": page_size,
-      "total_items": total_items,
-      "total_pages": total_pages,
-      "has_next": page < total_pages,
+      **meta,
     },
   }
\ No newline at end of file
@@ -0,0 +1,89 @@
+# scripts/gc_images.py
+"""
+Borra de static/news_images las imágenes que ya no referencia ninguna
+noticia (News.image_url), junto con sus miniaturas y variantes WebP/AVIF.
+
+    python -m scripts.gc_images --dry-run
+    python -m scripts.gc_images --min-age 86400
+
+--min-age evita borrar imágenes recién subidas cuya noticia todavía no
+se guardó (por defecto 1 hora). La edad sale de st_mtime: POST /upload
+renueva la fecha (os.utime) cuando alguien vuelve a subir una imagen que
+ya existía, así que cuenta desde la última subida. Las miniaturas y
+variantes toman la edad de la más reciente de su grupo (mismo stem).
+"""
+
+import argparse
+import os
+import re
+import time
+from typing import Dict, Set
+
+from sqlalchemy import select
+
+from config.db import SessionLocal
+from models.news import News
+from utils.images import UPLOAD_DIR, upload_filename
+
+# Miniaturas (<stem>_w<ancho>.webp) y variantes (<stem>.webp / .avif) comparten
+# el stem de la imagen original
+_STEM_RE = re.compile(r"^(?P<stem>.+?)(_w\d+)?\.[A-Za-z0-9]+$")
+
+
+def referenced_images() -> Set[str]:
+    """Nombres de archivo (sin miniaturas) usados por alguna noticia."""
+    with SessionLocal() as db:
+        urls = db.scalars(select(News.image_url).where(News.image_url.isnot(None)).distinct())
+        return {name for name in (upload_filename(url) for url in urls) if name}
+
+
+def collect_garbage(min_age: float, dry_run: bool) -> dict:
+    referenced = referenced_images()
+    referenced_stems = {name.rsplit(".", 1)[0] for name in referenced}
+    now = time.time()
+
+    entries = [entry for entry in os.scandir(UPLOAD_DIR) if entry.is_file()]
+
+    # Última modificación por stem: una imagen re-subida mantiene sus miniaturas
+    newest: Dict[str, float] = {}
+    for entry in entries:
+        match = _STEM_RE.match(entry.name)
+        stem = match.group("stem") if match else entry.name
+        newest[stem] = max(newest.get(stem, 0.0), entry.stat().st_mtime)
+
+    removed, kept, freed = 0, 0, 0
+    for entry in entries:
+        name = entry.name
+        match = _STEM_RE.match(name)
+        stem = match.group("stem") if match else name
+        in_use = name in referenced or stem in referenced_stems
+
+        stat = entry.stat()
+        if in_use or now - newest[stem] < min_age:
+            kept += 1
+            continue
+
+        print(("[dry-run] " if dry_run else "") + f"borrando {name}")
+        if not dry_run:
+            os.remove(entry.path)
+        removed += 1
+        freed += stat.st_size
+
+    return {"referenced": len(referenced), "removed": removed, "kept": kept, "freed_bytes": freed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="sólo listar lo que se borraría")
+    parser.add_argument("--min-age", type=float, default=3600, help="segundos mínimos desde la subida")
+    args = parser.parse_args()
+
+    result = collect_garbage(args.min_age, args.dry_run)
+    print(
+        f"{result['referenced']} imágenes referenciadas, {result['removed']} borradas, "
+        f"{result['kept']} conservadas, {result['freed_bytes'] / (1024 * 1024):.1f} MB liberados"
+    )
+
+
+if __name__ == "__main__":
+    main()
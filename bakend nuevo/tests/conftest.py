@@ -0,0 +1,197 @@
+# tests/conftest.py
+"""
+Fixtures de los tests: corren contra el Postgres configurado en DB_*
+(conviene una base propia, ej. DB_NAME=apiescu_test), con las migraciones
+aplicadas. Si la base no responde, los tests se saltean.
+
+    DB_NAME=apiescu_test python -m pytest -q tests
+
+Los datos que crea cada test llevan un sufijo único y se borran al final:
+no se vacía ninguna tabla.
+"""
+
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+from typing import List
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Antes de importar la app: se leen al importarse
+os.environ.setdefault("JWT_SECRET_KEY", uuid.uuid4().hex * 2)
+os.environ.setdefault("DEBTORS_REFRESH_DELAY", "3600")
+
+from sqlalchemy import delete, event, select, text  # noqa: E402
+
+from auth.passwords import hash_password_sync  # noqa: E402
+from config.db import SessionLocal, async_engine, engine  # noqa: E402
+from models.career import Career  # noqa: E402
+from models.career_price import CareerPriceHistory  # noqa: E402
+from models.payment import Payment  # noqa: E402
+from models.user import User, UserDetail  # noqa: E402
+from models.usuarioxcarrera import UsuarioXcarrera  # noqa: E402
+
+PASSWORD = "secret123"
+
+
+# -------------------------------------------------------------------
+# APP + BASE
+# -------------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def client():
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        pytest.skip(f"Postgres no disponible (DB_*): {e}")
+
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BASE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BASE_DIR, "migrations"))
+    command.upgrade(config, "head")
+
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+# -------------------------------------------------------------------
+# CONTADOR DE SENTENCIAS SQL
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def count_statements():
+    """
+    Context manager que junta las sentencias que ejecuta la app (engine async):
+
+        with count_statements() as statements:
+            client.get(...)
+        assert len(statements) == 1
+    """
+
+    @contextmanager
+    def counter():
+        statements: List[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
+
+
+# -------------------------------------------------------------------
+# DATOS
+# -------------------------------------------------------------------
+
+class DataFactory:
+    """Crea usuarios, carreras, inscripciones y pagos; los borra en cleanup()."""
+
+    def __init__(self):
+        self.suffix = uuid.uuid4().hex[:8]
+        self._counter = 0
+        self.user_ids: List[int] = []
+        self.career_ids: List[int] = []
+
+    def _next(self) -> int:
+        self._counter += 1
+        return self._counter
+
+    def user(self, type: str = "alumno") -> User:
+        n = self._next()
+        with SessionLocal() as db:
+            user = User(username=f"t{self.suffix}_{n}", password=hash_password_sync(PASSWORD))
+            db.add(user)
+            db.flush()
+            detail = UserDetail(
+                first_name="Test",
+                last_name=f"User{n}",
+                dni=f"9{int(self.suffix, 16) % 10**6:06d}{n:02d}",
+                email=f"t{self.suffix}_{n}@test.local",
+                type=type,
+            )
+            detail.id_user = user.id
+            db.add(detail)
+            db.commit()
+            db.refresh(user)
+            db.expunge(user)
+        self.user_ids.append(user.id)
+        return user
+
+    def career(self, costo_mensual: int = 1000, duracion_meses: int = 12) -> Career:
+        n = self._next()
+        with SessionLocal() as db:
+            career = Career(
+                name=f"Carrera {self.suffix}_{n}",
+                costo_mensual=costo_mensual,
+                duracion_meses=duracion_meses,
+            )
+            db.add(career)
+            db.commit()
+            db.refresh(career)
+            db.expunge(career)
+        self.career_ids.append(career.id)
+        return career
+
+    def enroll(self, user: User, career: Career, payments: int = 0) -> int:
+        with SessionLocal() as db:
+            detail_id = db.scalar(select(UserDetail.id).where(UserDetail.id_user == user.id))
+            enrollment = UsuarioXcarrera(id_userdetail=detail_id, id_carrera=career.id)
+            db.add(enrollment)
+            db.flush()
+            for cuota in range(1, payments + 1):
+                db.add(Payment(
+                    id_usuarioxcarrera=enrollment.id,
+                    numero_cuota=cuota,
+                    monto=career.costo_mensual,
+                ))
+            db.commit()
+            return enrollment.id
+
+    def cleanup(self) -> None:
+        with SessionLocal() as db:
+            detail_ids = select(UserDetail.id).where(UserDetail.id_user.in_(self.user_ids))
+            enrollments = select(UsuarioXcarrera.id).where(
+                UsuarioXcarrera.id_userdetail.in_(detail_ids)
+                | UsuarioXcarrera.id_carrera.in_(self.career_ids)
+            )
+            db.execute(delete(Payment).where(Payment.id_usuarioxcarrera.in_(enrollments)))
+            db.execute(delete(UsuarioXcarrera).where(UsuarioXcarrera.id.in_(enrollments)))
+            db.execute(delete(UserDetail).where(UserDetail.id_user.in_(self.user_ids)))
+            db.execute(delete(User).where(User.id.in_(self.user_ids)))
+            db.execute(delete(CareerPriceHistory).where(CareerPriceHistory.id_carrera.in_(self.career_ids)))
+            db.execute(delete(Career).where(Career.id.in_(self.career_ids)))
+            db.commit()
+
+
+@pytest.fixture
+def data(client):
+    factory = DataFactory()
+    yield factory
+    factory.cleanup()
+
+
+@pytest.fixture
+def login(client):
+    """Devuelve los headers de Authorization de un usuario creado con 'data'."""
+
+    def do_login(user: User) -> dict:
+        r = client.post("/login", json={"username": user.username, "password": PASSWORD})
+        assert r.status_code == 200 and r.json()["success"], r.text
+        return {"Authorization": f"Bearer {r.json()['data']['token']}"}
+
+    return do_login
@@ -0,0 +1,34 @@
+# tests/test_alumno_queries.py
+"""
+/alumno/carreras y /alumno/pagos: la cantidad de sentencias SQL no depende
+de cuántas inscripciones tenga el alumno (detalle + una consulta).
+"""
+
+import pytest
+
+
+@pytest.fixture
+def alumnos(data, login):
+    """Alumno con 1 inscripción (2 pagos) y alumno con 4 (3 pagos c/u)."""
+    uno = data.user()
+    data.enroll(uno, data.career(), payments=2)
+
+    varios = data.user()
+    for _ in range(4):
+        data.enroll(varios, data.career(), payments=3)
+
+    return [
+        (login(uno), {"carreras": 1, "pagos": 2}),
+        (login(varios), {"carreras": 4, "pagos": 12}),
+    ]
+
+
+@pytest.mark.parametrize("key", ["carreras", "pagos"])
+def test_dos_sentencias_con_1_o_n_inscripciones(client, alumnos, count_statements, key):
+    for headers, expected in alumnos:
+        with count_statements() as statements:
+            r = client.get(f"/alumno/{key}", headers=headers)
+
+        assert r.status_code == 200, r.text
+        assert len(r.json()["data"][key]) == expected[key]
+        assert len(statements) == 2, statements
@@ -0,0 +1,39 @@
+# tests/test_export.py
+"""XLSX generado por utils/export.py (no usa la base)."""
+
+import asyncio
+import io
+import zipfile
+from datetime import datetime, timedelta, timezone
+from xml.etree import ElementTree
+
+from utils.export import iter_xlsx
+
+NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _sheet(rows) -> ElementTree.Element:
+    async def batches():
+        yield rows
+
+    async def collect() -> bytes:
+        return b"".join([chunk async for chunk in iter_xlsx(["a", "b"], batches())])
+
+    with zipfile.ZipFile(io.BytesIO(asyncio.run(collect()))) as zf:
+        # Tiene que ser XML válido: un carácter prohibido rompe el parseo
+        return ElementTree.fromstring(zf.read("xl/worksheets/sheet1.xml"))
+
+
+def test_caracteres_de_control_se_descartan():
+    sheet = _sheet([("Pérez\x01\x0b", "línea\tcon\ttabs")])
+
+    texts = [t.text for t in sheet.iter(f"{{{NS['m']}}}t")]
+    assert texts == ["a", "b", "Pérez", "línea\tcon\ttabs"]
+
+
+def test_fechas_con_zona_se_pasan_a_utc():
+    argentina = timezone(timedelta(hours=-3))
+    sheet = _sheet([(datetime(2025, 3, 1, 21, 0, tzinfo=argentina), datetime(2025, 3, 2, 0, 0))])
+
+    values = [float(v.text) for v in sheet.iter(f"{{{NS['m']}}}v")]
+    assert values[0] == values[1]
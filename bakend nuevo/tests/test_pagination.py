@@ -0,0 +1,99 @@
+# tests/test_pagination.py
+"""POST /payments/paginated: total (utils/pagination.paginate) y modo cursor."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from config.db import SessionLocal
+from models.payment import Payment
+from routes.payment_routes import payments_list_query
+
+
+def _total_pagos() -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(payments_list_query(None).order_by(None).subquery()))
+
+
+def test_total_exacto_con_count_aparte(client, data, login, count_statements):
+    admin = data.user(type="admin")
+    alumno = data.user()
+    data.enroll(alumno, data.career(), payments=3)
+    headers = login(admin)
+
+    with count_statements() as statements:
+        r = client.post("/payments/paginated", json={"page": 1, "page_size": 2}, headers=headers)
+
+    assert r.status_code == 200, r.text
+    page = r.json()["data"]
+    assert len(page["items"]) == 2
+    assert page["total_items"] == _total_pagos()
+    assert page["total_is_estimate"] is False
+    # Página + COUNT, sin count(*) OVER () sobre el JOIN
+    assert len(statements) == 2, statements
+    assert not any("OVER" in s for s in statements)
+
+
+def test_total_is_estimate_solo_si_se_uso_reltuples(client, data, login):
+    admin = data.user(type="admin")
+    alumno = data.user()
+    data.enroll(alumno, data.career(), payments=1)
+    headers = login(admin)
+
+    # Página fuera de rango: el total se cuenta de verdad
+    r = client.post(
+        "/payments/paginated",
+        json={"page": 100000, "page_size": 20, "estimate_total": True},
+        headers=headers,
+    )
+
+    assert r.status_code == 200, r.text
+    assert r.json()["data"]["total_items"] == _total_pagos()
+    assert r.json()["data"]["total_is_estimate"] is False
+
+
+def test_cursor_recorre_pagos_con_la_misma_fecha(client, data, login):
+    admin = data.user(type="admin")
+    alumno = data.user()
+    enrollment_id = data.enroll(alumno, data.career(), payments=3)
+    headers = login(admin)
+    with SessionLocal() as db:
+        db.execute(
+            update(Payment)
+            .where(Payment.id_usuarioxcarrera == enrollment_id)
+            .values(fecha_pago=datetime(2024, 1, 1))
+        )
+        db.commit()
+
+    vistos, cursor = [], None
+    while True:
+        r = client.post(
+            "/payments/paginated",
+            json={"cursor_mode": True, "cursor": cursor, "page_size": 1, "search": alumno.username},
+            headers=headers,
+        )
+        assert r.status_code == 200, r.text
+        page = r.json()["data"]
+        vistos += [p["id"] for p in page["items"] if p["id_usuarioxcarrera"] == enrollment_id]
+        if not page["has_next"]:
+            break
+        cursor = page["next_cursor"]
+
+    assert len(vistos) == 3
+    assert vistos == sorted(vistos, reverse=True)
+
+
+def test_fecha_pago_no_admite_null(client, data):
+    alumno = data.user()
+    enrollment_id = data.enroll(alumno, data.career(), payments=1)
+
+    with SessionLocal() as db:
+        with pytest.raises(IntegrityError):
+            db.execute(
+                update(Payment)
+                .where(Payment.id_usuarioxcarrera == enrollment_id)
+                .values(fecha_pago=None)
+            )
+        db.rollback()
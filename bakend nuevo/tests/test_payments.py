@@ -0,0 +1,30 @@
+# tests/test_payments.py
+"""Alta de pagos: POST /payments y POST /payments/bulk."""
+
+
+def test_rechaza_cuota_fuera_de_la_duracion(client, data, login):
+    admin = data.user(type="admin")
+    alumno = data.user()
+    enrollment_id = data.enroll(alumno, data.career(duracion_meses=3))
+    headers = login(admin)
+
+    r = client.post("/payments", json={"id_usuarioxcarrera": enrollment_id, "numero_cuota": 4}, headers=headers)
+    assert r.status_code == 400, r.text
+
+    r = client.post(
+        "/payments/bulk",
+        json={"items": [
+            {"id_usuarioxcarrera": enrollment_id, "numero_cuota": 3},
+            {"id_usuarioxcarrera": enrollment_id, "numero_cuota": 4},
+        ]},
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    assert [item["success"] for item in r.json()["data"]["items"]] == [True, False]
+
+    # Todos los pagos registrados aparecen en el estado de cuenta
+    r = client.get(f"/enrollments/{enrollment_id}/statement", headers=headers)
+    assert r.status_code == 200, r.text
+    estados = {c["numero_cuota"]: c["estado"] for c in r.json()["data"]["cuotas"]}
+    assert sorted(estados) == [1, 2, 3]
+    assert estados[3] == "pagada"
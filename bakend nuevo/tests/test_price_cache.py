@@ -0,0 +1,37 @@
+# tests/test_price_cache.py
+"""Vencimiento y generación del cache de historiales de precio."""
+
+from sqlalchemy import event
+
+from config.db import SessionLocal
+from utils.price_cache import PriceTimelineCache
+
+
+def test_cachea_hasta_el_ttl(data):
+    career = data.career(costo_mensual=1500)
+
+    cache = PriceTimelineCache(ttl=60)
+    with SessionLocal() as db:
+        assert cache.get_timeline(db, career.id).costo_mensual == 1500
+    assert cache._cached(career.id) is not None
+
+    vencido = PriceTimelineCache(ttl=0)
+    with SessionLocal() as db:
+        vencido.get_timeline(db, career.id)
+    assert vencido._cached(career.id) is None
+
+
+def test_carga_invalidada_a_mitad_no_se_guarda(data):
+    # Otro request escribe (e invalida) mientras este todavía lee el
+    # historial viejo: lo leído se devuelve pero no queda en el cache
+    career = data.career()
+    cache = PriceTimelineCache(ttl=60)
+
+    with SessionLocal() as db:
+        @event.listens_for(db, "do_orm_execute")
+        def escritura_concurrente(state):
+            cache.invalidate(career.id)
+
+        assert cache.get_timeline(db, career.id) is not None
+
+    assert cache._cached(career.id) is None
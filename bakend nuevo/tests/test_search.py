@@ -0,0 +1,58 @@
+# tests/test_search.py
+"""Búsqueda de POST /users/paginated (utils/search.py)."""
+
+from sqlalchemy import select, update
+
+from config.db import SessionLocal
+from models.user import User, UserDetail
+
+
+def test_prefijo_de_username_sin_distinguir_mayusculas(client, data, login, count_statements):
+    admin = data.user(type="admin")
+    alumno = data.user()
+    data.user()
+    headers = login(admin)
+
+    # Letras + dígitos: sólo prefijo de username (ix_usuarios_username_lower_prefix)
+    prefix = alumno.username[:-1].upper()
+    with count_statements() as statements:
+        r = client.post("/users/paginated", json={"page": 1, "page_size": 20, "search": prefix}, headers=headers)
+
+    assert r.status_code == 200, r.text
+    usernames = [item["username"] for item in r.json()["data"]["items"]]
+    assert alumno.username in usernames
+    assert all(u.lower().startswith(prefix.lower()) for u in usernames)
+    assert "lower(usuarios.username) LIKE" in statements[-1]
+
+
+def test_busqueda_por_nombre(client, data, login):
+    # Con o sin pg_trgm en el servidor (sin la extensión no se ordena por similitud)
+    admin = data.user(type="admin")
+    alumno = data.user()  # first_name = "Test"
+    headers = login(admin)
+
+    r = client.post("/users/paginated", json={"page": 1, "page_size": 100, "search": "test"}, headers=headers)
+
+    assert r.status_code == 200, r.text
+    assert alumno.username in {item["username"] for item in r.json()["data"]["items"]}
+
+
+def test_termino_numerico_busca_dni_y_username(client, data, login):
+    admin = data.user(type="admin")
+    por_dni = data.user()
+    por_username = data.user()
+    headers = login(admin)
+    # Los DNI de la factory empiezan con 9: estos dígitos no son prefijo de ninguno
+    digits = f"0{por_username.id:09d}"
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.id == por_username.id).values(username=f"alumno{digits}"))
+        db.commit()
+        dni = db.scalar(select(UserDetail.dni).where(UserDetail.id_user == por_dni.id))
+
+    r = client.post("/users/paginated", json={"page": 1, "page_size": 100, "search": dni}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert por_dni.username in {item["username"] for item in r.json()["data"]["items"]}
+
+    r = client.post("/users/paginated", json={"page": 1, "page_size": 100, "search": digits}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert [item["username"] for item in r.json()["data"]["items"]] == [f"alumno{digits}"]
@@ -0,0 +1,17 @@
+# tests/test_security.py
+"""Configuración de auth/security.py."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import auth.security
+
+
+def test_no_arranca_sin_jwt_secret_key(monkeypatch):
+    import main
+
+    monkeypatch.setattr(auth.security, "SECRET_KEY", "")
+
+    with pytest.raises(RuntimeError, match="JWT_SECRET_KEY"):
+        with TestClient(main.app):
+            pass
@@ -0,0 +1,64 @@
+# tests/test_static.py
+"""Negociación de variantes AVIF/WebP de utils/static.py (no usa la base)."""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from utils.static import ImmutableStaticFiles, accepted_variants
+
+STEM = "a" * 64
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    (tmp_path / f"{STEM}.png").write_bytes(b"png")
+    (tmp_path / f"{STEM}.webp").write_bytes(b"webp")
+    (tmp_path / f"{STEM}.avif").write_bytes(b"avif")
+    (tmp_path / f"{'b' * 64}.webp").write_bytes(b"solo variante")
+    app = Starlette(routes=[Mount("/img", ImmutableStaticFiles(directory=str(tmp_path)))])
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("image/avif,image/webp,*/*;q=0.8", (".avif", ".webp")),
+    ("image/webp;q=0.9, image/avif;q=0.5", (".webp", ".avif")),
+    ("image/avif;q=0, image/webp", (".webp",)),
+    ("image/webp;q=0", ()),
+    ("image/*,*/*", ()),
+    ("", ()),
+])
+def test_accepted_variants(accept, expected):
+    assert accepted_variants(accept) == expected
+
+
+@pytest.mark.parametrize("accept, body", [
+    ("image/avif,image/webp,*/*", b"avif"),
+    ("image/avif;q=0,image/webp,*/*", b"webp"),
+    ("image/webp;q=0,*/*", b"png"),
+    ("*/*", b"png"),
+])
+def test_sirve_la_variante_aceptada(static_client, accept, body):
+    r = static_client.get(f"/img/{STEM}.png", headers={"accept": accept})
+
+    assert r.status_code == 200
+    assert r.content == body
+    assert r.headers["vary"] == "Accept"
+    assert r.headers["cache-control"].endswith("immutable")
+
+
+def test_etag_y_304(static_client):
+    r = static_client.get(f"/img/{STEM}.png", headers={"accept": "image/webp"})
+    assert r.headers["etag"] == f'"{STEM}.webp"'
+
+    r = static_client.get(
+        f"/img/{STEM}.png",
+        headers={"accept": "image/webp", "if-none-match": r.headers["etag"]},
+    )
+    assert r.status_code == 304
+
+
+def test_sin_original_no_hay_variante(static_client):
+    r = static_client.get(f"/img/{'b' * 64}.png", headers={"accept": "image/webp"})
+    assert r.status_code == 404
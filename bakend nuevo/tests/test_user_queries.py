@@ -0,0 +1,72 @@
+# tests/test_user_queries.py
+"""
+Cantidad de sentencias SQL por request en los endpoints de usuarios.
+
+User.userdetail no se carga con JOIN global: cada consulta pide el detalle
+explícitamente (columnas, joinedload o contains_eager) y tiene que seguir
+resolviéndose en un solo SELECT.
+"""
+
+from conftest import PASSWORD
+
+
+def test_login_una_sentencia(client, data, count_statements):
+    user = data.user()
+
+    with count_statements() as statements:
+        r = client.post("/login", json={"username": user.username, "password": PASSWORD})
+
+    assert r.json()["success"], r.text
+    assert len(statements) == 1, statements
+
+
+def test_get_user_una_sentencia(client, data, login, count_statements):
+    user = data.user()
+    headers = login(user)
+
+    with count_statements() as statements:
+        r = client.get(f"/users/{user.id}", headers=headers)
+
+    assert r.status_code == 200, r.text
+    assert r.json()["data"]["username"] == user.username
+    assert len(statements) == 1, statements
+
+
+def test_users_paginated_una_sentencia(client, data, login, count_statements):
+    admin = data.user(type="admin")
+    alumnos = [data.user() for _ in range(3)]
+    headers = login(admin)
+
+    with count_statements() as statements:
+        r = client.post(
+            "/users/paginated",
+            json={"page": 1, "page_size": 100},
+            headers=headers,
+        )
+
+    assert r.status_code == 200, r.text
+    # La base puede tener más alumnos: sólo se mira que vengan con detalle
+    items = r.json()["data"]["items"]
+    assert len(items) >= len(alumnos)
+    assert all(item["last_name"] is not None for item in items)
+    assert admin.username not in {item["username"] for item in items}
+    assert len(statements) == 1, statements
+
+
+def test_payments_paginated_un_solo_join_al_detalle(client, data, login, count_statements):
+    # La consulta de pagos ya hace JOIN a detalles_usuario para traer al
+    # alumno: cargar User no tiene que sumar otro JOIN al mismo detalle
+    admin = data.user(type="admin")
+    alumno = data.user()
+    data.enroll(alumno, data.career(), payments=2)
+    headers = login(admin)
+
+    with count_statements() as statements:
+        r = client.post("/payments/paginated", json={"page": 1, "page_size": 10}, headers=headers)
+
+    assert r.status_code == 200, r.text
+    assert r.json()["data"]["items"]
+    selects = [s for s in statements if "FROM pagos" in s]
+    assert selects, statements
+    for statement in selects:
+        assert statement.count("JOIN detalles_usuario") == 1, statement
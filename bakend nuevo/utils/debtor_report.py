@@ -0,0 +1,101 @@
+# utils/debtor_report.py
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+from config.db import async_engine
+
+logger = logging.getLogger(__name__)
+
+# Segundos que se espera tras una escritura antes de refrescar
+# (agrupa ráfagas de pagos en un solo REFRESH)
+DEBTORS_REFRESH_DELAY = float(os.getenv("DEBTORS_REFRESH_DELAY", "2"))
+# Antigüedad máxima de la vista: las cuotas vencen con el paso del tiempo
+# aunque nadie escriba, así que se refresca al leer si quedó vieja
+DEBTORS_MAX_AGE = float(os.getenv("DEBTORS_MAX_AGE", "3600"))
+
+# Todas las filas de la vista tienen el mismo calculado_en (hora del REFRESH)
+_AGE_SQL = text(
+    "SELECT EXTRACT(EPOCH FROM (now() AT TIME ZONE 'utc') - calculado_en) "
+    "FROM deudores LIMIT 1"
+)
+# Serializa los REFRESH entre procesos/workers (se libera con la transacción)
+_REFRESH_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('deudores'))")
+
+
+class DebtorsReport:
+    """
+    Mantiene actualizada la vista materializada 'deudores'.
+
+    Los endpoints que escriben pagos/inscripciones/carreras llaman a
+    mark_dirty() después del commit; el REFRESH corre en segundo plano
+    (CONCURRENTLY, así las lecturas no se bloquean) y con un pequeño
+    retardo para agrupar varias escrituras seguidas.
+
+    La antigüedad sale de 'calculado_en' de la propia vista, así todos los
+    workers ven lo mismo. Si la vista quedó vieja, la lectura se sirve igual
+    con lo que hay y el REFRESH se lanza en segundo plano.
+    """
+
+    def __init__(self):
+        # Último REFRESH de este proceso: sólo se usa si la vista está vacía
+        # (sin filas no hay calculado_en)
+        self.last_refresh: Optional[float] = None
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def is_stale(self, db) -> bool:
+        """'db' puede ser AsyncSession o AsyncConnection."""
+        age = await db.scalar(_AGE_SQL)
+        if age is None:
+            return self.last_refresh is None or time.monotonic() - self.last_refresh > DEBTORS_MAX_AGE
+        return float(age) > DEBTORS_MAX_AGE
+
+    async def refresh_if_stale(self, db) -> None:
+        """Si la vista está vieja, la refresca en segundo plano (no espera)."""
+        if self._task is not None and not self._task.done():
+            return  # ya hay un REFRESH en curso o programado
+        if await self.is_stale(db):
+            self._task = asyncio.create_task(self._refresh_stale())
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(DEBTORS_REFRESH_DELAY)
+            self._dirty = False
+            try:
+                await self.refresh()
+            except Exception:
+                # Se reintenta en la próxima escritura o lectura
+                logger.exception("No se pudo refrescar la vista 'deudores'")
+
+    async def _refresh_stale(self) -> None:
+        try:
+            await self.refresh(only_if_stale=True)
+        except Exception:
+            logger.exception("No se pudo refrescar la vista 'deudores'")
+
+    async def refresh(self, only_if_stale: bool = False) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            async with async_engine.begin() as conn:
+                await conn.execute(_REFRESH_LOCK_SQL)
+                # Otro worker pudo haberla refrescado mientras esperábamos
+                if only_if_stale and not await self.is_stale(conn):
+                    return
+                await conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY deudores"))
+            self.last_refresh = time.monotonic()
+
+
+debtors_report = DebtorsReport()
@@ -0,0 +1,195 @@
+# utils/export.py
+
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, List, Sequence
+from xml.sax.saxutils import escape
+
+# Cada lote de filas que llega de la base se convierte en un chunk de la respuesta
+RowBatches = AsyncIterator[Sequence[Sequence]]
+
+
+# -------------------------------------------------------------------
+# CSV
+# -------------------------------------------------------------------
+
+async def iter_csv(header: List[str], batches: RowBatches) -> AsyncIterator[bytes]:
+    """
+    Genera un CSV (UTF-8 con BOM, para que Excel lea bien los acentos)
+    lote por lote: en memoria sólo vive el lote actual.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    buf.write("\ufeff")
+    writer.writerow(header)
+
+    async for batch in batches:
+        writer.writerows(batch)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+
+    # Encabezado solo (sin filas) o resto pendiente
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+# -------------------------------------------------------------------
+# XLSX (escritura mínima en streaming, sin dependencias)
+# -------------------------------------------------------------------
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Destino no 'seekable' para zipfile: acumula lo escrito hasta que
+    se vacía con drain(). zipfile usa data descriptors en ese caso,
+    así que el zip se puede emitir a medida que se escribe.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Estilo 1 = fecha y hora (numFmt 22 es integrado: "m/d/yy h:mm")
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '</styleSheet>'
+)
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+
+# Caracteres que XML 1.0 no admite ni escapados (controles C0 salvo \t \n \r,
+# surrogates sueltos, U+FFFE/U+FFFF): con uno solo Excel no abre el archivo
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def _xml_text(value: str) -> str:
+    return escape(_XML_INVALID.sub("", value))
+
+
+def _workbook_xml(sheet_name: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{_xml_text(sheet_name)}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+
+
+def _cell(value) -> str:
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        # Excel no tiene zonas: las fechas con tz se pasan a UTC, como las de la base
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        serial = (value - _EXCEL_EPOCH).total_seconds() / 86400
+        return f'<c s="1"><v>{serial}</v></c>'
+    if isinstance(value, date):
+        return f'<c s="1"><v>{(value - _EXCEL_EPOCH.date()).days}</v></c>'
+    return f'<c t="inlineStr"><is><t>{_xml_text(str(value))}</t></is></c>'
+
+
+def _row(values: Sequence) -> str:
+    return "<row>" + "".join(_cell(v) for v in values) + "</row>"
+
+
+async def iter_xlsx(header: List[str], batches: RowBatches, sheet_name: str = "Hoja1") -> AsyncIterator[bytes]:
+    """
+    Genera un .xlsx de una sola hoja lote por lote. Las celdas de texto
+    van inline (sin sharedStrings), así no hay que guardar nada entre lotes.
+    """
+    sink = _ChunkSink()
+
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _workbook_xml(sheet_name))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _STYLES)
+        yield sink.drain()
+
+        # force_zip64: el tamaño de la hoja no se conoce de antemano
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((_SHEET_START + _row(header)).encode("utf-8"))
+
+            async for batch in batches:
+                sheet.write("".join(_row(r) for r in batch).encode("utf-8"))
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+
+            sheet.write(_SHEET_END.encode("utf-8"))
+
+    yield sink.drain()
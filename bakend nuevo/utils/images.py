@@ -0,0 +1,131 @@
+# utils/images.py
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow es opcional: sin él no se generan miniaturas
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = "static/news_images"
+UPLOAD_URL_PREFIX = "/static/news_images"
+
+# Anchos (px) de las miniaturas WebP que se generan por cada imagen subida
+THUMBNAIL_WIDTHS = tuple(
+    int(w) for w in os.getenv("THUMBNAIL_WIDTHS", "320,640,1024").split(",") if w.strip()
+)
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "80"))
+
+# Threads dedicados a redimensionar (no compiten con el threadpool de FastAPI)
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="thumbs")
+
+
+# -------------------------------------------------------------------
+# DETECCIÓN DE TIPO POR CONTENIDO (no por extensión)
+# -------------------------------------------------------------------
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """
+    Devuelve la extensión según los primeros bytes del archivo,
+    o None si no es un formato de imagen aceptado.
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+# -------------------------------------------------------------------
+# MINIATURAS
+# -------------------------------------------------------------------
+
+def thumbnail_name(filename: str, width: int) -> str:
+    stem = filename.rsplit(".", 1)[0]
+    return f"{stem}_w{width}.webp"
+
+
+def variant_name(filename: str, extension: str) -> str:
+    stem = filename.rsplit(".", 1)[0]
+    return f"{stem}.{extension}"
+
+
+def _save_webp(img, target: str) -> None:
+    tmp = target + ".tmp"
+    img.save(tmp, "WEBP", quality=THUMBNAIL_QUALITY)
+    # Rename atómico: nunca se sirve un archivo a medio escribir
+    os.replace(tmp, target)
+
+
+def _generate_thumbnails(path: str) -> None:
+    directory, filename = os.path.split(path)
+    try:
+        with Image.open(path) as img:
+            img.load()
+            if img.mode not in ("RGB", "RGBA"):
+                has_alpha = img.mode in ("LA", "PA") or "transparency" in img.info
+                img = img.convert("RGBA" if has_alpha else "RGB")
+
+            # Variante WebP a tamaño completo de JPG/PNG: la sirve
+            # utils/static.py a navegadores que aceptan image/webp
+            if filename.rsplit(".", 1)[-1] in ("jpg", "png"):
+                _save_webp(img, os.path.join(directory, variant_name(filename, "webp")))
+
+            for width in THUMBNAIL_WIDTHS:
+                # No agrandamos: sólo anchos menores al original
+                if width >= img.width:
+                    continue
+                height = round(img.height * width / img.width)
+                target = os.path.join(directory, thumbnail_name(filename, width))
+                _save_webp(img.resize((width, height), Image.LANCZOS), target)
+    except Exception:
+        logger.exception("No se pudieron generar miniaturas de %s", path)
+
+
+def schedule_thumbnails(path: str) -> None:
+    """
+    Encola la generación de miniaturas WebP de 'path' en el pool de imágenes.
+    """
+    if Image is None or not THUMBNAIL_WIDTHS:
+        return
+    _executor.submit(_generate_thumbnails, path)
+
+
+def image_srcset(image_url: Optional[str]) -> Optional[str]:
+    """
+    'srcset' con las miniaturas ya generadas de una imagen subida
+    (ej: "/static/news_images/x_w320.webp 320w, ..."), o None si no hay.
+    """
+    filename = upload_filename(image_url)
+    if filename is None:
+        return None
+
+    entries = []
+    for width in THUMBNAIL_WIDTHS:
+        name = thumbnail_name(filename, width)
+        if os.path.exists(os.path.join(UPLOAD_DIR, name)):
+            entries.append(f"{UPLOAD_URL_PREFIX}/{name} {width}w")
+    return ", ".join(entries) or None
+
+
+def split_upload_path(filename: str) -> Tuple[str, str]:
+    """(ruta en disco, URL pública) de un archivo dentro de UPLOAD_DIR."""
+    return os.path.join(UPLOAD_DIR, filename), f"{UPLOAD_URL_PREFIX}/{filename}"
+
+
+def upload_filename(image_url: Optional[str]) -> Optional[str]:
+    """Nombre de archivo dentro de UPLOAD_DIR para una URL de imagen subida."""
+    if not image_url or not image_url.startswith(UPLOAD_URL_PREFIX + "/"):
+        return None
+    return image_url[len(UPLOAD_URL_PREFIX) + 1:]
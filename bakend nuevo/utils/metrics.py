@@ -0,0 +1,244 @@
+# utils/metrics.py
+
+import bisect
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# -------------------------------------------------------------------
+# MÉTRICAS EN MEMORIA (formato de texto de Prometheus)
+# -------------------------------------------------------------------
+# Sin locks: todas las actualizaciones ocurren en el thread del event loop
+# (middleware ASGI y handlers async), así que un '+=' no compite con nada.
+# Los valores son por proceso: con varios workers cada uno expone los
+# suyos (etiqueta 'pid') y se agregan con sum() en Prometheus.
+
+_PID = str(os.getpid())
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    pairs.append(f'pid="{_PID}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        values = self._values or ({} if self.labels else {(): 0})
+        for label_values, value in values.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """Gauge con valor propio (inc/dec) o calculado al exportar ('collect')."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Tuple[str, ...] = (),
+        collect: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.collect = collect
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) - amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        values = self.collect() if self.collect else (self._values or {(): 0})
+        for label_values, value in values.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Buckets no acumulativos al observar (un solo incremento por muestra);
+    se acumulan recién al exportar.
+    """
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # label_values -> [conteo por bucket..., +Inf, suma]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._values.get(label_values)
+        if series is None:
+            series = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labels + ("le",)
+        for label_values, series in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                labels = _format_labels(names, label_values + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+# -------------------------------------------------------------------
+# MÉTRICAS HTTP
+# -------------------------------------------------------------------
+
+# Segundos: cubre desde respuestas cacheadas (~1 ms) hasta exportaciones
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "Requests HTTP respondidos.", ("method", "route", "status"),
+))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "Latencia de los requests HTTP.", ("method", "route"), LATENCY_BUCKETS,
+))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Requests HTTP en curso.",
+))
+http_exceptions = registry.register(Counter(
+    "http_exceptions_total", "Excepciones no manejadas por ruta.", ("method", "route"),
+))
+
+# -------------------------------------------------------------------
+# MÉTRICAS DE NEGOCIO (se incrementan desde los handlers)
+# -------------------------------------------------------------------
+
+payments_created = registry.register(Counter(
+    "payments_created_total", "Pagos registrados (individuales y en lote).",
+))
+payments_cancelled = registry.register(Counter(
+    "payments_cancelled_total", "Pagos anulados.",
+))
+enrollments_created = registry.register(Counter(
+    "enrollments_created_total", "Inscripciones creadas.",
+))
+logins = registry.register(Counter(
+    "logins_total", "Intentos de login por resultado.", ("result",),
+))
+
+
+def register_pool_metrics(get_pool_status: Callable[[], dict]) -> None:
+    """
+    Gauges del pool de conexiones (config/db.get_pool_status), leídos al exportar.
+    """
+    fields = ("checked_out", "checked_in", "overflow", "pool_size", "checkouts", "timeouts", "wait_seconds_total")
+
+    def collector(field: str):
+        def collect() -> Dict[LabelValues, float]:
+            return {
+                (pool,): status[field]
+                for pool, status in get_pool_status().items()
+                if field in status
+            }
+        return collect
+
+    for field in fields:
+        registry.register(Gauge(
+            f"db_pool_{field}", f"Pool de conexiones: {field}.", ("pool",), collect=collector(field),
+        ))
+
+
+# -------------------------------------------------------------------
+# MIDDLEWARE (ASGI puro)
+# -------------------------------------------------------------------
+
+# Requests que no matchean ninguna ruta (404, escaneos) comparten etiqueta:
+# así la cardinalidad no crece con URLs arbitrarias
+_UNMATCHED = "<unmatched>"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        http_in_flight.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            http_exceptions.inc(method, _route_label(scope))
+            raise
+        finally:
+            http_in_flight.dec()
+            route = _route_label(scope)
+            http_requests.inc(method, route, str(status_code))
+            http_latency.observe(time.perf_counter() - start, method, route)
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or _UNMATCHED
@@ -0,0 +1,130 @@
+# utils/pagination.py
+
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, Select, cast, column, func, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Catálogo de Postgres: reltuples = filas estimadas por el último ANALYZE
+# (vale -1 si la tabla nunca fue analizada).
+_pg_class = table("pg_class", column("oid"), column("reltuples"))
+
+
+def _estimated_rows(table_name: str):
+    return (
+        select(cast(_pg_class.c.reltuples, BigInteger))
+        .where(_pg_class.c.oid == func.to_regclass(table_name))
+        .scalar_subquery()
+    )
+
+
+def page_meta(page: int, page_size: int, total_items: int, has_next: Optional[bool] = None) -> dict:
+    """
+    Campos de paginado que devuelven todos los listados.
+    """
+    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total_items": total_items,
+        "total_pages": total_pages,
+        "has_next": page < total_pages if has_next is None else has_next,
+    }
+
+
+async def count_rows(db: AsyncSession, query: Select) -> int:
+    """
+    COUNT de 'query' en una consulta aparte (sin ORDER BY).
+    """
+    return await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    page: int,
+    page_size: int,
+    estimate_from: Optional[str] = None,
+    separate_count: bool = False,
+) -> Tuple[List[Any], dict]:
+    """
+    Trae una página de 'query' y el total en una sola consulta.
+
+    - Modo exacto: agrega count(*) OVER () a la consulta de la página.
+    - Modo exacto con separate_count=True: la página con un LIMIT simple y el
+      total con count_rows() aparte (sólo si la página no alcanza para saberlo).
+      Para JOINs grandes: count(*) OVER () obliga a armar y ordenar el JOIN
+      entero antes del LIMIT; la página sola corta en cuanto llena el LIMIT.
+    - Modo estimado (estimate_from="tabla"): el total sale de pg_class.reltuples
+      de esa tabla, así que sólo tiene sentido en listados sin filtro. Se pide
+      una fila de más para que has_next sea exacto aunque el total no lo sea.
+
+    Devuelve (items, meta). Si la consulta selecciona una sola entidad,
+    items son los objetos; si no, tuplas (sin la columna del total).
+    """
+    single = len(query.column_descriptions) == 1
+    offset = (page - 1) * page_size
+
+    if separate_count and not estimate_from:
+        rows = (await db.execute(query.offset(offset).limit(page_size))).all()
+        if rows and len(rows) < page_size:
+            # Página incompleta: es la última y el total sale de acá
+            total_items = offset + len(rows)
+        elif not rows and page == 1:
+            total_items = 0
+        else:
+            total_items = await count_rows(db, query)
+        items = [row[0] if single else tuple(row) for row in rows]
+        return items, page_meta(page, page_size, total_items)
+
+    if estimate_from:
+        total_col = _estimated_rows(estimate_from)
+        limit = page_size + 1
+    else:
+        total_col = func.count().over()
+        limit = page_size
+
+    rows = (
+        await db.execute(
+            query
+            .add_columns(total_col.label("total_items"))
+            .offset(offset)
+            .limit(limit)
+        )
+    ).all()
+
+    has_next: Optional[bool] = None
+    estimated = False
+    if estimate_from:
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if has_next:
+            # La estimación nunca puede ser menor a lo que ya vimos
+            estimate = rows[0][-1]
+            if estimate is None or estimate < 0:
+                # Tabla sin estadísticas todavía: contamos de verdad
+                total_items = await count_rows(db, query)
+            else:
+                total_items = max(estimate, offset + len(rows) + 1)
+                estimated = True
+        elif rows or page == 1:
+            # Última página: el total es exacto
+            total_items = offset + len(rows)
+        else:
+            # Página fuera de rango
+            total_items = await count_rows(db, query)
+    elif rows:
+        total_items = rows[0][-1]
+    elif page == 1:
+        total_items = 0
+    else:
+        # Página fuera de rango: el total no viene en ninguna fila
+        total_items = await count_rows(db, query)
+
+    items = [row[0] if single else tuple(row[:-1]) for row in rows]
+
+    meta = page_meta(page, page_size, total_items, has_next)
+    if estimated:
+        meta["total_is_estimate"] = True
+    return items, meta
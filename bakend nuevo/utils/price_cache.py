@@ -0,0 +1,167 @@
+# utils/price_cache.py
+
+import os
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from models.career import Career
+from models.career_price import CareerPriceHistory
+
+# Clave en session.info donde se acumulan las carreras a invalidar al commit
+_PENDING_KEY = "price_cache_pending"
+
+# Segundos que vale un historial cacheado. La invalidación por eventos sólo
+# alcanza al proceso que escribe: los demás workers ven el cambio al vencer.
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", "30"))
+
+
+class PriceTimeline:
+    """
+    Historial de precios de una carrera ordenado por fecha_desde,
+    más el costo_mensual actual como respaldo si no hay historial vigente.
+    """
+
+    def __init__(self, fechas: List[datetime], montos: List[int], costo_mensual: int):
+        self.fechas = fechas
+        self.montos = montos
+        self.costo_mensual = costo_mensual
+
+    def price_at(self, fecha: datetime) -> int:
+        # Las columnas son timestamp sin zona (UTC): normalizamos fechas con tz
+        if fecha.tzinfo is not None:
+            fecha = fecha.astimezone(timezone.utc).replace(tzinfo=None)
+
+        # Último precio cuya fecha_desde sea <= fecha
+        i = bisect_right(self.fechas, fecha)
+        if i == 0:
+            return self.costo_mensual
+        return self.montos[i - 1]
+
+
+class PriceTimelineCache:
+    """
+    Cache en memoria (por proceso) de los historiales de precio por carrera.
+    Los historiales cambian muy poco (sólo al crear/editar carreras), así que
+    se cargan una vez, se invalidan cuando se escribe CareerPriceHistory y
+    vencen a los PRICE_CACHE_TTL segundos (cambios hechos por otros workers).
+
+    Cada carrera tiene una generación que sube al invalidar: una carga que
+    empezó antes de la invalidación (y pudo leer el historial viejo) no se
+    guarda.
+    """
+
+    def __init__(self, ttl: float = PRICE_CACHE_TTL):
+        self.ttl = ttl
+        # id_carrera -> (vence, historial)
+        self._timelines: Dict[int, Tuple[float, PriceTimeline]] = {}
+        self._generations: Dict[int, int] = {}
+        self._epoch = 0  # sube con clear()
+        self._lock = threading.Lock()
+
+    def _generation(self, id_carrera: int) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(id_carrera, 0)
+
+    def _cached(self, id_carrera: int) -> Optional[PriceTimeline]:
+        entry = self._timelines.get(id_carrera)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def get_timeline(self, db: Session, id_carrera: int) -> Optional[PriceTimeline]:
+        timeline = self._cached(id_carrera)
+        if timeline is not None:
+            return timeline
+
+        # Generación antes de leer: si cambia durante la carga, no se cachea
+        generation = self._generation(id_carrera)
+
+        career: Optional[Career] = db.query(Career).filter(Career.id == id_carrera).first()
+        if not career:
+            return None
+
+        rows: List[Tuple[datetime, int]] = (
+            db.query(CareerPriceHistory.fecha_desde, CareerPriceHistory.monto)
+            .filter(CareerPriceHistory.id_carrera == id_carrera)
+            .order_by(CareerPriceHistory.fecha_desde, CareerPriceHistory.id)
+            .all()
+        )
+        timeline = PriceTimeline(
+            fechas=[fecha for fecha, _ in rows],
+            montos=[monto for _, monto in rows],
+            costo_mensual=career.costo_mensual,
+        )
+
+        # Si la sesión tiene cambios sin commitear de esta carrera no los cacheamos
+        if id_carrera not in db.info.get(_PENDING_KEY, ()):
+            with self._lock:
+                if self._generation(id_carrera) == generation:
+                    self._timelines[id_carrera] = (time.monotonic() + self.ttl, timeline)
+        return timeline
+
+    async def get_timeline_async(self, db: AsyncSession, id_carrera: int) -> Optional[PriceTimeline]:
+        timeline = self._cached(id_carrera)
+        if timeline is not None:
+            return timeline
+        # Cache miss: misma carga que la versión sync, sobre la sesión sync interna
+        return await db.run_sync(lambda session: self.get_timeline(session, id_carrera))
+
+    def invalidate(self, id_carrera: int) -> None:
+        with self._lock:
+            self._timelines.pop(id_carrera, None)
+            self._generations[id_carrera] = self._generations.get(id_carrera, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._timelines.clear()
+            self._epoch += 1
+
+
+price_cache = PriceTimelineCache()
+
+
+# -------------------------------------------------------------------
+# INVALIDACIÓN: cualquier escritura sobre Career / CareerPriceHistory
+# -------------------------------------------------------------------
+
+def _mark_pending(target, id_carrera: Optional[int]) -> None:
+    if id_carrera is None:
+        return
+    price_cache.invalidate(id_carrera)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(id_carrera)
+
+
+@event.listens_for(CareerPriceHistory, "after_insert")
+@event.listens_for(CareerPriceHistory, "after_update")
+@event.listens_for(CareerPriceHistory, "after_delete")
+def _price_history_changed(mapper, connection, target):
+    _mark_pending(target, target.id_carrera)
+
+
+@event.listens_for(Career, "after_update")
+@event.listens_for(Career, "after_delete")
+def _career_changed(mapper, connection, target):
+    # costo_mensual es el respaldo cuando no hay historial vigente
+    _mark_pending(target, target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    # Volvemos a invalidar tras el commit por si otro request recargó
+    # el historial viejo entre el flush y el commit.
+    for id_carrera in session.info.pop(_PENDING_KEY, ()):
+        price_cache.invalidate(id_carrera)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    for id_carrera in session.info.pop(_PENDING_KEY, ()):
+        price_cache.invalidate(id_carrera)
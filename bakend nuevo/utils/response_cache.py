@@ -0,0 +1,182 @@
+# utils/response_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from utils.responses import render_json
+
+# Segundos que vive una respuesta cacheada (además de la invalidación por escritura)
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+# Entradas del LRU en memoria (0 = cache desactivado)
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+# redis://host:6379/0 -> cache compartido entre workers (requiere el paquete 'redis')
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+
+# El ETag (sha1 hex) se guarda pegado al cuerpo: 40 bytes + JSON
+_ETAG_LEN = 40
+
+
+# -------------------------------------------------------------------
+# BACKENDS
+# -------------------------------------------------------------------
+# Invalidación por "versión" de namespace: cada escritura incrementa la
+# versión de su namespace ('news', 'careers') y las claves viejas quedan
+# inalcanzables hasta que expiran. Así no hace falta recorrer claves.
+
+class MemoryBackend:
+    """
+    LRU acotado con TTL, por proceso. Con varios workers la invalidación
+    es local: los demás workers pueden servir datos viejos hasta el TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: "OrderedDict[str, tuple[bytes, float]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    async def version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    async def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+class RedisBackend:
+    """
+    Backend compatible con Redis (redis.asyncio). Compartido entre workers:
+    la invalidación de un worker la ven todos.
+    """
+
+    def __init__(self, url: str, ttl: int):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_URL requiere el paquete 'redis'") from e
+        self.ttl = ttl
+        self._redis = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(f"respcache:{key}")
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self._redis.set(f"respcache:{key}", value, ex=self.ttl)
+
+    async def version(self, namespace: str) -> int:
+        return int(await self._redis.get(f"respcache:v:{namespace}") or 0)
+
+    async def bump(self, namespace: str) -> None:
+        await self._redis.incr(f"respcache:v:{namespace}")
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter("respcache:*"):
+            await self._redis.delete(key)
+
+
+# -------------------------------------------------------------------
+# CACHE DE RESPUESTAS
+# -------------------------------------------------------------------
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Aceptamos también la forma débil W/"..."
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class ResponseCache:
+    """
+    Cachea el JSON ya serializado de endpoints de lectura, con clave
+    ruta + query + payload, y responde 304 si el navegador ya tiene esa versión.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def _key(self, namespace: str, request: Request, payload: Any) -> str:
+        version = await self.backend.version(namespace)
+        raw = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha1(f"{request.url.path}?{request.url.query}|{raw}".encode("utf-8")).hexdigest()
+        return f"{namespace}:{version}:{request.method}:{digest}"
+
+    async def respond(
+        self,
+        request: Request,
+        namespace: str,
+        build: Callable[[], Awaitable[Any]],
+        payload: Any = None,
+        model: Any = None,
+    ) -> Response:
+        """
+        Devuelve la respuesta cacheada o la arma con build() y la guarda.
+        Con 'model' (el response_model de la ruta) el cuerpo se valida y
+        serializa con pydantic, igual que una respuesta no cacheada.
+        Los errores (HTTPException) de build() no se cachean.
+        """
+        key = await self._key(namespace, request, payload)
+        cached = await self.backend.get(key)
+
+        if cached is not None:
+            etag_hex, body = cached[:_ETAG_LEN].decode("ascii"), cached[_ETAG_LEN:]
+        else:
+            body = render_json(await build(), model)
+            etag_hex = hashlib.sha1(body).hexdigest()
+            await self.backend.set(key, etag_hex.encode("ascii") + body)
+
+        etag = f'"{etag_hex}"'
+        # Datos detrás de login: el navegador puede guardarlos pero revalida siempre
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, namespace: str) -> None:
+        await self.backend.bump(namespace)
+
+
+def _make_backend():
+    if RESPONSE_CACHE_URL:
+        return RedisBackend(RESPONSE_CACHE_URL, RESPONSE_CACHE_TTL)
+    return MemoryBackend(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+
+response_cache = ResponseCache(_make_backend())
@@ -0,0 +1,72 @@
+# utils/responses.py
+
+import json
+from functools import lru_cache
+from typing import Any, Generic, List, Optional, TypeVar
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa json (más lento)
+    orjson = None
+
+T = TypeVar("T")
+
+
+# -------------------------------------------------------------------
+# SCHEMAS COMUNES DE RESPUESTA
+# -------------------------------------------------------------------
+# Con 'response_model' FastAPI valida lo que devuelve el handler y lo
+# serializa directo a bytes con pydantic (dump_json, en Rust), sin pasar
+# por jsonable_encoder + json.dumps. Para que eso ocurra la ruta tiene que
+# usar la clase de respuesta por defecto: no se configura ninguna
+# 'default_response_class' (ver benchmarks/bench_serialization.py).
+
+class ApiResponse(BaseModel, Generic[T]):
+    """Sobre de todas las respuestas: {"success", "message", "data"}."""
+    success: bool
+    message: Optional[str] = None
+    data: Optional[T] = None
+
+
+class Page(BaseModel, Generic[T]):
+    """Listado paginado: 'items' + los campos de utils/pagination.page_meta."""
+    items: List[T]
+    page: int
+    page_size: int
+    total_items: int
+    total_pages: int
+    has_next: bool
+    # True si total_items sale de las estadísticas de la tabla (estimate_total)
+    total_is_estimate: bool = False
+
+
+# -------------------------------------------------------------------
+# SERIALIZACIÓN MANUAL (respuestas que no pasan por response_model)
+# -------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _adapter(model) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def render_json(data: Any, model: Any = None) -> bytes:
+    """
+    JSON compacto en UTF-8, igual al que arma FastAPI.
+
+    - Con 'model': valida y serializa con pydantic, como un response_model.
+    - Sin modelo: orjson si está instalado; si no, jsonable_encoder + json.
+    """
+    if model is not None:
+        adapter = _adapter(model)
+        return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    if orjson is not None:
+        return orjson.dumps(data, default=jsonable_encoder)
+    return json.dumps(
+        jsonable_encoder(data),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
@@ -0,0 +1,97 @@
+# utils/search.py
+
+import re
+from typing import Optional, Sequence
+
+from sqlalchemy import func, or_, text
+
+# Con menos de 3 caracteres pg_trgm no puede usar el índice (no hay trigramas
+# completos), así que para términos cortos buscamos sólo por prefijo.
+MIN_TRIGRAM_LENGTH = 3
+
+# Letras y dígitos juntos (ej. 'jperez2', 'alumno0012'): los nombres no llevan
+# dígitos, así que un término así sólo puede ser un username
+_USERNAME_RE = re.compile(r"^(?=.*[A-Za-z])(?=.*\d)[A-Za-z0-9._-]+$")
+
+# Se consulta una vez por proceso (la migración 0002 crea la extensión sólo
+# si el servidor la trae)
+_has_pg_trgm: Optional[bool] = None
+
+
+def normalize_search(term: Optional[str]) -> Optional[str]:
+    """
+    Limpia el término de búsqueda. Devuelve None si queda vacío.
+    """
+    if term is None:
+        return None
+    term = term.strip()
+    return term or None
+
+
+def _escape_like(term: str) -> str:
+    # '%' y '_' se buscan literalmente
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def looks_like_username(term: str) -> bool:
+    return _USERNAME_RE.match(term) is not None
+
+
+def build_search_filter(
+    term: str,
+    text_columns: Sequence,
+    dni_column=None,
+    username_column=None,
+):
+    """
+    Arma el filtro de búsqueda para los listados del admin.
+
+    - Si el término es numérico y hay columna DNI → prefijo de DNI
+      (índice btree varchar_pattern_ops) o el filtro de texto de abajo:
+      los usernames y emails también llevan dígitos ('alumno000814').
+    - Si mezcla letras y dígitos y hay columna de username → sólo prefijo
+      de username, sin distinguir mayúsculas (índice btree sobre
+      lower(username) text_pattern_ops). Un OR con columnas de otra tabla
+      no puede usar ningún índice; esta rama sí.
+    - Si es corto (< 3 caracteres) → prefijo sobre las columnas de texto.
+    - Si no → ILIKE '%term%' sobre las columnas de texto, acelerado por
+      los índices GIN gin_trgm_ops.
+    """
+    if username_column is not None and looks_like_username(term):
+        return func.lower(username_column).like(f"{_escape_like(term.lower())}%", escape="\\")
+
+    escaped = _escape_like(term)
+    if len(term) < MIN_TRIGRAM_LENGTH:
+        pattern = f"{escaped}%"
+    else:
+        pattern = f"%{escaped}%"
+    text_filter = or_(*[col.ilike(pattern, escape="\\") for col in text_columns])
+
+    if dni_column is not None and term.isdigit():
+        return or_(dni_column.like(f"{term}%"), text_filter)
+
+    # El DNI es sólo numérico: un término con letras nunca lo matchea
+    return text_filter
+
+
+async def search_rank(db, term: str, text_columns: Sequence):
+    """
+    Expresión de relevancia (mayor similitud trigram entre las columnas) para
+    ordenar resultados. Devuelve None fuera de PostgreSQL, sin pg_trgm o si
+    el término es demasiado corto o es un DNI/username (búsqueda por prefijo).
+    """
+    global _has_pg_trgm
+
+    if db.bind.dialect.name != "postgresql":
+        return None
+    if len(term) < MIN_TRIGRAM_LENGTH or term.isdigit() or looks_like_username(term):
+        return None
+
+    if _has_pg_trgm is None:
+        _has_pg_trgm = bool(await db.scalar(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        ))
+    if not _has_pg_trgm:
+        return None
+
+    return func.greatest(*[func.similarity(col, term) for col in text_columns])
@@ -0,0 +1,157 @@
+# utils/sql_profiler.py
+
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+# Activar por entorno (desarrollo / staging). Apagado no registra listeners
+# ni middleware: costo cero.
+SQL_PROFILING = os.getenv("SQL_PROFILING", "false").lower() in ("1", "true", "yes")
+# Sentencias más lentas que esto se loguean una por una
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+# Requests con más tiempo de base que esto se loguean con sus peores sentencias
+SQL_SLOW_REQUEST_MS = float(os.getenv("SQL_SLOW_REQUEST_MS", "500"))
+# Cuántas sentencias (las más lentas) se guardan por request
+SQL_PROFILE_TOP = int(os.getenv("SQL_PROFILE_TOP", "3"))
+
+# Largo máximo del SQL en el log
+_STATEMENT_MAX_LEN = 500
+
+logger = logging.getLogger("sql.slow")
+
+
+class RequestProfile:
+    """Sentencias ejecutadas durante un request."""
+
+    __slots__ = ("scope", "count", "total_ms", "slowest")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+
+    def add(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if len(self.slowest) < SQL_PROFILE_TOP or elapsed_ms > self.slowest[-1][0]:
+            self.slowest.append((elapsed_ms, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SQL_PROFILE_TOP:]
+
+
+# Profile del request en curso. Llega a las sentencias de la sesión async
+# porque SQLAlchemy corre el driver en un greenlet con el mismo contexto.
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+def _log(event_name: str, scope, **fields) -> None:
+    logger.warning(json.dumps({
+        "event": event_name,
+        "method": scope.get("method"),
+        "route": _route_name(scope),
+        **fields,
+    }, ensure_ascii=False))
+
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= _STATEMENT_MAX_LEN else statement[:_STATEMENT_MAX_LEN] + "…"
+
+
+# -------------------------------------------------------------------
+# LISTENERS DE SQLALCHEMY
+# -------------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._profiler_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        # Fuera de un request (scripts, tareas de fondo)
+        return
+    elapsed_ms = (time.perf_counter() - context._profiler_start) * 1000
+    profile.add(statement, elapsed_ms)
+    if elapsed_ms >= SQL_SLOW_QUERY_MS:
+        _log("slow_query", profile.scope, duration_ms=round(elapsed_ms, 2), statement=_shorten(statement))
+
+
+# -------------------------------------------------------------------
+# MIDDLEWARE (ASGI puro: no crea tareas extra por request)
+# -------------------------------------------------------------------
+
+class SQLProfilerMiddleware:
+    """
+    Mide las sentencias de cada request y agrega:
+
+        Server-Timing: db;dur=12.4;desc="SQL x5", db-max;dur=8.1, app;dur=20.3
+
+    Se ve en la pestaña Network del navegador. Las respuestas en streaming
+    (exportaciones) sólo reportan en el header lo que corrió antes de empezar
+    a enviar; el log de request lento sí incluye todo.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        profile = RequestProfile(scope)
+        token = _current.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                slowest = profile.slowest[0][0] if profile.slowest else 0.0
+                value = (
+                    f'db;dur={profile.total_ms:.1f};desc="SQL x{profile.count}", '
+                    f"db-max;dur={slowest:.1f}, "
+                    f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", value.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if profile.total_ms >= SQL_SLOW_REQUEST_MS:
+                _log(
+                    "slow_request",
+                    scope,
+                    statements=profile.count,
+                    db_ms=round(profile.total_ms, 2),
+                    slowest=[
+                        {"duration_ms": round(ms, 2), "statement": _shorten(sql)}
+                        for ms, sql in profile.slowest
+                    ],
+                )
+
+
+def install_sql_profiler(app, engines) -> bool:
+    """
+    Registra los listeners en 'engines' y el middleware en 'app' si
+    SQL_PROFILING está activo. Devuelve si quedó instalado.
+    """
+    if not SQL_PROFILING:
+        return False
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    app.add_middleware(SQLProfilerMiddleware)
+    return True
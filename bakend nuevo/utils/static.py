@@ -0,0 +1,145 @@
+# utils/static.py
+
+import os
+import re
+import stat
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Un año: los archivos subidos nunca cambian de contenido bajo el mismo nombre
+# (se guardan por hash; los viejos con uuid4 tampoco se sobrescriben)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# <sha256>.<ext> o <sha256>_w<ancho>.webp (ver routes/upload_routes.py y utils/images.py)
+_HASHED_NAME_RE = re.compile(r"^[0-9a-f]{64}(_w\d+)?\.[a-z0-9]+$")
+
+# Variantes que se sirven si el navegador las acepta, en orden de preferencia
+_VARIANTS = (
+    ("image/avif", ".avif"),
+    ("image/webp", ".webp"),
+)
+_NEGOTIABLE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif"}
+
+
+@lru_cache(maxsize=64)
+def accepted_variants(accept: str) -> Tuple[str, ...]:
+    """
+    Extensiones de las variantes que acepta el header Accept, de la más a la
+    menos preferida (q del cliente y, a igual q, el orden de _VARIANTS).
+
+    Sólo cuentan los tipos nombrados explícitamente: '*/*' o 'image/*' no
+    alcanzan para mandar AVIF/WebP. 'image/webp;q=0' la excluye.
+    Los navegadores mandan pocos Accept distintos: se cachea por valor.
+    """
+    quality = {}
+    for part in accept.split(","):
+        media_type, *params = part.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media_type = media_type.strip().lower()
+        quality[media_type] = max(q, quality.get(media_type, 0.0))
+
+    ranked = [
+        (-quality[media_type], i, ext)
+        for i, (media_type, ext) in enumerate(_VARIANTS)
+        if quality.get(media_type, 0.0) > 0
+    ]
+    return tuple(ext for _, _, ext in sorted(ranked))
+
+
+def _is_file(stat_result: Optional[os.stat_result]) -> bool:
+    return stat_result is not None and stat.S_ISREG(stat_result.st_mode)
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles para imágenes subidas:
+
+    - Cache-Control immutable (el navegador no revalida)
+    - ETag fuerte = nombre del archivo cuando es un nombre por hash
+    - Range: lo resuelve FileResponse (Starlette >= 0.39)
+    - Si existe <stem>.avif / <stem>.webp y el Accept lo permite,
+      se sirve esa variante (con Vary: Accept)
+    """
+
+    def _lookup_negotiated(self, path: str, variants: Tuple[str, ...]):
+        """
+        Como lookup_path, pero si el original existe y hay una variante
+        aceptada en disco devuelve la variante. Corre en un thread (os.stat).
+        Devuelve (full_path, stat_result, negotiable).
+        """
+        full_path, stat_result = self.lookup_path(path)
+        if not _is_file(stat_result):
+            return full_path, stat_result, False
+
+        stem, ext = os.path.splitext(path)
+        if ext.lower() not in _NEGOTIABLE_EXTENSIONS:
+            return full_path, stat_result, False
+
+        for variant_ext in variants:
+            variant_path, variant_stat = self.lookup_path(stem + variant_ext)
+            if _is_file(variant_stat):
+                return variant_path, variant_stat, True
+        return full_path, stat_result, True
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] in ("GET", "HEAD"):
+            request_headers = Headers(scope=scope)
+            variants = accepted_variants(request_headers.get("accept", ""))
+            try:
+                full_path, stat_result, negotiable = await anyio.to_thread.run_sync(
+                    self._lookup_negotiated, path, variants
+                )
+            except (OSError, ValueError):
+                # Rutas inválidas, permisos, etc.: los resuelve StaticFiles
+                pass
+            else:
+                if _is_file(stat_result):
+                    return self._immutable_response(full_path, stat_result, request_headers, negotiable)
+
+        # 404, 405 y el resto de los casos, como siempre
+        return await super().get_response(path, scope)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        return self._immutable_response(str(full_path), stat_result, Headers(scope=scope), False, status_code)
+
+    def _immutable_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        request_headers: Headers,
+        negotiable: bool,
+        status_code: int = 200,
+    ) -> Response:
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        if negotiable:
+            response.headers["vary"] = "Accept"
+
+        name = os.path.basename(full_path)
+        if _HASHED_NAME_RE.match(name):
+            # El nombre ya identifica el contenido: validador fuerte y estable
+            # entre servidores (el ETag por defecto depende de mtime)
+            response.headers["etag"] = f'"{name}"'
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,11 @@
+// fetch con el token JWT del login en el header Authorization
+export function authFetch(input: RequestInfo | URL, init: RequestInit = {}) {
+  const token = localStorage.getItem("token");
+  const headers = new Headers(init.headers);
+
+  if (token && !headers.has("Authorization")) {
+    headers.set("Authorization", `Bearer ${token}`);
+  }
+
+  return fetch(input, { ...init, headers });
+}
@@ -2,6 +2,7 @@
 import React, { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/alumno-careers.css";
 
 interface EnrollmentItem {
@@ -60,7 +61,7 @@ const AlumnoCareersView: React.FC = () => {
           page_size: 100, // más que suficiente para un alumno
         };
 
-        const res = await fetch(`${BASE_URL}/enrollments/by-user`, {
+        const res = await authFetch(`${BASE_URL}/enrollments/by-user`, {
           method: "POST",
           headers: {
             "Content-Type": "application/json",
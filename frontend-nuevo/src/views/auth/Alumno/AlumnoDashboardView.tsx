@@ -2,6 +2,7 @@
 import React, { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/alumno-home.css";
 
 interface EnrollmentItem {
@@ -65,7 +66,7 @@ const AlumnoDashboardView: React.FC = () => {
           page_size: 1,
         };
 
-        const res = await fetch(`${BASE_URL}/enrollments/by-user`, {
+        const res = await authFetch(`${BASE_URL}/enrollments/by-user`, {
           method: "POST",
           headers: {
             "Content-Type": "application/json",
@@ -2,6 +2,7 @@
 import React, { useEffect, useRef, useState } from "react";
 import { useLocation, useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/alumno-payments.css";
 
 interface PaymentItem {
@@ -91,7 +92,7 @@ const AlumnoPaymentsView: React.FC = () => {
         include_anulados: includeFlag,
       };
 
-      const res = await fetch(`${BASE_URL}/payments/by-enrollment`, {
+      const res = await authFetch(`${BASE_URL}/payments/by-enrollment`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
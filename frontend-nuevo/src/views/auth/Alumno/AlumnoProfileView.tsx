@@ -1,6 +1,7 @@
 // src/views/auth/Alumno/AlumnoProfileView.tsx
 import React, { useEffect, useState } from "react";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/profile.css";
 
 interface UserProfile {
@@ -52,7 +53,7 @@ const AlumnoProfileView: React.FC = () => {
           return;
         }
 
-        const res = await fetch(`${BASE_URL}/users/${userId}`);
+        const res = await authFetch(`${BASE_URL}/users/${userId}`);
         if (!res.ok) {
           throw new Error(`Error HTTP: ${res.status}`);
         }
@@ -102,7 +103,7 @@ const AlumnoProfileView: React.FC = () => {
     const form = new FormData();
     form.append("file", file);
 
-    const res = await fetch(`${BASE_URL}/upload`, {
+    const res = await authFetch(`${BASE_URL}/upload`, {
       method: "POST",
       body: form,
     });
@@ -131,7 +132,7 @@ const AlumnoProfileView: React.FC = () => {
         avatarUrl = await uploadImage(avatarFile);
       }
 
-      const res = await fetch(`${BASE_URL}/users/${user.id}`, {
+      const res = await authFetch(`${BASE_URL}/users/${user.id}`, {
         method: "PUT",
         headers: {
           "Content-Type": "application/json",
@@ -1,27 +1,41 @@
 // src/views/auth/Alumno/NewsFedd.tsx  (o el path que estés usando)
 import { useEffect, useState } from "react";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/news.css";
 
 interface NewsItem {
   id: number;
   title: string;
-  content: string;
+  excerpt: string;
   image_url?: string;
+  image_srcset?: string | null;
   created_at: string;
 }
 
 const NewsFeedView = () => {
   const [items, setItems] = useState<NewsItem[]>([]);
+  // Cuerpo completo de las noticias expandidas (se pide a GET /news/{id})
+  const [fullContent, setFullContent] = useState<Record<number, string>>({});
+
+  const loadFullContent = async (id: number) => {
+    const res = await authFetch(`${BASE_URL}/news/${id}`);
+    if (!res.ok) {
+      console.error("Error cargando la noticia");
+      return;
+    }
+    const data = await res.json();
+    setFullContent((prev) => ({ ...prev, [id]: data.data.content }));
+  };
 
   useEffect(() => {
     const loadNews = async () => {
-      const res = await fetch(`${BASE_URL}/news/paginated`, {
+      const res = await authFetch(`${BASE_URL}/news/paginated`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
         },
-        body: JSON.stringify({ page: 1, page_size: 10 }),
+        body: JSON.stringify({ page: 1, page_size: 10, list_mode: true }),
       });
 
       if (!res.ok) {
@@ -61,6 +75,15 @@ const NewsFeedView = () => {
                 <div className="news-feed-card-image-wrapper">
                   <img
                     src={`${BASE_URL}${n.image_url}`}
+                    srcSet={
+                      n.image_srcset
+                        ? n.image_srcset
+                            .split(", ")
+                            .map((entry) => `${BASE_URL}${entry}`)
+                            .join(", ")
+                        : undefined
+                    }
+                    sizes="(max-width: 768px) 100vw, 720px"
                     alt={n.title}
                     className="news-feed-card-image"
                   />
@@ -75,7 +98,19 @@ const NewsFeedView = () => {
                   </span>
                 </div>
 
-                <p className="news-feed-card-text">{n.content}</p>
+                <p className="news-feed-card-text">
+                  {fullContent[n.id] ?? n.excerpt}
+                </p>
+
+                {fullContent[n.id] === undefined && n.excerpt.endsWith("…") && (
+                  <button
+                    type="button"
+                    className="news-feed-read-more"
+                    onClick={() => void loadFullContent(n.id)}
+                  >
+                    Leer más
+                  </button>
+                )}
               </div>
             </article>
           ))
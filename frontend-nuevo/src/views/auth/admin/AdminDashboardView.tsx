@@ -2,6 +2,7 @@
 import React, { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/dashboard.css";
 
 // Tipos genéricos para paginados simples (solo usamos total_items)
@@ -119,7 +120,7 @@ const AdminDashboardView: React.FC = () => {
           page_size: 1,
           search: null as string | null,
         };
-        const usersRes = await fetch(`${BASE_URL}/users/paginated`, {
+        const usersRes = await authFetch(`${BASE_URL}/users/paginated`, {
           method: "POST",
           headers,
           body: JSON.stringify(usersBody),
@@ -136,7 +137,7 @@ const AdminDashboardView: React.FC = () => {
           page_size: 1,
           search: null as string | null,
         };
-        const careersRes = await fetch(`${BASE_URL}/careers/paginated`, {
+        const careersRes = await authFetch(`${BASE_URL}/careers/paginated`, {
           method: "POST",
           headers,
           body: JSON.stringify(careersBody),
@@ -153,7 +154,7 @@ const AdminDashboardView: React.FC = () => {
           page_size: 5,
           include_anulados: false,
         };
-        const paymentsRes = await fetch(`${BASE_URL}/payments/paginated`, {
+        const paymentsRes = await authFetch(`${BASE_URL}/payments/paginated`, {
           method: "POST",
           headers,
           body: JSON.stringify(paymentsBody),
@@ -169,7 +170,7 @@ const AdminDashboardView: React.FC = () => {
           page: 1,
           page_size: 5,
         };
-        const newsRes = await fetch(`${BASE_URL}/news/paginated`, {
+        const newsRes = await authFetch(`${BASE_URL}/news/paginated`, {
           method: "POST",
           headers,
           body: JSON.stringify(newsBody),
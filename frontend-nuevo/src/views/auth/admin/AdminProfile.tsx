@@ -1,6 +1,7 @@
 // src/views/auth/admin/AdminProfileView.tsx
 import React, { useEffect, useState } from "react";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/profile.css";
 
 interface UserProfile {
@@ -54,7 +55,7 @@ const AdminProfileView: React.FC = () => {
         }
 
         // 2) Pedimos la versión fresca al backend
-        const res = await fetch(`${BASE_URL}/users/${userId}`);
+        const res = await authFetch(`${BASE_URL}/users/${userId}`);
         if (!res.ok) {
           throw new Error(`Error HTTP: ${res.status}`);
         }
@@ -100,7 +101,7 @@ const AdminProfileView: React.FC = () => {
     const form = new FormData();
     form.append("file", file);
 
-    const res = await fetch(`${BASE_URL}/upload`, {
+    const res = await authFetch(`${BASE_URL}/upload`, {
       method: "POST",
       body: form,
     });
@@ -130,7 +131,7 @@ const AdminProfileView: React.FC = () => {
         avatarUrl = await uploadImage(avatarFile);
       }
 
-      const res = await fetch(`${BASE_URL}/users/${user.id}`, {
+      const res = await authFetch(`${BASE_URL}/users/${user.id}`, {
         method: "PUT",
         headers: {
           "Content-Type": "application/json",
@@ -2,6 +2,7 @@
 import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/careers.css";
 
 interface CareerPayload {
@@ -68,7 +69,7 @@ const CareerCreateView: React.FC = () => {
         payload.inicio_cursado = inicioCursado; // YYYY-MM-DD
       }
 
-      const res = await fetch(`${BASE_URL}/careers`, {
+      const res = await authFetch(`${BASE_URL}/careers`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -2,6 +2,7 @@
 import React, { useEffect, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/careers.css";
 
 interface CareerData {
@@ -68,7 +69,7 @@ const CareerEditView: React.FC = () => {
   useEffect(() => {
     const loadCareer = async () => {
       try {
-        const res = await fetch(`${BASE_URL}/careers/${id}`);
+        const res = await authFetch(`${BASE_URL}/careers/${id}`);
         if (!res.ok) {
           console.error("Error obteniendo carrera");
           setLoading(false);
@@ -118,7 +119,7 @@ const CareerEditView: React.FC = () => {
         payload.inicio_cursado = inicioCursado;
       }
 
-      const res = await fetch(`${BASE_URL}/careers/${id}`, {
+      const res = await authFetch(`${BASE_URL}/careers/${id}`, {
         method: "PUT",
         headers: {
           "Content-Type": "application/json",
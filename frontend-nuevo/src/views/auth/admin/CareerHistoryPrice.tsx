@@ -2,6 +2,7 @@
 import React, { useEffect, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 
 // Estilos generales (botones / alertas / etc)
 import "../../../styles/careers.css";
@@ -60,7 +61,7 @@ const CareerPricesHistoryView: React.FC = () => {
           page_size: 50,
         };
 
-        const res = await fetch(`${BASE_URL}/careers/prices/paginated`, {
+        const res = await authFetch(`${BASE_URL}/careers/prices/paginated`, {
           method: "POST",
           headers: {
             "Content-Type": "application/json",
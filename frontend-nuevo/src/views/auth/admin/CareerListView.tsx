@@ -2,6 +2,7 @@
 import React, { useEffect, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/careers.css";
 
 interface CareerItem {
@@ -70,7 +71,7 @@ const CareerListView: React.FC = () => {
         search: search || null,
       };
 
-      const res = await fetch(`${BASE_URL}/careers/paginated`, {
+      const res = await authFetch(`${BASE_URL}/careers/paginated`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -157,7 +158,7 @@ const CareerListView: React.FC = () => {
     if (!ok) return;
 
     try {
-      const res = await fetch(`${BASE_URL}/careers/${id}`, {
+      const res = await authFetch(`${BASE_URL}/careers/${id}`, {
         method: "DELETE",
       });
 
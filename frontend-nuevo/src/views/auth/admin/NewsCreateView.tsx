@@ -2,6 +2,7 @@
 import { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/news.css";
 
 const NewsCreateView = () => {
@@ -25,7 +26,7 @@ const NewsCreateView = () => {
     const form = new FormData();
     form.append("file", file);
 
-    const res = await fetch(`${BASE_URL}/upload`, {
+    const res = await authFetch(`${BASE_URL}/upload`, {
       method: "POST",
       body: form,
     });
@@ -56,7 +57,7 @@ const NewsCreateView = () => {
       const parsed = JSON.parse(rawUser);
       const adminId = parsed.id;
 
-      const res = await fetch(`${BASE_URL}/news`, {
+      const res = await authFetch(`${BASE_URL}/news`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
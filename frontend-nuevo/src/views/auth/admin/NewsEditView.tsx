@@ -2,6 +2,7 @@
 import { useEffect, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/news.css";
 
 interface NewsData {
@@ -27,7 +28,7 @@ const NewsEditView = () => {
   useEffect(() => {
     const loadNews = async () => {
       try {
-        const res = await fetch(`${BASE_URL}/news/${id}`);
+        const res = await authFetch(`${BASE_URL}/news/${id}`);
         if (!res.ok) {
           console.error("Error obteniendo noticia");
           return;
@@ -63,7 +64,7 @@ const NewsEditView = () => {
     const form = new FormData();
     form.append("file", file);
 
-    const res = await fetch(`${BASE_URL}/upload`, {
+    const res = await authFetch(`${BASE_URL}/upload`, {
       method: "POST",
       body: form,
     });
@@ -88,7 +89,7 @@ const NewsEditView = () => {
         finalImageUrl = await uploadImage(imageFile);
       }
 
-      const res = await fetch(`${BASE_URL}/news/${id}`, {
+      const res = await authFetch(`${BASE_URL}/news/${id}`, {
         method: "PUT",
         headers: {
           "Content-Type": "application/json",
@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/news.css";
 
 interface NewsItem {
@@ -18,7 +19,7 @@ const NewsListView = () => {
 
   useEffect(() => {
     const loadNews = async () => {
-      const res = await fetch(`${BASE_URL}/news/paginated`, {
+      const res = await authFetch(`${BASE_URL}/news/paginated`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -50,7 +51,7 @@ const NewsListView = () => {
     const ok = window.confirm("¿Seguro que querés eliminar esta noticia?");
     if (!ok) return;
 
-    const res = await fetch(`${BASE_URL}/news/${id}`, {
+    const res = await authFetch(`${BASE_URL}/news/${id}`, {
       method: "DELETE",
     });
 
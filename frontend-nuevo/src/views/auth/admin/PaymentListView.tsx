@@ -2,6 +2,7 @@
 import React, { useEffect, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/payments.css";
 
 interface PaymentRow {
@@ -27,10 +28,9 @@ interface PaginatedPaymentsResponse {
   message?: string;
   data?: {
     items: PaymentRow[];
-    page: number;
     page_size: number;
-    total_items: number;
-    total_pages: number;
+    total_items: number | null;
+    next_cursor: string | null;
     has_next: boolean;
   };
 }
@@ -38,7 +38,8 @@ interface PaginatedPaymentsResponse {
 const PaymentsListView: React.FC = () => {
   const [items, setItems] = useState<PaymentRow[]>([]);
   const [search, setSearch] = useState("");
-  const [page, setPage] = useState(1);
+  // Cursor opaco que devuelve el backend para pedir la página siguiente
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [hasMore, setHasMore] = useState(true);
 
   const [initialLoading, setInitialLoading] = useState(true);
@@ -68,29 +69,31 @@ const PaymentsListView: React.FC = () => {
   const formatEstado = (p: PaymentRow) => (p.anulado ? "Anulado" : "Activo");
 
   // ---------------------------------
-  // Cargar pagos (paginado + scroll infinito)
+  // Cargar pagos (paginado por cursor + scroll infinito)
   // ---------------------------------
-  const loadPayments = async (pageToLoad: number, reset = false) => {
+  const loadPayments = async (reset = false) => {
     if (loadingRef.current) return;
-    if (!hasMore && !reset && pageToLoad !== 1) return;
+    if (!hasMore && !reset) return;
 
     loadingRef.current = true;
     setError(null);
 
-    if (pageToLoad === 1 && reset) {
+    if (reset) {
       setInitialLoading(true);
     } else {
       setLoadingMore(true);
     }
 
     try {
+      // Keyset: cada página sigue al último pago visto, sin OFFSET
       const body = {
-        page: pageToLoad,
+        cursor_mode: true,
+        cursor: reset ? null : nextCursor,
         page_size: 20,
         search: search || null,
       };
 
-      const res = await fetch(`${BASE_URL}/payments/paginated`, {
+      const res = await authFetch(`${BASE_URL}/payments/paginated`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -108,15 +111,15 @@ const PaymentsListView: React.FC = () => {
         throw new Error(data.message || "Error al obtener pagos");
       }
 
-      const { items: newItems, has_next, page: returnedPage } = data.data;
+      const { items: newItems, has_next, next_cursor } = data.data;
 
-      if (pageToLoad === 1 || reset) {
+      if (reset) {
         setItems(newItems);
       } else {
         setItems((prev) => [...prev, ...newItems]);
       }
 
-      setPage(returnedPage);
+      setNextCursor(next_cursor);
       setHasMore(has_next);
     } catch (err) {
       console.error(err);
@@ -141,12 +144,12 @@ const PaymentsListView: React.FC = () => {
     const nearBottom = scrollTop + clientHeight >= scrollHeight - 100;
 
     if (nearBottom && hasMore && !loadingRef.current) {
-      void loadPayments(page + 1);
+      void loadPayments();
     }
   };
 
   useEffect(() => {
-    void loadPayments(1, true);
+    void loadPayments(true);
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
@@ -155,9 +158,9 @@ const PaymentsListView: React.FC = () => {
   // ---------------------------------
   const handleSearchSubmit = (e: React.FormEvent) => {
     e.preventDefault();
-    setPage(1);
+    setNextCursor(null);
     setHasMore(true);
-    void loadPayments(1, true);
+    void loadPayments(true);
   };
 
   const handleGoToDetail = (row: PaymentRow) => {
@@ -1,6 +1,7 @@
 import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/users.css";
 
 const UserCreateView: React.FC = () => {
@@ -56,7 +57,7 @@ const UserCreateView: React.FC = () => {
 
     setSaving(true);
     try {
-      const res = await fetch(`${BASE_URL}/users`, {
+      const res = await authFetch(`${BASE_URL}/users`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -2,6 +2,7 @@
 import { useEffect, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/users.css";
 
 interface UserData {
@@ -63,7 +64,7 @@ const UserEditView = () => {
   useEffect(() => {
     const loadUser = async () => {
       try {
-        const res = await fetch(`${BASE_URL}/users/${id}`);
+        const res = await authFetch(`${BASE_URL}/users/${id}`);
         if (!res.ok) {
           console.error("Error obteniendo usuario");
           setLoading(false);
@@ -98,7 +99,7 @@ const UserEditView = () => {
 
     setSaving(true);
     try {
-      const res = await fetch(`${BASE_URL}/users/${id}`, {
+      const res = await authFetch(`${BASE_URL}/users/${id}`, {
         method: "PUT",
         headers: {
           "Content-Type": "application/json",
@@ -2,6 +2,7 @@
 import React, { useEffect, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/users.css";
 
 interface UserData {
@@ -82,7 +83,7 @@ const UserEnrollmentsView: React.FC = () => {
     if (!userIdNum) return;
 
     try {
-      const res = await fetch(`${BASE_URL}/users/${userIdNum}`);
+      const res = await authFetch(`${BASE_URL}/users/${userIdNum}`);
       if (!res.ok) {
         console.error("Error obteniendo usuario");
         return;
@@ -112,7 +113,7 @@ const UserEnrollmentsView: React.FC = () => {
         page_size: 50,
       };
 
-      const res = await fetch(`${BASE_URL}/enrollments/by-user`, {
+      const res = await authFetch(`${BASE_URL}/enrollments/by-user`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -157,7 +158,7 @@ const UserEnrollmentsView: React.FC = () => {
         search: null as string | null,
       };
 
-      const res = await fetch(`${BASE_URL}/careers/paginated`, {
+      const res = await authFetch(`${BASE_URL}/careers/paginated`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -226,7 +227,7 @@ const UserEnrollmentsView: React.FC = () => {
         career_id: careerIdNum,
       };
 
-      const res = await fetch(`${BASE_URL}/enrollments`, {
+      const res = await authFetch(`${BASE_URL}/enrollments`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -265,7 +266,7 @@ const UserEnrollmentsView: React.FC = () => {
     if (!ok) return;
 
     try {
-      const res = await fetch(`${BASE_URL}/enrollments/${enrollmentId}`, {
+      const res = await authFetch(`${BASE_URL}/enrollments/${enrollmentId}`, {
         method: "DELETE",
       });
 
@@ -2,6 +2,7 @@
 import React, { useEffect, useRef, useState } from "react";
 import { useLocation, useNavigate, useParams } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/payments.css";
 
 interface UserData {
@@ -153,7 +154,7 @@ const UserPaymentsView: React.FC = () => {
     setUserError(null);
 
     try {
-      const res = await fetch(`${BASE_URL}/users/${userIdNum}`);
+      const res = await authFetch(`${BASE_URL}/users/${userIdNum}`);
       if (!res.ok) {
         throw new Error(`Error HTTP: ${res.status}`);
       }
@@ -188,7 +189,7 @@ const UserPaymentsView: React.FC = () => {
         page_size: 100,
       };
 
-      const res = await fetch(`${BASE_URL}/enrollments/by-user`, {
+      const res = await authFetch(`${BASE_URL}/enrollments/by-user`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -255,7 +256,7 @@ const UserPaymentsView: React.FC = () => {
         include_anulados: includeFlag,
       };
 
-      const res = await fetch(`${BASE_URL}/payments/by-enrollment`, {
+      const res = await authFetch(`${BASE_URL}/payments/by-enrollment`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -347,7 +348,7 @@ const UserPaymentsView: React.FC = () => {
         body.fecha_pago = fecha.toISOString();
       }
 
-      const res = await fetch(`${BASE_URL}/payments`, {
+      const res = await authFetch(`${BASE_URL}/payments`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -392,7 +393,7 @@ const UserPaymentsView: React.FC = () => {
     if (!ok) return;
 
     try {
-      const res = await fetch(`${BASE_URL}/payments/${paymentId}/cancel`, {
+      const res = await authFetch(`${BASE_URL}/payments/${paymentId}/cancel`, {
         method: "PUT",
         headers: {
           "Content-Type": "application/json",
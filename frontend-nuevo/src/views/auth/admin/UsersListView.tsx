@@ -2,6 +2,7 @@
 import React, { useEffect, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { BASE_URL } from "../../../config/backend";
+import { authFetch } from "../../../config/api";
 import "../../../styles/users.css";
 
 interface UserItem {
@@ -67,7 +68,7 @@ const UsersListView: React.FC = () => {
         search: search || null,
       };
 
-      const res = await fetch(`${BASE_URL}/users/paginated`, {
+      const res = await authFetch(`${BASE_URL}/users/paginated`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -158,7 +159,7 @@ const UsersListView: React.FC = () => {
     if (!ok) return;
 
     try {
-      const res = await fetch(`${BASE_URL}/users/${id}`, {
+      const res = await authFetch(`${BASE_URL}/users/${id}`, {
         method: "DELETE",
       });
 